@@ -3,32 +3,14 @@ import sys
 import traceback
 import logging
 import json
-from flask import Flask, request, jsonify, send_from_directory
-from flask_cors import CORS
-from werkzeug.exceptions import HTTPException
-from backend.services.hugging_face import get_possible_ascendants
-from backend.services.numerology import calculate_numerology
-from backend.services.human_design import calculate_human_design
-from backend.services.compatibility import calculate_compatibility
-from backend.utils.validators import (
-    validate_birth_date, 
-    validate_birth_time, 
-    validate_birth_location
-)
+from flask import Blueprint, Flask, request, jsonify, send_from_directory, abort
+from werkzeug.exceptions import HTTPException, NotFound
 import dotenv
 
 # Load environment variables
 dotenv.load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('vercel_deployment.log')
-    ]
-)
+# Logging is configured by the backend; this module only adds records to it
 logger = logging.getLogger(__name__)
 
 # Comprehensive path resolution
@@ -74,235 +56,56 @@ except Exception as e:
     logger.error(traceback.format_exc())
     application = None
 
+from backend.config.settings import Config
+from backend.utils.assets import StaticAssets
+from backend.utils.serverless import event_to_environ, call_wsgi
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# Fingerprinted, pre-compressed frontend bundle built by tools/build_assets.py;
+# the manifest is read once per container
+static_assets = StaticAssets(
+    os.path.join(PROJECT_ROOT, Config.STATIC_ASSET_DIR),
+    accel_redirect_prefix=Config.STATIC_ACCEL_REDIRECT_PREFIX or None
+)
+
+# Vercel routes /api/* to this function; strip the prefix before dispatching
+SCRIPT_NAME = os.getenv('VERCEL_SCRIPT_NAME', '/api')
+
 # Verify critical environment variables
 HUGGING_FACE_API_KEY = os.getenv('HUGGING_FACE_API_KEY')
 if not HUGGING_FACE_API_KEY:
     logger.critical("HUGGING_FACE_API_KEY is not set. API functionality may be limited.")
 
-# Global error handler
-@app.errorhandler(Exception)
-def handle_error(e):
-    """
-    Global error handler for all exceptions.
-    
-    Args:
-        e (Exception): Caught exception
-    
-    Returns:
-        tuple: JSON error response and HTTP status code
-    """
-    logger.error(f"Unhandled Exception: {e}")
-    logger.error(traceback.format_exc())
-    
-    # Handle known HTTP exceptions
-    if isinstance(e, HTTPException):
-        return jsonify(error=str(e)), e.code
-    
-    # Handle validation errors
-    if isinstance(e, ValueError):
-        return jsonify(error=str(e)), 400
-    
-    # Generic server error for unexpected exceptions
-    return jsonify(error='Internal Server Error'), 500
+# Frontend and deployment routes, kept off the shared backend application so
+# it answers the same under Vercel as under gunicorn
+frontend = Blueprint('frontend', __name__)
 
-@app.route('/')
+def _asset_response(path):
+    if static_assets:
+        response = static_assets.response(path, request.environ)
+        if response is None:
+            abort(404)
+        return response
+    # Assets not built: serve the raw bundle uncompressed
+    return send_from_directory(os.path.join(PROJECT_ROOT, Config.STATIC_ASSET_SOURCE_DIR), path)
+
+@frontend.route('/')
 def serve_frontend():
     """
     Serve the main frontend application.
     """
-    return send_from_directory(app.static_folder, 'index.html')
-
-@app.route('/get_ascendants', methods=['POST'])
-def ascendant_endpoint():
-    """
-    Endpoint to retrieve possible ascendant signs.
-    
-    Expected JSON payload:
-    {
-        "birth_date": "YYYY-MM-DD",
-        "birth_location": "City, Country"
-    }
-    """
-    try:
-        data = request.get_json()
-        
-        # Validate input
-        validate_birth_date(data.get('birth_date'))
-        validate_birth_location(data.get('birth_location'))
-        
-        # Calculate ascendants
-        result = get_possible_ascendants(
-            data['birth_date'], 
-            data['birth_location']
-        )
-        
-        logger.info(f"Ascendant calculation for {data['birth_date']} successful")
-        return jsonify(result), 200
-    
-    except ValueError as ve:
-        logger.error(f"Validation Error: {str(ve)}")
-        return jsonify({
-            "error": "Invalid input",
-            "details": str(ve)
-        }), 400
-    
-    except Exception as e:
-        logger.error(f"Unexpected error in ascendant calculation: {str(e)}")
-        return jsonify({
-            "error": "Calculation failed",
-            "details": "Unable to determine ascendant signs"
-        }), 500
-
-@app.route('/calculate_numerology', methods=['POST'])
-def numerology_endpoint():
-    """
-    Endpoint to calculate numerological insights.
-    
-    Expected JSON payload:
-    {
-        "birth_date": "YYYY-MM-DD"
-    }
-    """
-    try:
-        data = request.get_json()
-        
-        # Validate input
-        validate_birth_date(data.get('birth_date'))
-        
-        # Calculate numerology
-        result = calculate_numerology(data['birth_date'])
-        
-        logger.info(f"Numerology calculation for {data['birth_date']} successful")
-        return jsonify(result), 200
-    
-    except ValueError as ve:
-        logger.error(f"Validation Error: {str(ve)}")
-        return jsonify({
-            "error": "Invalid input",
-            "details": str(ve)
-        }), 400
-    
-    except Exception as e:
-        logger.error(f"Unexpected error in numerology calculation: {str(e)}")
-        return jsonify({
-            "error": "Calculation failed",
-            "details": "Unable to determine numerological insights"
-        }), 500
+    return _asset_response('index.html')
 
-@app.route('/calculate_human_design', methods=['POST'])
-def human_design_endpoint():
-    """
-    Endpoint to calculate Human Design type.
-    
-    Expected JSON payload:
-    {
-        "birth_date": "YYYY-MM-DD",
-        "birth_time": "HH:MM AM/PM",
-        "birth_location": "City, Country"
-    }
-    """
-    try:
-        data = request.get_json()
-        
-        # Validate input
-        validate_birth_date(data.get('birth_date'))
-        
-        # Optional parameters
-        birth_time = data.get('birth_time')
-        birth_location = data.get('birth_location')
-        
-        # Validate optional parameters if provided
-        if birth_time:
-            validate_birth_time(birth_time)
-        
-        # Calculate Human Design
-        result = calculate_human_design(
-            data['birth_date'], 
-            birth_time, 
-            birth_location
-        )
-        
-        logger.info(f"Human Design calculation for {data['birth_date']} successful")
-        return jsonify(result), 200
-    
-    except ValueError as ve:
-        logger.error(f"Validation Error: {str(ve)}")
-        return jsonify({
-            "error": "Invalid input",
-            "details": str(ve)
-        }), 400
-    
-    except Exception as e:
-        logger.error(f"Unexpected error in Human Design calculation: {str(e)}")
-        return jsonify({
-            "error": "Calculation failed",
-            "details": "Unable to determine Human Design type"
-        }), 500
-
-@app.route('/calculate_compatibility', methods=['POST'])
-def compatibility_endpoint():
-    """
-    Endpoint to calculate comprehensive compatibility.
-    
-    Expected JSON payload:
-    {
-        "person1": {
-            "birth_date": "YYYY-MM-DD",
-            "birth_time": "HH:MM AM/PM",
-            "birth_location": "City, Country"
-        },
-        "person2": {
-            "birth_date": "YYYY-MM-DD",
-            "birth_time": "HH:MM AM/PM",
-            "birth_location": "City, Country"
-        }
-    }
-    """
-    try:
-        data = request.get_json()
-        
-        # Validate inputs
-        validate_birth_date(data['person1']['birth_date'])
-        validate_birth_date(data['person2']['birth_date'])
-        
-        # Optional parameter validations
-        if data['person1'].get('birth_time'):
-            validate_birth_time(data['person1']['birth_time'])
-        if data['person2'].get('birth_time'):
-            validate_birth_time(data['person2']['birth_time'])
-        
-        # Calculate compatibility
-        result = calculate_compatibility(
-            data['person1'], 
-            data['person2']
-        )
-        
-        logger.info(f"Compatibility calculation successful")
-        return jsonify(result), 200
-    
-    except ValueError as ve:
-        logger.error(f"Validation Error: {str(ve)}")
-        return jsonify({
-            "error": "Invalid input",
-            "details": str(ve)
-        }), 400
-    
-    except Exception as e:
-        logger.error(f"Unexpected error in compatibility calculation: {str(e)}")
-        return jsonify({
-            "error": "Calculation failed",
-            "details": "Unable to determine compatibility"
-        }), 500
-
-@app.route('/<path:path>')
+@frontend.route('/<path:path>')
 def serve_static(path):
     """
     Serve static files from the frontend directory.
     """
-    return send_from_directory(app.static_folder, path)
+    return _asset_response(path)
 
-@app.route('/home')
-def home():
+@frontend.route('/home')
+def api_home():
     """
     Home endpoint with system health check
     """
@@ -320,13 +123,35 @@ def home():
         ]
     })
 
+# No built-in /static rule, which would shadow the bundle's static/ directory
+frontend_app = Flask(__name__, static_folder=None)
+frontend_app.register_blueprint(frontend)
+
+def dispatch(environ, start_response):
+    """
+    WSGI entry point: API routes go to the backend application, anything
+    it has no route for to the frontend.
+    """
+    try:
+        application.url_map.bind_to_environ(environ).match()
+    except NotFound:
+        return frontend_app(environ, start_response)
+    except HTTPException:
+        pass  # wrong method or a redirect; the backend answers it
+    return application(environ, start_response)
+
+# The backend application lives for the lifetime of the container, so its
+# caches stay warm across invocations
+app = dispatch if application is not None else frontend_app
+
 def handler(event, context):
     """
-    Comprehensive Vercel serverless function handler
+    Vercel serverless function handler.
+
+    Translates the event into a WSGI environ and runs it through the
+    module-level application, which is reused by every invocation that
+    lands on the same container.
     """
-    # Log incoming event details
-    logger.info(f"Received event: {json.dumps(event, indent=2)}")
-    
     # Check application initialization
     if not application:
         error_response = {
@@ -342,35 +167,24 @@ def handler(event, context):
         }
         logger.critical("Flask application not initialized")
         return error_response
-    
+
+    if not isinstance(event, dict):
+        logger.error(f"Unsupported event type: {type(event).__name__}")
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json'},
+            'body': json.dumps({'error': 'Bad Request', 'message': 'Unsupported event format'})
+        }
+
     try:
-        # Optional: Add request preprocessing or validation
-        logger.info("Processing request")
-        
-        # For Vercel serverless, we might need to adapt the request
-        if isinstance(event, dict):
-            # Convert Vercel event to a format Flask can understand
-            # This is a placeholder and might need adjustment
-            from flask import Request
-            flask_request = Request(event)
-            
-            # Process the request
-            with application.request_context(flask_request):
-                response = application.full_dispatch_request()
-                
-            return {
-                'statusCode': response.status_code,
-                'headers': dict(response.headers),
-                'body': response.get_data(as_text=True)
-            }
-        
-        # Fallback to default application handling
-        return application
-    
+        environ = event_to_environ(event, SCRIPT_NAME)
+        logger.debug(f"Invocation: {environ['REQUEST_METHOD']} {environ['SCRIPT_NAME']}{environ['PATH_INFO']}")
+        return call_wsgi(app, environ)
+
     except Exception as e:
         logger.error(f"Serverless handler error: {e}")
         logger.error(traceback.format_exc())
-        
+
         error_response = {
             'statusCode': 500,
             'headers': {
@@ -378,15 +192,16 @@ def handler(event, context):
             },
             'body': json.dumps({
                 'error': 'Internal Server Error',
-                'message': str(e),
-                'traceback': traceback.format_exc()
+                'message': str(e)
             })
         }
         return error_response
 
 # For local development and testing
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     if application:
-        application.run(debug=True)
+        from werkzeug.serving import run_simple
+        run_simple('127.0.0.1', 5000, app, use_debugger=True, use_reloader=True)
     else:
         logger.critical("Cannot start application: Initialization failed")
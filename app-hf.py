@@ -7,6 +7,7 @@ def call_pathlet_api(birth_date, birth_time, birth_location, service):
     Generic function to call Pathlet API endpoints
     """
     base_url = "https://pathlet-api.vercel.app"  # Replace with actual API URL
+    timeout = 10
     
     payload = {
         "birth_date": birth_date,
@@ -21,10 +22,12 @@ def call_pathlet_api(birth_date, birth_time, birth_location, service):
     }
     
     try:
+        # The API stops working on the request once our timeout has passed
         response = requests.post(
             f"{base_url}{endpoints[service]}", 
             json=payload, 
-            timeout=10
+            headers={"X-Request-Timeout": str(timeout)},
+            timeout=timeout
         )
         response.raise_for_status()
         return json.dumps(response.json(), indent=2)
@@ -1,4 +1,4 @@
-from flask import Flask, request, jsonify
+from flask import Flask, jsonify
 import requests
 import os
 from dotenv import load_dotenv
@@ -6,6 +6,13 @@ from backend.services.hugging_face import get_possible_ascendants
 from backend.services.numerology import calculate_numerology
 from backend.services.human_design import calculate_human_design
 from backend.services.compatibility import calculate_compatibility
+from backend.utils.schema import json_body
+from backend.schemas import (
+    ASCENDANTS_REQUEST,
+    NUMEROLOGY_REQUEST,
+    HUMAN_DESIGN_REQUEST,
+    COMPATIBILITY_REQUEST
+)
 
 load_dotenv()
 
@@ -32,15 +39,15 @@ def home():
     })
 
 @app.route('/get_ascendants', methods=['POST'])
-def get_ascendants():
+@json_body(ASCENDANTS_REQUEST)
+def get_ascendants(payload):
     """
     Endpoint to get possible ascendant signs
     """
     try:
-        data = request.get_json()
         result = get_possible_ascendants(
-            data['birth_date'], 
-            data['birth_location']
+            payload.birth_date, 
+            payload.birth_location
         )
         return jsonify(result), 200
     except Exception as e:
@@ -50,13 +57,13 @@ def get_ascendants():
         }), 500
 
 @app.route('/calculate_numerology', methods=['POST'])
-def numerology_endpoint():
+@json_body(NUMEROLOGY_REQUEST)
+def numerology_endpoint(payload):
     """
     Endpoint to calculate numerology insights
     """
     try:
-        data = request.get_json()
-        result = calculate_numerology(data['birth_date'])
+        result = calculate_numerology(payload.birth_date)
         return jsonify(result), 200
     except Exception as e:
         return jsonify({
@@ -65,16 +72,16 @@ def numerology_endpoint():
         }), 500
 
 @app.route('/calculate_human_design', methods=['POST'])
-def human_design_endpoint():
+@json_body(HUMAN_DESIGN_REQUEST)
+def human_design_endpoint(payload):
     """
     Endpoint to calculate human design insights
     """
     try:
-        data = request.get_json()
         result = calculate_human_design(
-            data['birth_date'],
-            data.get('birth_time'),
-            data.get('birth_location')
+            payload.birth_date,
+            payload.birth_time,
+            payload.birth_location
         )
         return jsonify(result), 200
     except Exception as e:
@@ -84,15 +91,15 @@ def human_design_endpoint():
         }), 500
 
 @app.route('/calculate_compatibility', methods=['POST'])
-def compatibility_endpoint():
+@json_body(COMPATIBILITY_REQUEST)
+def compatibility_endpoint(payload):
     """
     Endpoint to calculate comprehensive compatibility
     """
     try:
-        data = request.get_json()
         result = calculate_compatibility(
-            data['person1'], 
-            data['person2']
+            payload.person1._asdict(), 
+            payload.person2._asdict()
         )
         return jsonify(result), 200
     except Exception as e:
@@ -1,7 +1,44 @@
 import os
-from flask import Flask, request, jsonify
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
-from datetime import datetime
+from datetime import date, datetime, timedelta
+from backend.services.numerology import calculate_numerology
+from backend.services.human_design import calculate_human_design
+from backend.services.narrative import request_narrative, poll_narrative, narrative_metrics
+from backend.services.forecast import calculate_forecast
+from backend.services.lunar import calculate_lunar_cycles
+from backend.services.transits import find_transits
+from backend.services.compatibility import calculate_compatibility
+from backend.services.content import reload_catalog
+from backend.services.matching import find_matches, get_profile_pool, BUCKET_LABELS
+from backend.services.scheduling import (
+    schedule_numerology,
+    schedule_human_design,
+    schedule_ascendants,
+    batching_metrics
+)
+from backend.config.settings import Config
+from backend.utils.admin import admin_required
+from backend.utils.compression import CompressionMiddleware, compression
+from backend.utils.deadlines import DeadlineExceeded, DeadlineMiddleware, has_time_for
+from backend.utils.memory import memory_inspector
+from backend.utils.profiling import ProfileStore, ProfilingMiddleware
+from backend.utils.schema import json_body
+from backend.utils.serialization import NegotiatingJSONProvider
+from backend.utils.tracing import SpanExporter, TracedJSONProvider, TracingMiddleware
+from backend.schemas import (
+    ASCENDANTS_REQUEST,
+    NUMEROLOGY_REQUEST,
+    HUMAN_DESIGN_REQUEST,
+    COMPATIBILITY_REQUEST,
+    MATCHES_REQUEST,
+    NARRATIVE_REQUEST,
+    CALCULATE_ALL_REQUEST,
+    FORECAST_REQUEST,
+    LUNAR_CYCLE_REQUEST,
+    TRANSITS_REQUEST,
+    TRACEMALLOC_REQUEST
+)
 
 # Create Flask application
 app = Flask(__name__)
@@ -11,6 +48,37 @@ CORS(app, resources={r"/*": {"origins": "*"}})
 app.config['DEBUG'] = False
 app.config['ENV'] = 'production'
 
+# Requests carry their client's deadline; ones already past it are refused before any work
+app.wsgi_app = DeadlineMiddleware(app.wsgi_app, Config.REQUEST_DEFAULT_TIMEOUT)
+
+# Compress text and JSON responses; installed first so traces and profiles include it
+if Config.COMPRESSION_ENABLED:
+    app.wsgi_app = CompressionMiddleware(app.wsgi_app, Config.COMPRESSION_MIN_BYTES, {
+        'zstd': Config.COMPRESSION_ZSTD_LEVEL,
+        'br': Config.COMPRESSION_BROTLI_QUALITY,
+        'gzip': Config.COMPRESSION_GZIP_LEVEL
+    })
+
+# Request tracing is opt-in; spans cover validation, service calls and JSON encoding
+span_exporter = SpanExporter(Config.TRACE_DIR, Config.TRACE_EXPORT_BATCH_SIZE, Config.TRACE_EXPORT_INTERVAL)
+if Config.TRACING_ENABLED:
+    app.wsgi_app = TracingMiddleware(app.wsgi_app, span_exporter)
+
+# jsonify answers in JSON, MessagePack or CBOR depending on the Accept header
+app.json = TracedJSONProvider(app) if Config.TRACING_ENABLED else NegotiatingJSONProvider(app)
+
+# Request profiling is opt-in; without a trigger the WSGI app stays unwrapped
+profile_store = ProfileStore(Config.PROFILE_DIR, Config.PROFILE_MAX_FILES)
+if Config.ADMIN_TOKEN or Config.PROFILE_SAMPLE_RATE > 0:
+    app.wsgi_app = ProfilingMiddleware(app.wsgi_app, profile_store, Config.PROFILE_SAMPLE_RATE)
+
+@app.errorhandler(DeadlineExceeded)
+def deadline_exceeded(e):
+    """
+    The client's deadline passed while the request was waiting on a calculation
+    """
+    return jsonify({"error": "Deadline exceeded", "details": str(e)}), 504
+
 @app.route('/')
 def home():
     """
@@ -32,50 +100,288 @@ def health_check():
     }), 200
 
 @app.route('/get_ascendants', methods=['POST'])
-def get_ascendants():
+@json_body(ASCENDANTS_REQUEST)
+def get_ascendants(payload):
     """
-    Mock endpoint for ascendant retrieval
+    Every Ascendant rising over the birth date, with its time window
     """
-    data = request.json
-    birth_date = data.get('birth_date')
-    birth_location = data.get('birth_location', '')
+    return jsonify(schedule_ascendants(payload.birth_date, payload.birth_location)), 200
 
-    # Mock data for demonstration
-    possible_ascendants = [
-        'Aries', 'Taurus', 'Gemini', 'Cancer', 
-        'Leo', 'Virgo', 'Libra', 'Scorpio', 
-        'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces'
-    ]
+@app.route('/calculate_numerology', methods=['POST'])
+@json_body(NUMEROLOGY_REQUEST)
+def numerology_endpoint(payload):
+    """
+    Life path numerology, micro-batched with concurrent requests
+    """
+    return jsonify(schedule_numerology(payload.birth_date, payload.full_name)), 200
 
-    return jsonify({
-        "possible_ascendants": possible_ascendants,
-        "instructions": "Review the listed Ascendants and choose the one that resonates most with you."
-    }), 200
+@app.route('/calculate_human_design', methods=['POST'])
+@json_body(HUMAN_DESIGN_REQUEST)
+def human_design_endpoint(payload):
+    """
+    Human Design chart, shared between identical concurrent requests
+    """
+    return jsonify(schedule_human_design(payload.birth_date, payload.birth_time, payload.birth_location)), 200
+
+@app.route('/calculate_compatibility', methods=['POST'])
+@json_body(COMPATIBILITY_REQUEST)
+def compatibility_endpoint(payload):
+    """
+    Human Design and numerology compatibility between two people
+    """
+    return jsonify(calculate_compatibility(payload.person1._asdict(), payload.person2._asdict())), 200
+
+@app.route('/matches', methods=['POST'])
+@json_body(MATCHES_REQUEST)
+def matches_endpoint(payload):
+    """
+    Best compatibility matches from the stored profile pool, paginated
+    """
+    filters = {
+        'life_path_numbers': payload.filters.life_path_numbers,
+        'design_types': payload.filters.human_design_types,
+        'min_score': payload.filters.min_score
+    }
+
+    if payload.profile_id is not None:
+        bucket = get_profile_pool().bucket_of(payload.profile_id)
+        if bucket is None:
+            return jsonify({"error": "Profile not found", "details": f"No stored profile {payload.profile_id}"}), 404
+        life_path_number, design_type = BUCKET_LABELS[bucket]
+        filters['exclude_ids'] = [payload.profile_id]
+    else:
+        numerology = schedule_numerology(payload.birth_date)
+        human_design = schedule_human_design(payload.birth_date, payload.birth_time, payload.birth_location)
+        for chart in (numerology, human_design):
+            if 'error' in chart:
+                return jsonify({"error": "Calculation failed", "details": chart['error']}), 500
+        life_path_number, design_type = numerology['life_path_number'], human_design['type']
+
+    return jsonify(find_matches(life_path_number, design_type, payload.limit, payload.offset, **filters)), 200
+
+@app.route('/forecast', methods=['POST'])
+@compression(zstd=9, br=6, gzip=9)
+@json_body(FORECAST_REQUEST)
+def forecast_endpoint(payload):
+    """
+    Personal year, month and day numbers for every day of a range,
+    as compact JSON or streamed NDJSON
+    """
+    start_date = payload.start_date or date.today().isoformat()
+    end_date = payload.end_date or (date.fromisoformat(start_date) + timedelta(days=364)).isoformat()
+
+    try:
+        forecast = calculate_forecast(payload.birth_date, start_date, end_date)
+    except ValueError as e:
+        return jsonify({"error": "Invalid input", "details": str(e), "fields": [{"field": "end_date", "message": str(e)}]}), 400
+
+    ndjson = payload.format == 'ndjson' or (
+        payload.format is None
+        and request.accept_mimetypes.best_match(['application/json', 'application/x-ndjson']) == 'application/x-ndjson'
+    )
+    if ndjson:
+        return Response(forecast.iter_ndjson(), mimetype='application/x-ndjson')
+    return jsonify(forecast.to_compact()), 200
+
+@app.route('/lunar_cycle', methods=['POST'])
+@json_body(LUNAR_CYCLE_REQUEST)
+def lunar_cycle_endpoint(payload):
+    """
+    Current and next lunar cycle windows for the Reflector strategy,
+    read from the precomputed lunar table
+    """
+    try:
+        return jsonify(calculate_lunar_cycles(payload.date)), 200
+    except ValueError as e:
+        return jsonify({"error": "Invalid input", "details": str(e), "fields": [{"field": "date", "message": str(e)}]}), 400
+    except FileNotFoundError as e:
+        return jsonify({"error": "Lunar cycles unavailable", "details": str(e)}), 503
+
+@app.route('/transits', methods=['POST'])
+@compression(zstd=9, br=6, gzip=9)
+@json_body(TRANSITS_REQUEST)
+def transits_endpoint(payload):
+    """
+    Sign ingresses, retrograde stations and lunations in a date range
+    (default: the coming week), read from the precomputed event index
+    """
+    start_date = payload.start_date or date.today().isoformat()
+    end_date = payload.end_date or (date.fromisoformat(start_date) + timedelta(days=6)).isoformat()
+
+    try:
+        return jsonify(find_transits(start_date, end_date, payload.bodies, payload.events)), 200
+    except ValueError as e:
+        return jsonify({"error": "Invalid input", "details": str(e), "fields": [{"field": "end_date", "message": str(e)}]}), 400
+    except FileNotFoundError as e:
+        return jsonify({"error": "Transits unavailable", "details": str(e)}), 503
+
+@app.route('/metrics/batching')
+def batching_metrics_endpoint():
+    """
+    Batch-size distribution and queueing latency of the chart scheduler
+    """
+    return jsonify(batching_metrics()), 200
+
+@app.route('/metrics/inference')
+def inference_metrics_endpoint():
+    """
+    Circuit breaker state, latency and hedging of the inference API client
+    """
+    return jsonify(narrative_metrics()), 200
+
+@app.route('/narrative', methods=['POST'])
+@json_body(NARRATIVE_REQUEST)
+def narrative(payload):
+    """
+    Generated interpretation of a chart, served from cache or queued
+    """
+    kind, birth_date, birth_time = payload.kind, payload.birth_date, payload.birth_time
+
+    if kind == 'numerology':
+        chart = calculate_numerology(birth_date)
+    else:
+        chart = calculate_human_design(birth_date, birth_time, payload.birth_location)
+
+    if 'error' in chart:
+        return jsonify({"error": "Calculation failed", "details": chart['error']}), 500
+
+    result = request_narrative(kind, chart)
+    if result['status'] == 'pending':
+        result['poll_url'] = f"/narrative/{result['narrative_id']}"
+        return jsonify(result), 202
+    return jsonify(result), 200
+
+@app.route('/narrative/<narrative_id>', methods=['GET'])
+def narrative_status(narrative_id):
+    """
+    Poll a queued narrative
+    """
+    result = poll_narrative(narrative_id)
+    status_codes = {'ready': 200, 'pending': 202, 'fallback': 200, 'unknown': 404}
+    return jsonify(result), status_codes[result['status']]
+
+@app.route('/admin/profiles')
+@admin_required
+def profiles_endpoint():
+    """
+    Most recent request profiles, newest first
+    """
+    limit = request.args.get('limit', 50, type=int)
+    return jsonify({"profiles": profile_store.list(max(0, min(limit, Config.PROFILE_MAX_FILES)))}), 200
+
+@app.route('/admin/profiles/<profile_id>')
+@compression(zstd=19, br=9, gzip=9)
+@admin_required
+def profile_endpoint(profile_id):
+    """
+    Collapsed stacks of one profile, for flamegraph.pl or speedscope
+    """
+    collapsed = profile_store.read(profile_id)
+    if collapsed is None:
+        return jsonify({"error": "Profile not found", "details": f"No profile {profile_id}"}), 404
+    return Response(collapsed, mimetype='text/plain'), 200
+
+@app.route('/admin/memory')
+@admin_required
+def memory_endpoint():
+    """
+    RSS, GC state and top allocating modules of the worker serving the request
+    """
+    limit = request.args.get('limit', 20, type=int)
+    return jsonify(memory_inspector.report(request.args.get('prefix', ''), max(1, min(limit, 200)))), 200
+
+@app.route('/admin/memory/tracemalloc', methods=['POST'])
+@admin_required
+@json_body(TRACEMALLOC_REQUEST)
+def tracemalloc_endpoint(payload):
+    """
+    Start or stop allocation tracing in this worker
+    """
+    return jsonify(memory_inspector.set_tracing(payload.enabled, payload.frames)), 200
+
+@app.route('/admin/memory/snapshots', methods=['POST'])
+@admin_required
+def memory_snapshot_endpoint():
+    """
+    Store a tracemalloc snapshot in this worker for later diffs
+    """
+    try:
+        return jsonify(memory_inspector.take_snapshot()), 201
+    except RuntimeError as e:
+        return jsonify({"error": "Tracing disabled", "details": str(e)}), 409
+
+@app.route('/admin/memory/diff')
+@admin_required
+def memory_diff_endpoint():
+    """
+    Allocation growth per module between two snapshots (or a snapshot and now)
+    """
+    limit = request.args.get('limit', 20, type=int)
+    try:
+        return jsonify(memory_inspector.diff(
+            request.args.get('from', ''), request.args.get('to'), request.args.get('prefix', ''), max(1, min(limit, 200))
+        )), 200
+    except KeyError as e:
+        return jsonify({"error": "Snapshot not found", "details": f"No snapshot {e.args[0]} in worker {os.getpid()}"}), 404
+    except RuntimeError as e:
+        return jsonify({"error": "Tracing disabled", "details": str(e)}), 409
+
+@app.route('/admin/content/reload', methods=['POST'])
+@admin_required
+def content_reload_endpoint():
+    """
+    Load the content catalog file again in this worker and swap it in
+    """
+    result = dict(reload_catalog(force=True), pid=os.getpid())
+    if 'error' in result:
+        return jsonify({"error": "Catalog reload failed", "details": result.pop('error'), "catalog": result}), 500
+    return jsonify(result), 200
 
 @app.route('/calculate_all', methods=['POST'])
-def calculate_all():
+@json_body(CALCULATE_ALL_REQUEST)
+def calculate_all(payload):
     """
-    Mock endpoint for comprehensive calculations
+    Numerology and Human Design summary in one call, plus the Ascendant
+    and a narrative when requested and the deadline allows
     """
-    data = request.json
-    birth_date = data.get('birth_date')
-    birth_time = data.get('birth_time', '')
-    birth_location = data.get('birth_location', '')
+    numerology = schedule_numerology(payload.birth_date, payload.full_name)
+    human_design = schedule_human_design(payload.birth_date, payload.birth_time, payload.birth_location)
+    for chart in (numerology, human_design):
+        if 'error' in chart:
+            return jsonify({"error": "Calculation failed", "details": chart['error']}), 500
 
-    # Mock data for demonstration
-    return jsonify({
+    # Name numbers are only present when a full name was given
+    response = {
         "numerology": {
-            "life_path_number": 7,
-            "destiny_number": 5,
-            "soul_urge_number": 3
+            "life_path_number": numerology['life_path_number'],
+            "destiny_number": numerology.get('expression_number'),
+            "soul_urge_number": numerology.get('soul_urge_number'),
+            "personality_number": numerology.get('personality_number')
         },
         "human_design": {
-            "type": "Generator",
-            "strategy": "Wait to Respond",
-            "authority": "Sacral"
+            "type": human_design['type'],
+            "strategy": human_design['strategy'],
+            "authority": human_design['authority']
         },
-        "birth_time": birth_time
-    }), 200
+        "birth_time": payload.birth_time
+    }
+
+    # Optional parts are left out, and listed as omitted, when the deadline is too close
+    optional_parts = {
+        'ascendant': lambda: schedule_ascendants(payload.birth_date, payload.birth_location),
+        'narrative': lambda: request_narrative('human_design', human_design)
+    }
+    omitted = []
+    for part in dict.fromkeys(payload.include):
+        if has_time_for(Config.DEADLINE_OPTIONAL_RESERVE_MS / 1000):
+            response[part] = optional_parts[part]()
+        else:
+            omitted.append(part)
+    if response.get('narrative', {}).get('status') == 'pending':
+        response['narrative']['poll_url'] = f"/narrative/{response['narrative']['narrative_id']}"
+    if omitted:
+        response['omitted'] = omitted
+    return jsonify(response), 200
 
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=8000)
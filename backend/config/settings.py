@@ -14,11 +14,88 @@ class Config:
     # Hugging Face Configuration
     HUGGING_FACE_API_KEY = os.getenv('HUGGING_FACE_API_KEY')
     HUGGING_FACE_MODEL = os.getenv('HUGGING_FACE_MODEL', 'google/flan-t5-large')
+    HUGGING_FACE_API_URL = os.getenv('HUGGING_FACE_API_URL', 'https://api-inference.huggingface.co/models')
+    HUGGING_FACE_TIMEOUT = float(os.getenv('HUGGING_FACE_TIMEOUT', 30))
+    
+    # Inference Circuit Breaker (rolling window in seconds) and Hedged Requests
+    INFERENCE_BREAKER_WINDOW = float(os.getenv('INFERENCE_BREAKER_WINDOW', 60))
+    INFERENCE_BREAKER_MIN_CALLS = int(os.getenv('INFERENCE_BREAKER_MIN_CALLS', 10))
+    INFERENCE_BREAKER_FAILURE_RATE = float(os.getenv('INFERENCE_BREAKER_FAILURE_RATE', 0.5))
+    INFERENCE_BREAKER_SLOW_CALL = float(os.getenv('INFERENCE_BREAKER_SLOW_CALL', 15))
+    INFERENCE_BREAKER_SLOW_CALL_RATE = float(os.getenv('INFERENCE_BREAKER_SLOW_CALL_RATE', 0.5))
+    INFERENCE_BREAKER_OPEN_SECONDS = float(os.getenv('INFERENCE_BREAKER_OPEN_SECONDS', 30))
+    INFERENCE_HEDGING_ENABLED = os.getenv('INFERENCE_HEDGING_ENABLED', 'False') == 'True'
+    INFERENCE_HEDGE_MIN_DELAY_MS = float(os.getenv('INFERENCE_HEDGE_MIN_DELAY_MS', 500))
+    
+    # Narrative Generation
+    NARRATIVE_CACHE_DIR = os.getenv('NARRATIVE_CACHE_DIR', os.path.join('.cache', 'narratives'))
+    NARRATIVE_BATCH_WINDOW_MS = float(os.getenv('NARRATIVE_BATCH_WINDOW_MS', 20))
+    NARRATIVE_MAX_BATCH_SIZE = int(os.getenv('NARRATIVE_MAX_BATCH_SIZE', 8))
+    NARRATIVE_MAX_IN_FLIGHT = int(os.getenv('NARRATIVE_MAX_IN_FLIGHT', 2))
+    NARRATIVE_MAX_FAILED = int(os.getenv('NARRATIVE_MAX_FAILED', 10000))
     
     # Flask Configuration
     SECRET_KEY = os.getenv('SECRET_KEY', 'development_secret_key')
     DEBUG = os.getenv('FLASK_DEBUG', 'False') == 'True'
     
+    # Chart Request Micro-batching (numerology; Human Design charts share single flights)
+    CHART_BATCHING_ENABLED = os.getenv('CHART_BATCHING_ENABLED', 'True') == 'True'
+    CHART_BATCH_WINDOW_MS = float(os.getenv('CHART_BATCH_WINDOW_MS', 2))
+    CHART_BATCH_MAX_SIZE = int(os.getenv('CHART_BATCH_MAX_SIZE', 32))
+    CHART_BATCH_MAX_IN_FLIGHT = int(os.getenv('CHART_BATCH_MAX_IN_FLIGHT', 2))
+    CHART_BATCH_TIMEOUT = float(os.getenv('CHART_BATCH_TIMEOUT', 10))
+    
+    # Single-flight De-duplication of Identical Chart Requests
+    SINGLE_FLIGHT_CROSS_PROCESS = os.getenv('SINGLE_FLIGHT_CROSS_PROCESS', 'False') == 'True'
+    SINGLE_FLIGHT_DIR = os.getenv('SINGLE_FLIGHT_DIR', '/dev/shm/pathlet-single-flight')
+    SINGLE_FLIGHT_RESULT_TTL = float(os.getenv('SINGLE_FLIGHT_RESULT_TTL', 5))
+    
+    # Ephemeris Snapshot (precomputed by tools/ephemeris_snapshot.py)
+    EPHEMERIS_SNAPSHOT_PATH = os.getenv('EPHEMERIS_SNAPSHOT_PATH', os.path.join('data', 'ephemeris.bin'))
+    
+    # Compatibility Matching
+    PROFILE_POOL_PATH = os.getenv('PROFILE_POOL_PATH', os.path.join('data', 'profile_pool.npz'))
+    
+    # Lunar Cycles (precomputed by tools/lunar_table.py)
+    LUNAR_TABLE_PATH = os.getenv('LUNAR_TABLE_PATH', os.path.join('data', 'lunar_table.bin'))
+    
+    # Transit Events (precomputed by tools/transit_index.py)
+    TRANSIT_INDEX_PATH = os.getenv('TRANSIT_INDEX_PATH', os.path.join('data', 'transit_index.bin'))
+    
+    # Interpretation Content (hot-reloaded when the file changes; 0 disables the check)
+    CONTENT_CATALOG_PATH = os.getenv('CONTENT_CATALOG_PATH', os.path.join('backend', 'content', 'catalog.json'))
+    CONTENT_CATALOG_CHECK_INTERVAL = float(os.getenv('CONTENT_CATALOG_CHECK_INTERVAL', 30))
+    
+    # Static Assets
+    STATIC_ASSET_SOURCE_DIR = os.getenv('STATIC_ASSET_SOURCE_DIR', os.path.join('frontend', 'build'))
+    STATIC_ASSET_DIR = os.getenv('STATIC_ASSET_DIR', 'static-assets')
+    STATIC_ACCEL_REDIRECT_PREFIX = os.getenv('STATIC_ACCEL_REDIRECT_PREFIX', '')
+    
+    # Admin Endpoints (disabled while no token is set)
+    ADMIN_TOKEN = os.getenv('ADMIN_TOKEN', '')
+    
+    # Request Profiling (X-Profile header with the admin token, or sampling)
+    PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', 0))
+    PROFILE_DIR = os.getenv('PROFILE_DIR', os.path.join('.cache', 'profiles'))
+    PROFILE_MAX_FILES = int(os.getenv('PROFILE_MAX_FILES', 100))
+    
+    # Request Tracing (spans exported as OTLP JSON lines, one file per worker)
+    TRACING_ENABLED = os.getenv('TRACING_ENABLED', 'False') == 'True'
+    TRACE_DIR = os.getenv('TRACE_DIR', os.path.join('.cache', 'traces'))
+    TRACE_EXPORT_BATCH_SIZE = int(os.getenv('TRACE_EXPORT_BATCH_SIZE', 512))
+    TRACE_EXPORT_INTERVAL = float(os.getenv('TRACE_EXPORT_INTERVAL', 5))
+    
+    # Response Compression (zstd, brotli or gzip, as the client accepts)
+    COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'True') == 'True'
+    COMPRESSION_MIN_BYTES = int(os.getenv('COMPRESSION_MIN_BYTES', 1024))
+    COMPRESSION_ZSTD_LEVEL = int(os.getenv('COMPRESSION_ZSTD_LEVEL', 3))
+    COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', 4))
+    COMPRESSION_GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', 6))
+    
+    # Request Deadlines (X-Request-Deadline or X-Request-Timeout headers; 0 means no default)
+    REQUEST_DEFAULT_TIMEOUT = float(os.getenv('REQUEST_DEFAULT_TIMEOUT', 0))
+    DEADLINE_OPTIONAL_RESERVE_MS = float(os.getenv('DEADLINE_OPTIONAL_RESERVE_MS', 250))
+    
     # Rate Limiting
     REQUEST_LIMIT_PER_MINUTE = int(os.getenv('REQUEST_LIMIT_PER_MINUTE', 100))
     
@@ -0,0 +1,150 @@
+from datetime import datetime
+from typing import Any
+from backend.services.compatibility import LIFE_PATH_NUMBERS, HUMAN_DESIGN_TYPES
+from backend.services.locations import resolve_location
+from backend.services.matching import MAX_PAGE_SIZE
+from backend.services.numerology import ascii_name
+from backend.services.transits import BODY_NAMES, EVENT_KINDS
+from backend.utils.schema import Field, Schema, boolean, integer, number, one_of, list_of
+from backend.utils.validators import (
+    ValidationError,
+    validate_birth_date,
+    validate_birth_time,
+    validate_birth_location
+)
+
+MAX_LOCATION_LENGTH = 200
+MAX_NAME_LENGTH = 200
+
+
+def _string(value: Any) -> str:
+    if not isinstance(value, str):
+        raise ValidationError("must be a string")
+    return value
+
+
+def birth_date(value: Any) -> str:
+    return validate_birth_date(_string(value))
+
+
+def birth_time(value: Any) -> str:
+    return validate_birth_time(_string(value))
+
+
+def birth_location(value: Any) -> str:
+    location = validate_birth_location(_string(value))
+    if len(location) > MAX_LOCATION_LENGTH:
+        raise ValidationError(f"must be at most {MAX_LOCATION_LENGTH} characters")
+    # Charts depend on the place and its time zone; never compute them for a guess
+    if not resolve_location(location).resolved:
+        raise ValidationError("must be a known city, optionally with its region or country, or a 'latitude, longitude' pair")
+    return location
+
+
+def calendar_date(value: Any) -> str:
+    try:
+        parsed = datetime.strptime(_string(value), '%Y-%m-%d')
+    except ValueError:
+        raise ValidationError("must be a date in YYYY-MM-DD format")
+    if not 1900 <= parsed.year <= 2200:
+        raise ValidationError("must be between 1900 and 2200")
+    return parsed.strftime('%Y-%m-%d')
+
+
+def profile_id(value: Any):
+    if isinstance(value, bool) or not isinstance(value, (str, int)):
+        raise ValidationError("must be a string or integer")
+    return value
+
+
+def full_name(value: Any) -> str:
+    name = ' '.join(_string(value).split())
+    if not name:
+        raise ValidationError("cannot be empty")
+    if len(name) > MAX_NAME_LENGTH:
+        raise ValidationError(f"must be at most {MAX_NAME_LENGTH} characters")
+    if not any(character.isalpha() for character in ascii_name(name)):
+        raise ValidationError("must contain letters with a Latin transliteration")
+    return name
+
+
+def optional_location(value: Any):
+    # Blank locations fall back to the default location in the services
+    return birth_location(value) if _string(value).strip() else None
+
+
+BIRTH_DATE = Field('birth_date', birth_date)
+BIRTH_TIME = Field('birth_time', birth_time, default='')
+BIRTH_LOCATION = Field('birth_location', optional_location, default=None)
+FULL_NAME = Field('full_name', full_name, default=None)
+
+ASCENDANTS_REQUEST = Schema('AscendantsRequest', [BIRTH_DATE, Field('birth_location', birth_location)])
+
+NUMEROLOGY_REQUEST = Schema('NumerologyRequest', [BIRTH_DATE, FULL_NAME])
+
+HUMAN_DESIGN_REQUEST = Schema('HumanDesignRequest', [BIRTH_DATE, BIRTH_TIME, BIRTH_LOCATION])
+
+PERSON = Schema('Person', [BIRTH_DATE, BIRTH_TIME, BIRTH_LOCATION])
+
+COMPATIBILITY_REQUEST = Schema('CompatibilityRequest', [Field('person1', PERSON), Field('person2', PERSON)])
+
+NARRATIVE_REQUEST = Schema('NarrativeRequest', [
+    Field('kind', one_of(('human_design', 'numerology')), default='human_design'),
+    BIRTH_DATE,
+    BIRTH_TIME,
+    BIRTH_LOCATION
+])
+
+# Expensive parts of /calculate_all that clients opt into, and that are skipped near the deadline
+OPTIONAL_PARTS = ('ascendant', 'narrative')
+
+CALCULATE_ALL_REQUEST = Schema('CalculateAllRequest', [
+    BIRTH_DATE,
+    BIRTH_TIME,
+    BIRTH_LOCATION,
+    FULL_NAME,
+    Field('include', list_of(one_of(OPTIONAL_PARTS), max_items=len(OPTIONAL_PARTS)), default=())
+])
+
+FORECAST_REQUEST = Schema('ForecastRequest', [
+    BIRTH_DATE,
+    Field('start_date', calendar_date, default=None),
+    Field('end_date', calendar_date, default=None),
+    Field('format', one_of(('json', 'ndjson')), default=None)
+])
+
+LUNAR_CYCLE_REQUEST = Schema('LunarCycleRequest', [Field('date', calendar_date, default=None)])
+
+TRACEMALLOC_REQUEST = Schema('TracemallocRequest', [
+    Field('enabled', boolean),
+    Field('frames', integer(1, 64), default=1)
+])
+
+TRANSITS_REQUEST = Schema('TransitsRequest', [
+    Field('start_date', calendar_date, default=None),
+    Field('end_date', calendar_date, default=None),
+    Field('bodies', list_of(one_of(BODY_NAMES)), default=None),
+    Field('events', list_of(one_of(EVENT_KINDS)), default=None)
+])
+
+MATCH_FILTERS = Schema('MatchFilters', [
+    Field('life_path_numbers', list_of(one_of(LIFE_PATH_NUMBERS)), default=None),
+    Field('human_design_types', list_of(one_of(HUMAN_DESIGN_TYPES)), default=None),
+    Field('min_score', number, default=None)
+])
+
+
+def _profile_or_birth_date(payload) -> None:
+    if payload.profile_id is None and payload.birth_date is None:
+        raise ValidationError("either profile_id or birth_date is required")
+
+
+MATCHES_REQUEST = Schema('MatchesRequest', [
+    Field('profile_id', profile_id, default=None),
+    Field('birth_date', birth_date, default=None),
+    BIRTH_TIME,
+    BIRTH_LOCATION,
+    Field('limit', integer(1, MAX_PAGE_SIZE), default=20),
+    Field('offset', integer(0), default=0),
+    Field('filters', MATCH_FILTERS, default=MATCH_FILTERS.type(None, None, None))
+], check=_profile_or_birth_date)
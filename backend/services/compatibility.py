@@ -1,6 +1,10 @@
-from typing import Dict, List, Any
+import numpy as np
+from functools import lru_cache
+from typing import Dict, Any
 from .human_design import HumanDesignCalculator
 from .numerology import NumerologyCalculator
+from .content import ContentCatalog, get_catalog
+from backend.utils.tracing import traced
 
 class CompatibilityAnalyzer:
     """
@@ -19,24 +23,12 @@ class CompatibilityAnalyzer:
         Returns:
             Dict with compatibility insights
         """
-        compatibility_matrix = {
-            "Manifestor": {
-                "Generator": "High potential for dynamic collaboration",
-                "Projector": "Balanced energy exchange",
-                "Reflector": "Requires careful communication"
-            },
-            "Generator": {
-                "Manifestor": "Complementary energy flow",
-                "Projector": "Potential for mutual growth",
-                "Reflector": "Needs patient understanding"
-            }
-        }
-        
+        catalog = get_catalog()
         return {
             "type1": type1,
             "type2": type2,
-            "compatibility_score": compatibility_matrix.get(type1, {}).get(type2, "Neutral"),
-            "interaction_advice": "Practice open communication and respect individual strategies."
+            "compatibility_score": catalog.human_design_pairs.get((type1, type2), catalog.human_design_default),
+            "interaction_advice": catalog.interaction_advice
         }
     
     @staticmethod
@@ -51,30 +43,16 @@ class CompatibilityAnalyzer:
         Returns:
             Dict with numerological compatibility insights
         """
-        compatibility_matrix = {
-            (1, 3): "Creative and inspiring partnership",
-            (2, 6): "Nurturing and supportive relationship",
-            (4, 8): "Stable and goal-oriented connection",
-            (5, 7): "Adventurous and intellectual bond"
-        }
-        
-        # Check combinations in both directions
-        compatibility_key = (life_path1, life_path2)
-        reverse_compatibility_key = (life_path2, life_path1)
-        
-        compatibility_description = (
-            compatibility_matrix.get(compatibility_key) or 
-            compatibility_matrix.get(reverse_compatibility_key) or 
-            "Unique and complex relationship dynamic"
-        )
-        
+        catalog = get_catalog()
         return {
             "life_path1": life_path1,
             "life_path2": life_path2,
-            "compatibility_description": compatibility_description,
-            "growth_potential": "Opportunities for mutual understanding and personal development"
+            # The catalog stores every pair in both directions
+            "compatibility_description": catalog.numerology_pairs.get((life_path1, life_path2), catalog.numerology_default),
+            "growth_potential": catalog.growth_potential
         }
 
+@traced("compatibility.calculate")
 def calculate_compatibility(
     person1_data: Dict[str, str], 
     person2_data: Dict[str, str]
@@ -126,3 +104,64 @@ def calculate_compatibility(
             }
         }
     }
+
+# Dense score tables used by the ranking engine. Codes index the tables:
+# life path code = position in LIFE_PATH_NUMBERS, type code = position in
+# HUMAN_DESIGN_TYPES, and a profile bucket combines both.
+LIFE_PATH_NUMBERS = (1, 2, 3, 4, 5, 6, 7, 8, 9, 11, 22, 33)
+HUMAN_DESIGN_TYPES = HumanDesignCalculator.DESIGN_TYPES
+LIFE_PATH_CODES = {number: code for code, number in enumerate(LIFE_PATH_NUMBERS)}
+HUMAN_DESIGN_CODES = {design_type: code for code, design_type in enumerate(HUMAN_DESIGN_TYPES)}
+BUCKET_COUNT = len(LIFE_PATH_NUMBERS) * len(HUMAN_DESIGN_TYPES)
+
+NUMEROLOGY_WEIGHT = 0.5
+
+
+@lru_cache(maxsize=1)
+def _bucket_scores(catalog: ContentCatalog) -> np.ndarray:
+    numerology_scores = np.array([
+        [catalog.numerology_scores.get((first, second), catalog.numerology_default_score) for second in LIFE_PATH_NUMBERS]
+        for first in LIFE_PATH_NUMBERS
+    ])
+    human_design_scores = np.array([
+        [catalog.human_design_scores.get((first, second), catalog.human_design_default_score) for second in HUMAN_DESIGN_TYPES]
+        for first in HUMAN_DESIGN_TYPES
+    ])
+    scores = (
+        NUMEROLOGY_WEIGHT * numerology_scores[:, None, :, None]
+        + (1 - NUMEROLOGY_WEIGHT) * human_design_scores[None, :, None, :]
+    ).reshape(BUCKET_COUNT, BUCKET_COUNT).astype(np.float32)
+    scores.flags.writeable = False
+    return scores
+
+
+def get_bucket_scores() -> np.ndarray:
+    """
+    Combined compatibility scores between every pair of profile buckets.
+    
+    Built from the scores next to the pair texts in the content catalog,
+    so rankings and descriptions always agree, and rebuilt when the
+    catalog is reloaded.
+    
+    Returns:
+        np.ndarray: Read-only ``(BUCKET_COUNT, BUCKET_COUNT)`` float32 table,
+            where ``[a, b]`` scores bucket b for a query in bucket a
+    """
+    return _bucket_scores(get_catalog())
+
+
+def bucket_code(life_path_number: int, design_type: str) -> int:
+    """
+    Bucket code of a (life path number, Human Design type) pair.
+    
+    Args:
+        life_path_number (int): Life path number
+        design_type (str): Human Design type
+    
+    Returns:
+        int: Row/column of the pair in the bucket score table
+    
+    Raises:
+        KeyError: If the number or type is unknown
+    """
+    return LIFE_PATH_CODES[life_path_number] * len(HUMAN_DESIGN_TYPES) + HUMAN_DESIGN_CODES[design_type]
@@ -0,0 +1,236 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import logging
+import datetime
+import threading
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+from backend.config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+
+class FrozenDict(dict):
+    """
+    Read-only dict for catalog entries embedded in responses.
+
+    Entries are shared by every response that includes them, so they must
+    not change; being a dict, they still encode with ``json``/``jsonify``
+    and need no copy on the way out. ``copy()`` returns a plain dict.
+    """
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Catalog entries are read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return FrozenDict, (dict(self),)
+
+
+def _freeze(value: Any) -> Any:
+    """Intern strings, turn lists into tuples and dicts into FrozenDicts."""
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return FrozenDict((sys.intern(key), _freeze(item)) for key, item in value.items())
+    return value
+
+
+class ContentCatalog:
+    """
+    Interpretation text for every chart, loaded once and never mutated.
+
+    The catalog file holds all descriptions, challenges, career
+    suggestions and compatibility texts plus a ``version``. Loading turns
+    it into interned strings, tuples and read-only mappings with defaults
+    already merged, so lookups allocate nothing and every response shares
+    the same objects. A new version replaces the whole catalog object, see
+    ``reload_catalog``.
+    """
+
+    def __init__(self, data: Dict[str, Any], checksum: str = ''):
+        """
+        Args:
+            data (Dict): Parsed catalog file
+            checksum (str): SHA-256 of the file, for reporting
+
+        Raises:
+            ValueError: If a section or default entry is missing
+        """
+        try:
+            self.version = data["version"]
+            numerology = data["numerology"]
+            human_design = data["human_design"]
+            compatibility = data["compatibility"]
+
+            self.default_life_path = _freeze(numerology["default_life_path"])
+            self.life_paths: Mapping[int, FrozenDict] = MappingProxyType({
+                int(number): _freeze(dict(numerology["default_life_path"], **entry))
+                for number, entry in numerology["life_paths"].items()
+            })
+
+            default_type = human_design["default_type"]
+            self.default_type = _freeze(default_type)
+            self.design_types: Mapping[str, FrozenDict] = MappingProxyType({
+                sys.intern(name): _freeze(dict(default_type, **entry))
+                for name, entry in human_design["types"].items()
+            })
+
+            # Every pair carries its text and the score the matcher ranks by
+            pairs = compatibility["human_design"]["pairs"]
+            self.human_design_pairs: Mapping[Tuple[str, str], str] = MappingProxyType({
+                (first, second): sys.intern(entry["text"])
+                for first, entries in pairs.items() for second, entry in entries.items()
+            })
+            self.human_design_scores: Mapping[Tuple[str, str], float] = MappingProxyType({
+                (first, second): float(entry["score"])
+                for first, entries in pairs.items() for second, entry in entries.items()
+            })
+            self.human_design_default = sys.intern(compatibility["human_design"]["default"]["text"])
+            self.human_design_default_score = float(compatibility["human_design"]["default"]["score"])
+            self.interaction_advice = sys.intern(compatibility["human_design"]["interaction_advice"])
+
+            numerology_pairs, numerology_scores = {}, {}
+            for entry in compatibility["numerology"]["pairs"]:
+                first, second = entry["life_paths"]
+                numerology_pairs.setdefault((second, first), sys.intern(entry["text"]))
+                numerology_scores.setdefault((second, first), float(entry["score"]))
+                numerology_pairs[(first, second)] = sys.intern(entry["text"])
+                numerology_scores[(first, second)] = float(entry["score"])
+            self.numerology_pairs: Mapping[Tuple[int, int], str] = MappingProxyType(numerology_pairs)
+            self.numerology_scores: Mapping[Tuple[int, int], float] = MappingProxyType(numerology_scores)
+            self.numerology_default = sys.intern(compatibility["numerology"]["default"]["text"])
+            self.numerology_default_score = float(compatibility["numerology"]["default"]["score"])
+            self.growth_potential = sys.intern(compatibility["numerology"]["growth_potential"])
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid content catalog: {e!r}") from e
+
+        self.checksum = checksum
+        self.loaded_at = datetime.datetime.utcnow().isoformat(timespec='seconds') + 'Z'
+
+    @classmethod
+    def load(cls, path: str) -> 'ContentCatalog':
+        """
+        Read and freeze a catalog file.
+
+        Args:
+            path (str): Catalog path
+
+        Returns:
+            ContentCatalog
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If it is not valid JSON or lacks a section
+        """
+        with open(path, 'rb') as catalog_file:
+            raw = catalog_file.read()
+        return cls(json.loads(raw), hashlib.sha256(raw).hexdigest())
+
+    def life_path(self, number: int) -> FrozenDict:
+        """
+        Description, challenges and careers of a life path number.
+
+        Args:
+            number (int): Life path number
+
+        Returns:
+            FrozenDict with description, challenges and careers
+        """
+        return self.life_paths.get(number, self.default_life_path)
+
+    def design_type(self, design_type: str) -> FrozenDict:
+        """
+        Chart text, details and compatibility of a Human Design type.
+
+        Args:
+            design_type (str): Human Design type
+
+        Returns:
+            FrozenDict with chart, details and compatibility entries
+        """
+        return self.design_types.get(design_type, self.default_type)
+
+    def info(self) -> Dict[str, Any]:
+        return {"version": self.version, "checksum": self.checksum, "loaded_at": self.loaded_at}
+
+
+_catalog: Optional[ContentCatalog] = None
+_stamp: Optional[Tuple[int, int]] = None
+_next_check = 0.0
+_reload_lock = threading.Lock()
+
+
+def _file_stamp(path: str) -> Tuple[int, int]:
+    status = os.stat(path)
+    return status.st_mtime_ns, status.st_size
+
+
+def reload_catalog(force: bool = False) -> Dict[str, Any]:
+    """
+    Load the catalog file again if it changed, and swap it in.
+
+    The new catalog is built completely before a single reference
+    assignment replaces the old one, so concurrent requests see either
+    the old or the new version, never a mix. A file that fails to load
+    leaves the current catalog in place. Replace the file atomically
+    (write a temporary file, then rename it) so it is never read half
+    written.
+
+    Args:
+        force (bool): Reload even if the file looks unchanged
+
+    Returns:
+        Dict with version, checksum, load time and whether it was
+            reloaded, plus the error if the file could not be loaded
+
+    Raises:
+        OSError, ValueError: If there is no catalog yet and the file
+            cannot be loaded
+    """
+    global _catalog, _stamp, _next_check
+
+    path = Config.CONTENT_CATALOG_PATH
+    with _reload_lock:
+        _next_check = time.monotonic() + Config.CONTENT_CATALOG_CHECK_INTERVAL
+        try:
+            stamp = _file_stamp(path)
+            if _catalog is not None and stamp == _stamp and not force:
+                return dict(_catalog.info(), reloaded=False)
+            catalog = ContentCatalog.load(path)
+        except (OSError, ValueError) as e:
+            if _catalog is None:
+                raise
+            logger.error(f"Keeping content catalog version {_catalog.version}: {e}")
+            return dict(_catalog.info(), reloaded=False, error=str(e))
+
+        previous = _catalog
+        _catalog, _stamp = catalog, stamp
+    if previous is not None:
+        logger.info(f"Content catalog reloaded: version {previous.version} -> {catalog.version}")
+    return dict(catalog.info(), reloaded=True)
+
+
+def get_catalog() -> ContentCatalog:
+    """
+    The current content catalog.
+
+    Loaded on first use. With ``Config.CONTENT_CATALOG_CHECK_INTERVAL``
+    set, the file is checked for changes at most that often, so every
+    worker picks up a new version without a restart.
+
+    Returns:
+        ContentCatalog
+    """
+    catalog = _catalog
+    if catalog is None or (Config.CONTENT_CATALOG_CHECK_INTERVAL > 0 and time.monotonic() >= _next_check):
+        reload_catalog()
+        catalog = _catalog
+    return catalog
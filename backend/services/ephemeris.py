@@ -0,0 +1,227 @@
+import os
+import logging
+import datetime
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, Optional, Tuple, Union
+import ephem
+from backend.config.settings import Config
+from backend.utils.binary_table import read_table, write_table
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b'PLEPHM01'
+SNAPSHOT_VERSION = 1
+
+# Births from 1900 need design dates from late 1899; transits run to 2100
+SNAPSHOT_FIRST_DAY = datetime.date(1899, 1, 1)
+SNAPSHOT_LAST_DAY = datetime.date(2101, 12, 31)
+SNAPSHOT_STEP = 1.0  # days between samples
+
+SNAPSHOT_BODIES = (
+    "Sun", "Moon", "North Node", "Mercury", "Venus", "Mars",
+    "Jupiter", "Saturn", "Uranus", "Neptune", "Pluto"
+)
+BODY_COLUMNS = {name: column for column, name in enumerate(SNAPSHOT_BODIES)}
+
+# Extra samples on each side for the speed stencil
+STENCIL_MARGIN = 2
+
+
+def _sample_longitudes(name: str, dates: np.ndarray) -> np.ndarray:
+    """Apparent ecliptic longitudes of date of one body, in degrees."""
+    from .human_design import _apparent_longitude, _mean_node_longitude
+
+    if name == "North Node":
+        return np.array([_mean_node_longitude(date) for date in dates.tolist()])
+    body = getattr(ephem, name)()
+    return np.array([_apparent_longitude(body, date) for date in dates.tolist()])
+
+
+class EphemerisSnapshot:
+    """
+    Sampled ecliptic longitudes and speeds, interpolated for any instant.
+
+    Every body is sampled once per ``step`` days; speeds come from a
+    fourth-order central difference of the unwrapped samples. Positions
+    between samples use cubic Hermite interpolation on the longitude and
+    speed at both ends, which is accurate to well under an arcsecond for
+    the planets and a few arcseconds for the Moon at a daily step. The
+    arrays are ``(samples, bodies)`` float32 and, when loaded from disk,
+    read-only memory maps shared by every process.
+    """
+
+    def __init__(self, start: float, step: float, longitudes: np.ndarray, speeds: np.ndarray):
+        """
+        Args:
+            start (float): Ephem date of the first sample
+            step (float): Days between samples
+            longitudes (np.ndarray): Longitudes in degrees, shape (samples, bodies)
+            speeds (np.ndarray): Speeds in degrees per day, same shape
+        """
+        self.start = start
+        self.step = step
+        self.longitudes = longitudes
+        self.speeds = speeds
+        self.end = start + step * (len(longitudes) - 1)
+
+    @classmethod
+    def build(
+        cls,
+        first_day: datetime.date = SNAPSHOT_FIRST_DAY,
+        last_day: datetime.date = SNAPSHOT_LAST_DAY,
+        step: float = SNAPSHOT_STEP,
+        workers: int = 1
+    ) -> 'EphemerisSnapshot':
+        """
+        Sample every body with ephem.
+
+        Args:
+            first_day (date): First sampled day (00:00 UTC)
+            last_day (date): Last sampled day (inclusive)
+            step (float): Days between samples
+            workers (int): Processes sampling bodies in parallel
+
+        Returns:
+            EphemerisSnapshot
+        """
+        start = float(ephem.Date(first_day))
+        samples = int(round((ephem.Date(last_day) - start) / step)) + 1
+        dates = start + step * np.arange(-STENCIL_MARGIN, samples + STENCIL_MARGIN)
+
+        if workers > 1:
+            with ProcessPoolExecutor(workers) as executor:
+                columns = list(executor.map(_sample_longitudes, SNAPSHOT_BODIES, [dates] * len(SNAPSHOT_BODIES)))
+        else:
+            columns = [_sample_longitudes(name, dates) for name in SNAPSHOT_BODIES]
+
+        unwrapped = np.degrees(np.unwrap(np.radians(np.stack(columns, axis=1)), axis=0))
+        speeds = (unwrapped[:-4] - 8 * unwrapped[1:-3] + 8 * unwrapped[3:-1] - unwrapped[4:]) / (12 * step)
+        longitudes = unwrapped[STENCIL_MARGIN:-STENCIL_MARGIN] % 360.0
+        return cls(start, step, longitudes.astype(np.float32), speeds.astype(np.float32))
+
+    def save(self, path: str):
+        """
+        Write the snapshot as a flat binary table, atomically.
+
+        Args:
+            path (str): Destination path
+        """
+        write_table(path, SNAPSHOT_MAGIC, {"longitudes": self.longitudes, "speeds": self.speeds}, {
+            "version": SNAPSHOT_VERSION,
+            "start": self.start,
+            "step": self.step,
+            "bodies": list(SNAPSHOT_BODIES),
+            "frame": "apparent geocentric ecliptic of date, mean node"
+        })
+
+    @classmethod
+    def load(cls, path: str) -> 'EphemerisSnapshot':
+        """
+        Memory-map a snapshot written by ``save``.
+
+        Args:
+            path (str): Snapshot path
+
+        Returns:
+            EphemerisSnapshot
+
+        Raises:
+            ValueError: If the file is not a snapshot of this version and body list
+        """
+        columns, attrs = read_table(path, SNAPSHOT_MAGIC)
+        if attrs.get("version") != SNAPSHOT_VERSION or attrs.get("bodies") != list(SNAPSHOT_BODIES):
+            raise ValueError(f"{path} is an incompatible ephemeris snapshot")
+        return cls(attrs["start"], attrs["step"], columns["longitudes"], columns["speeds"])
+
+    def covers(self, date: Union[float, np.ndarray]) -> bool:
+        """
+        Whether every given ephem date lies inside the snapshot.
+
+        Args:
+            date (float or np.ndarray): Ephem date(s)
+
+        Returns:
+            bool
+        """
+        return bool(np.all((date >= self.start) & (date <= self.end)))
+
+    def interpolate(self, date: Union[float, np.ndarray], body: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Longitudes and speeds at arbitrary instants.
+
+        Args:
+            date (float or np.ndarray): Ephem date(s) (UTC)
+            body (str, optional): Body name; all bodies if omitted
+
+        Returns:
+            Tuple of (longitudes in degrees, speeds in degrees per day) with
+                shape ``date.shape`` for one body or ``date.shape + (bodies,)``
+
+        Raises:
+            ValueError: If a date is outside the snapshot
+        """
+        date = np.asarray(date, dtype=np.float64)
+        if not self.covers(date):
+            raise ValueError("Instant outside the ephemeris snapshot")
+
+        position = (date - self.start) / self.step
+        index = np.minimum(position.astype(np.int64), len(self.longitudes) - 2)
+        u = position - index
+        columns = slice(None) if body is None else BODY_COLUMNS[body]
+        if body is None:
+            u = u[..., np.newaxis]
+
+        p0 = self.longitudes[index, columns].astype(np.float64)
+        p1 = self.longitudes[index + 1, columns].astype(np.float64)
+        p1 = p0 + (p1 - p0 + 180.0) % 360.0 - 180.0
+        m0 = self.speeds[index, columns] * self.step
+        m1 = self.speeds[index + 1, columns] * self.step
+
+        u2, u3 = u * u, u * u * u
+        longitude = (
+            (2 * u3 - 3 * u2 + 1) * p0 + (u3 - 2 * u2 + u) * m0
+            + (-2 * u3 + 3 * u2) * p1 + (u3 - u2) * m1
+        )
+        speed = (
+            (6 * u2 - 6 * u) * p0 + (3 * u2 - 4 * u + 1) * m0
+            + (-6 * u2 + 6 * u) * p1 + (3 * u2 - 2 * u) * m1
+        ) / self.step
+        return longitude % 360.0, speed
+
+    def positions(self, date: float) -> Dict[str, Dict[str, float]]:
+        """
+        Every body's longitude and speed at one instant.
+
+        Args:
+            date (float): Ephem date (UTC)
+
+        Returns:
+            Dict keyed by body name with longitude and speed
+        """
+        longitudes, speeds = self.interpolate(date)
+        return {
+            name: {"longitude": float(longitude), "speed": float(speed)}
+            for name, longitude, speed in zip(SNAPSHOT_BODIES, longitudes.tolist(), speeds.tolist())
+        }
+
+
+@lru_cache(maxsize=None)
+def get_ephemeris_snapshot() -> Optional[EphemerisSnapshot]:
+    """
+    The ephemeris snapshot, memory-mapped once per process.
+
+    Returns:
+        EphemerisSnapshot from ``Config.EPHEMERIS_SNAPSHOT_PATH``, or None
+            if there is none (callers then use ephem directly)
+    """
+    path = Config.EPHEMERIS_SNAPSHOT_PATH
+    if not os.path.exists(path):
+        logger.warning(f"Ephemeris snapshot {path} not found; run tools/ephemeris_snapshot.py at build time")
+        return None
+    try:
+        return EphemerisSnapshot.load(path)
+    except ValueError as e:
+        logger.warning(f"Ignoring ephemeris snapshot: {e}")
+        return None
@@ -0,0 +1,124 @@
+import datetime
+import numpy as np
+from typing import Dict, Any, Iterator
+from backend.utils.tracing import traced
+
+# Longest forecast served in one request (about a century of days)
+MAX_FORECAST_DAYS = 36525
+NDJSON_CHUNK_DAYS = 2048
+
+
+def _digital_root(values: np.ndarray) -> np.ndarray:
+    # Repeated digit sums of a positive number end at 1 + (n - 1) mod 9
+    return 1 + (values - 1) % 9
+
+
+class PersonalCycleForecast:
+    """
+    Personal year, month and day numbers for every day of a date range.
+
+    Personal cycles run from 1 to 9: the personal year reduces the birth
+    month, birth day and calendar year; the personal month adds the
+    calendar month to the personal year, and the personal day adds the
+    day of the month to the personal month. Digit sums preserve the value
+    modulo 9, so each reduction is a single array expression.
+    """
+
+    def __init__(self, birth_date: str, start_date: str, end_date: str):
+        """
+        Args:
+            birth_date (str): Birth date in YYYY-MM-DD format
+            start_date (str): First forecast day in YYYY-MM-DD format
+            end_date (str): Last forecast day (inclusive) in YYYY-MM-DD format
+
+        Raises:
+            ValueError: If a date is malformed or the range is empty or too long
+        """
+        birth = datetime.datetime.strptime(birth_date, "%Y-%m-%d")
+        start, end = np.datetime64(start_date, 'D'), np.datetime64(end_date, 'D')
+        if end < start:
+            raise ValueError("end_date must not be before start_date")
+        if end - start >= MAX_FORECAST_DAYS:
+            raise ValueError(f"Forecasts cover at most {MAX_FORECAST_DAYS} days")
+
+        self.birth_date = birth_date
+        self.dates = np.arange(start, end + 1, dtype='datetime64[D]')
+
+        months = self.dates.astype('datetime64[M]')
+        years = months.astype('datetime64[Y]').astype(np.int64) + 1970
+        month_numbers = months.astype(np.int64) % 12 + 1
+        day_numbers = (self.dates - months).astype(np.int64) + 1
+
+        self.personal_year = _digital_root(birth.month + birth.day + years).astype(np.int8)
+        self.personal_month = _digital_root(self.personal_year + month_numbers).astype(np.int8)
+        self.personal_day = _digital_root(self.personal_month + day_numbers).astype(np.int8)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def to_compact(self) -> Dict[str, Any]:
+        """
+        Columnar forecast: one entry per year and month, one digit per day.
+
+        Returns:
+            Dict with the range, personal years and months as run-length
+                segments, and ``personal_days`` as a string whose i-th digit
+                is the personal day of ``start + i`` days
+        """
+        months = self.dates.astype('datetime64[M]')
+        month_starts = np.flatnonzero(np.r_[True, months[1:] != months[:-1]])
+        years = months[month_starts].astype('datetime64[Y]')
+        year_starts = month_starts[np.r_[True, years[1:] != years[:-1]]]
+
+        return {
+            "birth_date": self.birth_date,
+            "start_date": str(self.dates[0]),
+            "end_date": str(self.dates[-1]),
+            "days": len(self),
+            "personal_years": [
+                {"year": int(str(year)), "personal_year": number}
+                for year, number in zip(self.dates[year_starts].astype('datetime64[Y]'),
+                                        self.personal_year[year_starts].tolist())
+            ],
+            "personal_months": [
+                {"month": str(month), "personal_month": number}
+                for month, number in zip(months[month_starts], self.personal_month[month_starts].tolist())
+            ],
+            "personal_days": (self.personal_day + ord('0')).astype(np.uint8).tobytes().decode('ascii')
+        }
+
+    def iter_ndjson(self) -> Iterator[str]:
+        """
+        Stream one JSON object per day, in chunks of newline-delimited lines.
+
+        Yields:
+            str: Lines for up to ``NDJSON_CHUNK_DAYS`` days
+        """
+        for offset in range(0, len(self), NDJSON_CHUNK_DAYS):
+            window = slice(offset, offset + NDJSON_CHUNK_DAYS)
+            rows = zip(
+                np.datetime_as_string(self.dates[window]).tolist(),
+                self.personal_year[window].tolist(),
+                self.personal_month[window].tolist(),
+                self.personal_day[window].tolist()
+            )
+            yield ''.join(
+                f'{{"date":"{date}","personal_year":{year},"personal_month":{month},"personal_day":{day}}}\n'
+                for date, year, month, day in rows
+            )
+
+
+@traced("forecast.calculate")
+def calculate_forecast(birth_date: str, start_date: str, end_date: str) -> PersonalCycleForecast:
+    """
+    Personal cycle forecast wrapper.
+
+    Args:
+        birth_date (str): Birth date in YYYY-MM-DD format
+        start_date (str): First forecast day in YYYY-MM-DD format
+        end_date (str): Last forecast day (inclusive) in YYYY-MM-DD format
+
+    Returns:
+        PersonalCycleForecast
+    """
+    return PersonalCycleForecast(birth_date, start_date, end_date)
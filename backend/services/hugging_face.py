@@ -1,16 +1,69 @@
 import os
+import math
 import requests
 from dotenv import load_dotenv
 import ephem
 import datetime
-import pytz
+import numpy as np
 from typing import Dict, List, Optional, Any
+from backend.utils.timezones import local_to_utc, get_timezone_table
+from backend.utils.tracing import traced
+from .locations import Location, resolve_location
 
 load_dotenv()
 
 HUGGING_FACE_API_KEY = os.getenv("HUGGING_FACE_API_KEY")
 HUGGING_FACE_MODEL = "google/flan-t5-large"
 
+ZODIAC_SIGNS = (
+    "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
+    "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"
+)
+
+SIDEREAL_DEGREES_PER_DAY = 360.98564736629
+EPHEM_JULIAN_OFFSET = 2415020.0  # ephem.Date(0) expressed as a Julian date
+
+# Sweep grid used only to bracket sign boundaries before refinement
+SWEEP_STEP_MINUTES = 5
+NEWTON_ITERATIONS = 4
+
+
+def _mean_obliquity(date: float) -> float:
+    """Mean obliquity of the ecliptic (IAU 1980), in degrees."""
+    t = (date + EPHEM_JULIAN_OFFSET - 2451545.0) / 36525.0
+    return 23.439291 - 0.0130042 * t - 1.64e-7 * t ** 2 + 5.04e-7 * t ** 3
+
+
+def _local_sidereal_degrees(date: float, longitude: float) -> float:
+    """Apparent local sidereal time at an instant, in degrees."""
+    observer = ephem.Observer()
+    observer.lon = str(longitude)
+    observer.date = date
+    return math.degrees(observer.sidereal_time())
+
+
+def ascendant_longitude(local_sidereal: Any, latitude: float, obliquity: float) -> Any:
+    """
+    Ecliptic longitude of the Ascendant for one or many local sidereal times.
+    
+    Args:
+        local_sidereal (float or np.ndarray): Local sidereal time (RAMC) in degrees
+        latitude (float): Geographic latitude in degrees
+        obliquity (float): Obliquity of the ecliptic in degrees
+    
+    Returns:
+        float or np.ndarray: Ascendant longitude in degrees, in [0, 360)
+    """
+    ramc = np.radians(local_sidereal)
+    eps = math.radians(obliquity)
+    tan_phi = math.tan(math.radians(latitude))
+    ascendant = np.arctan2(
+        np.cos(ramc),
+        -(np.sin(ramc) * math.cos(eps) + tan_phi * math.sin(eps))
+    )
+    return np.degrees(ascendant) % 360.0
+
+
 class AstrologyCalculator:
     """
     Advanced astrological calculation service using precise astronomical libraries.
@@ -30,23 +83,19 @@ class AstrologyCalculator:
             Dict containing ascendant details
         """
         try:
-            # Parse birth date and time
+            # Parse birth date and time, local to the birth location
             birth_datetime = datetime.datetime.strptime(f"{birth_date} {birth_time}", "%Y-%m-%d %I:%M %p")
+            location = resolve_location(birth_location)
+            date = float(ephem.Date(local_to_utc(birth_datetime, location.timezone).utc))
             
-            # Use ephem for precise astronomical calculations
-            observer = ephem.Observer()
-            observer.date = birth_datetime.strftime('%Y/%m/%d %H:%M:%S')
-            
-            # Placeholder for location-based calculations
-            # In a real implementation, you'd use geocoding to get precise coordinates
-            observer.lat = '40.7128'  # Default to New York latitude
-            observer.lon = '-74.0060'  # Default to New York longitude
-            
-            # Calculate ascendant
-            ascendant = ephem.constellation(observer.radec()[0])[1]
+            local_sidereal = _local_sidereal_degrees(date, location.longitude)
+            longitude = float(ascendant_longitude(local_sidereal, location.latitude, _mean_obliquity(date)))
+            ascendant = ZODIAC_SIGNS[int(longitude // 30) % 12]
             
             return {
                 "sign": ascendant,
+                "degree": round(longitude % 30, 2),
+                "location": location.name,
                 "description": f"The {ascendant} Ascendant suggests a dynamic and transformative personality.",
                 "calculation_method": "Precise Astronomical Calculation"
             }
@@ -57,6 +106,78 @@ class AstrologyCalculator:
                 "details": "Unable to determine precise ascendant"
             }
     
+    @staticmethod
+    def sweep_ascendants(birth_date: str, location: Optional[Location] = None) -> List[Dict[str, Any]]:
+        """
+        Find every rising sign over the local birth day and the window it rises in.
+        
+        Local sidereal time advances linearly through the day, so the whole
+        day is evaluated as one vectorized grid to bracket each sign boundary,
+        and all boundaries are then refined together with Newton's method on
+        local sidereal time.
+        
+        Args:
+            birth_date (str): Birth date in YYYY-MM-DD format
+            location (Location, optional): Resolved birth location
+        
+        Returns:
+            List of dicts with sign, start and end (local ISO 8601) in time order
+        """
+        location = location or resolve_location(None)
+        day_start = datetime.datetime.strptime(birth_date, "%Y-%m-%d")
+        
+        # The local day can be 23 or 25 hours long when clocks change
+        utc_start = local_to_utc(day_start, location.timezone).utc
+        utc_end = local_to_utc(day_start + datetime.timedelta(days=1), location.timezone).utc
+        span = (utc_end - utc_start).total_seconds() / 86400.0
+        
+        date = float(ephem.Date(utc_start))
+        obliquity = _mean_obliquity(date)
+        sidereal_start = _local_sidereal_degrees(date, location.longitude)
+        
+        # Bracket boundaries on a grid of unwrapped ascendant longitudes
+        steps = int(math.ceil(span * 24 * 60 / SWEEP_STEP_MINUTES))
+        sidereal = sidereal_start + SIDEREAL_DEGREES_PER_DAY * np.linspace(0.0, span, steps + 1)
+        ascendants = np.degrees(np.unwrap(np.radians(
+            ascendant_longitude(sidereal, location.latitude, obliquity)
+        )))
+        
+        first_boundary = math.floor(ascendants[0] / 30.0) * 30.0 + 30.0
+        boundaries = np.arange(first_boundary, ascendants[-1], 30.0)
+        upper = np.clip(np.searchsorted(ascendants, boundaries), 1, steps)
+        lower = upper - 1
+        
+        # Interpolated warm start, then vectorized Newton on local sidereal time
+        fraction = (boundaries - ascendants[lower]) / (ascendants[upper] - ascendants[lower])
+        roots = sidereal[lower] + fraction * (sidereal[upper] - sidereal[lower])
+        for _ in range(NEWTON_ITERATIONS):
+            residual = (ascendant_longitude(roots, location.latitude, obliquity) - boundaries + 180.0) % 360.0 - 180.0
+            slope = ((ascendant_longitude(roots + 1e-3, location.latitude, obliquity)
+                      - ascendant_longitude(roots - 1e-3, location.latitude, obliquity) + 180.0) % 360.0 - 180.0) / 2e-3
+            roots = roots - residual / slope
+        
+        # Convert every window edge back to local time in one batch
+        start_seconds = (utc_start - datetime.datetime(1970, 1, 1)) // datetime.timedelta(seconds=1)
+        crossing_seconds = np.rint((roots - sidereal_start) / SIDEREAL_DEGREES_PER_DAY * 86400.0).astype(np.int64)
+        edge_seconds = np.concatenate(([0], crossing_seconds, [int(round(span * 86400))])) + start_seconds
+        local_seconds, offsets = get_timezone_table(location.timezone).utc_to_local_batch(edge_seconds)
+        edges = [
+            (datetime.datetime(1970, 1, 1) + datetime.timedelta(seconds=int(local))).replace(
+                tzinfo=datetime.timezone(datetime.timedelta(seconds=int(offset)))
+            ).isoformat(timespec="seconds")
+            for local, offset in zip(local_seconds, offsets)
+        ]
+        first_sign = int(ascendants[0] // 30)
+        
+        return [
+            {
+                "sign": ZODIAC_SIGNS[(first_sign + index) % 12],
+                "start": edges[index],
+                "end": edges[index + 1]
+            }
+            for index in range(len(edges) - 1)
+        ]
+    
     @staticmethod
     def get_zodiac_sign(birth_date: str) -> str:
         """
@@ -89,6 +210,7 @@ class AstrologyCalculator:
         except Exception as e:
             return f"Calculation Error: {str(e)}"
 
+@traced("ascendants.sweep")
 def get_possible_ascendants(birth_date: str, birth_location: str) -> Dict[str, Any]:
     """
     Wrapper function for ascendant calculation.
@@ -100,22 +222,24 @@ def get_possible_ascendants(birth_date: str, birth_location: str) -> Dict[str, A
     Returns:
         Dict with ascendant information
     """
-    # Use a default time if not provided
-    default_time = "12:00 PM"
-    
+    # Without a birth time, every sign rising during the day is a candidate
     try:
-        ascendant_info = AstrologyCalculator.calculate_ascendant(
-            birth_date, 
-            default_time, 
-            birth_location
-        )
+        location = resolve_location(birth_location)
+        windows = AstrologyCalculator.sweep_ascendants(birth_date, location)
+        possible_ascendants = list(dict.fromkeys(window["sign"] for window in windows))
         
         # Ensure consistent response structure
         return {
-            "possible_ascendants": [ascendant_info.get('sign', 'Unknown')],
-            "description": ascendant_info.get('description', 'Ascendant details unavailable'),
-            "instructions": "Review the calculated Ascendant and its potential implications.",
-            "calculation_method": ascendant_info.get('calculation_method', 'Standard Astronomical')
+            "possible_ascendants": possible_ascendants,
+            "ascendant_windows": windows,
+            "description": f"{len(possible_ascendants)} Ascendants rise over the course of your birth date; each is listed with the time window in which it was rising.",
+            "instructions": "Review the listed Ascendants and choose the one whose time window matches your birth time, or that resonates most with you.",
+            "location": {
+                "name": location.name,
+                "timezone": location.timezone,
+                "resolved": location.resolved
+            },
+            "calculation_method": "Ascendant Sweep over Local Sidereal Time"
         }
     
     except Exception as e:
@@ -1,51 +1,280 @@
 import datetime
-from typing import Dict, Any, Optional
+import math
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
 import ephem
+from scipy import optimize
+from backend.utils.timezones import local_to_utc
+from backend.utils.tracing import traced
+from .locations import resolve_location
+from .ephemeris import get_ephemeris_snapshot
+from .content import get_catalog
+
+# Rave Mandala: gate order around the ecliptic, starting with Gate 41 at 2° Aquarius
+GATE_ORDER = (
+    41, 19, 13, 49, 30, 55, 37, 63, 22, 36, 25, 17, 21, 51, 42, 3,
+    27, 24, 2, 23, 8, 20, 16, 35, 45, 12, 15, 52, 39, 53, 62, 56,
+    31, 33, 7, 4, 29, 59, 40, 64, 47, 6, 46, 18, 48, 57, 32, 50,
+    28, 44, 1, 43, 14, 34, 9, 5, 26, 11, 10, 58, 38, 54, 61, 60
+)
+MANDALA_START = 302.0
+GATE_WIDTH = 360.0 / 64
+LINE_WIDTH = GATE_WIDTH / 6
+
+# Charts without a birth time are cast for noon
+DEFAULT_BIRTH_TIME = "12:00 PM"
+BIRTH_TIME_FORMATS = ("%I:%M %p", "%H:%M", "%H:%M:%S")
+
+CENTER_GATES = {
+    "Head": (64, 61, 63),
+    "Ajna": (47, 24, 4, 17, 43, 11),
+    "Throat": (62, 23, 56, 35, 12, 45, 33, 8, 31, 20, 16),
+    "G": (7, 1, 13, 10, 15, 2, 46, 25),
+    "Heart": (21, 40, 26, 51),
+    "Sacral": (5, 14, 29, 59, 9, 3, 42, 27, 34),
+    "Spleen": (48, 57, 44, 50, 32, 28, 18),
+    "Solar Plexus": (6, 37, 22, 36, 30, 55, 49),
+    "Root": (58, 38, 54, 53, 60, 52, 19, 39, 41)
+}
+GATE_CENTERS = {gate: center for center, gates in CENTER_GATES.items() for gate in gates}
+
+CHANNELS = (
+    (1, 8), (2, 14), (3, 60), (4, 63), (5, 15), (6, 59), (7, 31), (9, 52),
+    (10, 20), (10, 34), (10, 57), (11, 56), (12, 22), (13, 33), (16, 48), (17, 62),
+    (18, 58), (19, 49), (20, 34), (20, 57), (21, 45), (23, 43), (24, 61), (25, 51),
+    (26, 44), (27, 50), (28, 38), (29, 46), (30, 41), (32, 54), (34, 57), (35, 36),
+    (37, 40), (39, 55), (42, 53), (47, 64)
+)
+MOTOR_CENTERS = frozenset(("Sacral", "Solar Plexus", "Heart", "Root"))
+
+# Planetary bodies in the conventional activation order; Earth and the nodes are derived
+ACTIVATION_BODIES = (
+    ("Sun", ephem.Sun), ("Earth", None), ("North Node", None), ("South Node", None),
+    ("Moon", ephem.Moon), ("Mercury", ephem.Mercury), ("Venus", ephem.Venus),
+    ("Mars", ephem.Mars), ("Jupiter", ephem.Jupiter), ("Saturn", ephem.Saturn),
+    ("Uranus", ephem.Uranus), ("Neptune", ephem.Neptune), ("Pluto", ephem.Pluto)
+)
+
+DESIGN_SOLAR_ARC = 88.0
+MEAN_SOLAR_MOTION = 360.0 / 365.2422  # degrees per day
+EPHEM_JULIAN_OFFSET = 2415020.0  # ephem.Date(0) expressed as a Julian date
+
+
+def _wrap_degrees(angle: float) -> float:
+    """Wrap an angle difference into the (-180, 180] range."""
+    return (angle + 180.0) % 360.0 - 180.0
+
+
+def _apparent_longitude(body: ephem.Body, date: float) -> float:
+    """Apparent geocentric ecliptic longitude of date, in degrees."""
+    body.compute(date)
+    equatorial = ephem.Equatorial(body.g_ra, body.g_dec, epoch=date)
+    return math.degrees(ephem.Ecliptic(equatorial, epoch=date).lon)
+
+
+def _mean_node_longitude(date: float) -> float:
+    """Mean longitude of the Moon's ascending node (Meeus, ch. 47), in degrees."""
+    t = (date + EPHEM_JULIAN_OFFSET - 2451545.0) / 36525.0
+    node = 125.04452 - 1934.136261 * t + 0.0020708 * t ** 2 + t ** 3 / 450000.0
+    return node % 360.0
+
+
+def _solar_longitude(date: float) -> float:
+    return _apparent_longitude(ephem.Sun(), date)
+
+
+@lru_cache(maxsize=None)
+def _solar_longitude_at_day(day: int) -> float:
+    """
+    Memoized solar longitude table sampled at whole ephem days.
+    
+    Unbounded on purpose: an LRU would relink entries on every hit and
+    dirty pages shared with the pre-fork master.
+    """
+    return _solar_longitude(float(day))
+
 
 class HumanDesignCalculator:
     """
     Advanced Human Design Type Calculator with comprehensive analysis.
     """
     
-    DESIGN_TYPES = {
-        "Manifestor": {
-            "strategy": "Inform before acting",
-            "authority": "Emotive or Splenic",
-            "signature": "Peace",
-            "not_self_theme": "Anger",
-            "description": "Initiators who can start things independently and create significant impact."
-        },
-        "Generator": {
-            "strategy": "Wait to Respond",
-            "authority": "Sacral",
-            "signature": "Satisfaction",
-            "not_self_theme": "Frustration",
-            "description": "Life-force energy workers who thrive by responding to opportunities."
-        },
-        "Manifesting Generator": {
-            "strategy": "Wait to Respond, then Inform",
-            "authority": "Sacral",
-            "signature": "Satisfaction",
-            "not_self_theme": "Frustration",
-            "description": "Hybrid type combining Manifestor's initiating power with Generator's response mechanism."
-        },
-        "Projector": {
-            "strategy": "Wait for Invitation",
-            "authority": "Splenic or Mental",
-            "signature": "Success",
-            "not_self_theme": "Bitterness",
-            "description": "Guides and managers who direct energy of others with precision."
-        },
-        "Reflector": {
-            "strategy": "Wait a lunar cycle before making decisions",
-            "authority": "Lunar",
-            "signature": "Surprise",
-            "not_self_theme": "Disappointment",
-            "description": "Rare type that samples and reflects community energy, requiring unique decision-making approach."
+    # Descriptions, strategies and themes live in the content catalog
+    DESIGN_TYPES = ("Manifestor", "Generator", "Manifesting Generator", "Projector", "Reflector")
+    
+    @staticmethod
+    def get_gate_and_line(longitude: float) -> Tuple[int, int]:
+        """
+        Map an ecliptic longitude onto the Rave Mandala.
+        
+        Args:
+            longitude (float): Tropical ecliptic longitude in degrees
+        
+        Returns:
+            Tuple of (gate, line)
+        """
+        offset = (longitude - MANDALA_START) % 360.0
+        gate_index = int(offset // GATE_WIDTH) % 64
+        line = int((offset - gate_index * GATE_WIDTH) // LINE_WIDTH) + 1
+        return GATE_ORDER[gate_index], min(line, 6)
+    
+    @staticmethod
+    def find_design_date(birth_date: float) -> float:
+        """
+        Solve for the design instant, 88° of solar arc before birth.
+        
+        The initial guess is interpolated from the ephemeris snapshot (or,
+        without one, the memoized daily solar longitude table), so Newton's
+        method converges in a couple of ephemeris evaluations.
+        
+        Args:
+            birth_date (float): Birth instant as an ephem date (UTC)
+        
+        Returns:
+            float: Design instant as an ephem date
+        """
+        target = (_solar_longitude(birth_date) - DESIGN_SOLAR_ARC) % 360.0
+        
+        # Warm start from the snapshot or cached table around the mean-motion estimate
+        day = math.floor(birth_date - DESIGN_SOLAR_ARC / MEAN_SOLAR_MOTION)
+        snapshot = get_ephemeris_snapshot()
+        if snapshot is not None and snapshot.covers(day):
+            start, daily_motion = (float(value) for value in snapshot.interpolate(day, "Sun"))
+        else:
+            start = _solar_longitude_at_day(day)
+            daily_motion = _wrap_degrees(_solar_longitude_at_day(day + 1) - start)
+        guess = day + _wrap_degrees(target - start) / daily_motion
+        
+        def residual(date: float) -> float:
+            return _wrap_degrees(_solar_longitude(date) - target)
+        
+        try:
+            return optimize.newton(residual, guess, fprime=lambda date: daily_motion, tol=1e-7)
+        except RuntimeError:
+            return optimize.brentq(residual, guess - 1.0, guess + 1.0, xtol=1e-7)
+    
+    @staticmethod
+    def calculate_activations(date: float) -> Dict[str, Dict[str, Any]]:
+        """
+        Calculate gate and line activations for every body at an instant.
+        
+        Longitudes are interpolated from the ephemeris snapshot when it
+        covers the instant, and computed with ephem otherwise.
+        
+        Args:
+            date (float): Instant as an ephem date (UTC)
+        
+        Returns:
+            Dict keyed by body name with longitude, gate and line
+        """
+        snapshot = get_ephemeris_snapshot()
+        if snapshot is not None and snapshot.covers(date):
+            longitudes = {name: position["longitude"] for name, position in snapshot.positions(date).items()}
+        else:
+            longitudes = {
+                name: _apparent_longitude(body_class(), date)
+                for name, body_class in ACTIVATION_BODIES if body_class is not None
+            }
+            longitudes["North Node"] = _mean_node_longitude(date)
+        longitudes["Earth"] = (longitudes["Sun"] + 180.0) % 360.0
+        longitudes["South Node"] = (longitudes["North Node"] + 180.0) % 360.0
+        
+        activations = {}
+        for name, _ in ACTIVATION_BODIES:
+            longitude = longitudes[name]
+            gate, line = HumanDesignCalculator.get_gate_and_line(longitude)
+            activations[name] = {
+                "longitude": round(longitude, 4),
+                "gate": gate,
+                "line": line
+            }
+        
+        return activations
+    
+    @staticmethod
+    def analyze_definition(gates: set) -> Dict[str, Any]:
+        """
+        Derive channels, defined centers, type and authority from active gates.
+        
+        Args:
+            gates (set): All activated gates (personality and design)
+        
+        Returns:
+            Dict with channels, defined centers, type and authority
+        """
+        channels = [channel for channel in CHANNELS if channel[0] in gates and channel[1] in gates]
+        
+        links: Dict[str, set] = {}
+        for gate_a, gate_b in channels:
+            center_a, center_b = GATE_CENTERS[gate_a], GATE_CENTERS[gate_b]
+            links.setdefault(center_a, set()).add(center_b)
+            links.setdefault(center_b, set()).add(center_a)
+        defined_centers = set(links)
+        
+        # Walk the defined channels outward from the Throat
+        connected_to_throat = set()
+        pending = ["Throat"] if "Throat" in defined_centers else []
+        while pending:
+            center = pending.pop()
+            if center not in connected_to_throat:
+                connected_to_throat.add(center)
+                pending.extend(links[center] - connected_to_throat)
+        motor_to_throat = bool(connected_to_throat & MOTOR_CENTERS)
+        
+        if not defined_centers:
+            design_type = "Reflector"
+        elif "Sacral" in defined_centers:
+            design_type = "Manifesting Generator" if motor_to_throat else "Generator"
+        elif motor_to_throat:
+            design_type = "Manifestor"
+        else:
+            design_type = "Projector"
+        
+        if design_type == "Reflector":
+            authority = "Lunar"
+        elif "Solar Plexus" in defined_centers:
+            authority = "Emotional"
+        elif "Sacral" in defined_centers:
+            authority = "Sacral"
+        elif "Spleen" in defined_centers:
+            authority = "Splenic"
+        elif "Heart" in defined_centers:
+            authority = "Ego"
+        elif "G" in defined_centers:
+            authority = "Self-Projected"
+        else:
+            authority = "Mental"
+        
+        return {
+            "type": design_type,
+            "authority": authority,
+            "channels": [f"{gate_a}-{gate_b}" for gate_a, gate_b in channels],
+            "defined_centers": [center for center in CENTER_GATES if center in defined_centers]
         }
-    }
     
     @staticmethod
+    def normalize_birth_time(birth_time: Optional[str]) -> str:
+        """
+        Birth time in the HH:MM AM/PM form the calculator reads.
+        
+        Args:
+            birth_time (str, optional): Birth time, 12- or 24-hour
+        
+        Returns:
+            str: e.g. "02:30 PM"; noon without a time, and unparseable
+                times unchanged so the calculation reports them
+        """
+        if not birth_time:
+            return DEFAULT_BIRTH_TIME
+        for time_format in BIRTH_TIME_FORMATS:
+            try:
+                return datetime.datetime.strptime(birth_time.strip().upper(), time_format).strftime("%I:%M %p")
+            except ValueError:
+                continue
+        return birth_time
+    
+    @staticmethod
+    @traced("human_design.calculate")
     def calculate_human_design(
         birth_date: str, 
         birth_time: Optional[str] = None, 
@@ -56,54 +285,60 @@ class HumanDesignCalculator:
         
         Args:
             birth_date (str): Birth date in YYYY-MM-DD format
-            birth_time (str, optional): Birth time in HH:MM AM/PM format
+            birth_time (str, optional): Birth time, HH:MM AM/PM or 24-hour HH:MM
             birth_location (str, optional): Birth location
         
         Returns:
             Dict with comprehensive Human Design insights
         """
         try:
-            # Parse birth date
-            date = datetime.datetime.strptime(birth_date, "%Y-%m-%d")
-            
             # Use default time if not provided
-            if not birth_time:
-                birth_time = "12:00 PM"
+            birth_time = HumanDesignCalculator.normalize_birth_time(birth_time)
             
-            # Astronomical calculations for type determination
-            observer = ephem.Observer()
-            observer.date = datetime.datetime.strptime(
+            birth_datetime = datetime.datetime.strptime(
                 f"{birth_date} {birth_time}", 
                 "%Y-%m-%d %I:%M %p"
             )
             
-            # Placeholder type determination logic
-            # In a real implementation, this would use complex planetary calculations
-            type_determination_factors = {
-                "Manifestor": date.month % 4 == 0,
-                "Generator": date.day % 2 == 0,
-                "Manifesting Generator": date.year % 2 == 0,
-                "Projector": date.month % 3 == 0,
-                "Reflector": date.day % 7 == 0
-            }
+            # Birth times are local to the birth location
+            location = resolve_location(birth_location)
+            birth_utc = local_to_utc(birth_datetime, location.timezone)
             
-            # Determine type
-            design_type = next(
-                (type_name for type_name, condition in type_determination_factors.items() if condition), 
-                "Generator"  # Default type
-            )
+            # Personality is the birth instant, Design is 88° of solar arc earlier
+            personality_date = float(ephem.Date(birth_utc.utc))
+            design_date = HumanDesignCalculator.find_design_date(personality_date)
             
-            # Retrieve type details
-            type_details = HumanDesignCalculator.DESIGN_TYPES.get(design_type, {})
+            personality = HumanDesignCalculator.calculate_activations(personality_date)
+            design = HumanDesignCalculator.calculate_activations(design_date)
+            
+            gates = {activation["gate"] for activation in personality.values()}
+            gates.update(activation["gate"] for activation in design.values())
+            definition = HumanDesignCalculator.analyze_definition(gates)
+            
+            design_type = definition["type"]
+            type_details = get_catalog().design_type(design_type)["chart"]
             
             return {
                 "type": design_type,
-                "strategy": type_details.get("strategy", "Adaptive approach"),
-                "authority": type_details.get("authority", "Intuitive"),
-                "signature": type_details.get("signature", "Personal Alignment"),
-                "not_self_theme": type_details.get("not_self_theme", "Self-Discovery"),
-                "description": type_details.get("description", "Unique life path with individual characteristics"),
-                "calculation_method": "Astronomical and Astrological Factors"
+                "strategy": type_details["strategy"],
+                "authority": definition["authority"],
+                "profile": f"{personality['Sun']['line']}/{design['Sun']['line']}",
+                "signature": type_details["signature"],
+                "not_self_theme": type_details["not_self_theme"],
+                "description": type_details["description"],
+                "defined_centers": definition["defined_centers"],
+                "channels": definition["channels"],
+                "personality": personality,
+                "design": design,
+                "birth_time_utc": birth_utc.utc.isoformat(timespec="seconds"),
+                "birth_time_status": birth_utc.status,
+                "design_date": ephem.Date(design_date).datetime().isoformat(timespec="seconds"),
+                "location": {
+                    "name": location.name,
+                    "timezone": location.timezone,
+                    "resolved": location.resolved
+                },
+                "calculation_method": "Planetary Activations (Rave Mandala)"
             }
         
         except Exception as e:
@@ -123,25 +358,7 @@ class HumanDesignCalculator:
         Returns:
             Dict with compatibility and interaction insights
         """
-        compatibility = {
-            "Manifestor": {
-                "best_matches": ["Projector", "Generator"],
-                "challenges": ["Reflector"],
-                "interaction_advice": "Communicate intentions clearly, respect independence"
-            },
-            "Generator": {
-                "best_matches": ["Manifestor", "Projector"],
-                "challenges": ["Reflector"],
-                "interaction_advice": "Respond authentically, avoid forcing decisions"
-            },
-            # Add more detailed compatibility insights
-        }
-        
-        return compatibility.get(design_type, {
-            "best_matches": ["All types with mutual understanding"],
-            "challenges": ["Misaligned expectations"],
-            "interaction_advice": "Practice open communication and mutual respect"
-        })
+        return get_catalog().design_type(design_type)["compatibility"]
 
 def calculate_human_design(
     birth_date: str, 
@@ -175,30 +392,4 @@ def get_human_design_type_details(design_type):
     Returns:
         dict: Detailed description of the type
     """
-    type_details = {
-        "Manifestor": {
-            "description": "Initiators who can start things independently",
-            "strategy": "Inform before acting",
-            "signature": "Peace",
-            "not_self_theme": "Anger"
-        },
-        "Generator": {
-            "description": "Life-force energy workers who respond to opportunities",
-            "strategy": "Wait to Respond",
-            "signature": "Satisfaction",
-            "not_self_theme": "Frustration"
-        },
-        "Projector": {
-            "description": "Guides and managers who direct energy of others",
-            "strategy": "Wait for Invitation",
-            "signature": "Success",
-            "not_self_theme": "Bitterness"
-        },
-        "Reflector": {
-            "description": "Rare type that samples and reflects community energy",
-            "strategy": "Wait a lunar cycle before making decisions",
-            "signature": "Surprise",
-            "not_self_theme": "Disappointment"
-        }
-    }
-    return type_details.get(design_type, {})
+    return get_catalog().design_type(design_type)["details"]
@@ -0,0 +1,217 @@
+import re
+import unicodedata
+from typing import NamedTuple, Optional
+
+
+class Location(NamedTuple):
+    name: str
+    latitude: float
+    longitude: float
+    timezone: str
+    resolved: bool = True
+
+
+# Built-in gazetteer: normalized city name ->
+# (latitude, longitude, IANA time zone, ISO country code, region or None)
+KNOWN_LOCATIONS = {
+    "new york": (40.7128, -74.0060, "America/New_York", "US", "new york"),
+    "los angeles": (34.0522, -118.2437, "America/Los_Angeles", "US", "california"),
+    "chicago": (41.8781, -87.6298, "America/Chicago", "US", "illinois"),
+    "houston": (29.7604, -95.3698, "America/Chicago", "US", "texas"),
+    "phoenix": (33.4484, -112.0740, "America/Phoenix", "US", "arizona"),
+    "denver": (39.7392, -104.9903, "America/Denver", "US", "colorado"),
+    "seattle": (47.6062, -122.3321, "America/Los_Angeles", "US", "washington"),
+    "san francisco": (37.7749, -122.4194, "America/Los_Angeles", "US", "california"),
+    "miami": (25.7617, -80.1918, "America/New_York", "US", "florida"),
+    "boston": (42.3601, -71.0589, "America/New_York", "US", "massachusetts"),
+    "anchorage": (61.2181, -149.9003, "America/Anchorage", "US", "alaska"),
+    "honolulu": (21.3069, -157.8583, "Pacific/Honolulu", "US", "hawaii"),
+    "toronto": (43.6532, -79.3832, "America/Toronto", "CA", "ontario"),
+    "vancouver": (49.2827, -123.1207, "America/Vancouver", "CA", "british columbia"),
+    "mexico city": (19.4326, -99.1332, "America/Mexico_City", "MX", None),
+    "sao paulo": (-23.5505, -46.6333, "America/Sao_Paulo", "BR", "sao paulo"),
+    "rio de janeiro": (-22.9068, -43.1729, "America/Sao_Paulo", "BR", "rio de janeiro"),
+    "buenos aires": (-34.6037, -58.3816, "America/Argentina/Buenos_Aires", "AR", None),
+    "lima": (-12.0464, -77.0428, "America/Lima", "PE", None),
+    "bogota": (4.7110, -74.0721, "America/Bogota", "CO", None),
+    "london": (51.5074, -0.1278, "Europe/London", "GB", "england"),
+    "dublin": (53.3498, -6.2603, "Europe/Dublin", "IE", None),
+    "paris": (48.8566, 2.3522, "Europe/Paris", "FR", "ile de france"),
+    "berlin": (52.5200, 13.4050, "Europe/Berlin", "DE", None),
+    "madrid": (40.4168, -3.7038, "Europe/Madrid", "ES", None),
+    "rome": (41.9028, 12.4964, "Europe/Rome", "IT", "lazio"),
+    "amsterdam": (52.3676, 4.9041, "Europe/Amsterdam", "NL", None),
+    "stockholm": (59.3293, 18.0686, "Europe/Stockholm", "SE", None),
+    "athens": (37.9838, 23.7275, "Europe/Athens", "GR", None),
+    "moscow": (55.7558, 37.6173, "Europe/Moscow", "RU", None),
+    "istanbul": (41.0082, 28.9784, "Europe/Istanbul", "TR", None),
+    "cairo": (30.0444, 31.2357, "Africa/Cairo", "EG", None),
+    "lagos": (6.5244, 3.3792, "Africa/Lagos", "NG", None),
+    "nairobi": (-1.2921, 36.8219, "Africa/Nairobi", "KE", None),
+    "johannesburg": (-26.2041, 28.0473, "Africa/Johannesburg", "ZA", "gauteng"),
+    "dubai": (25.2048, 55.2708, "Asia/Dubai", "AE", None),
+    "tehran": (35.6892, 51.3890, "Asia/Tehran", "IR", None),
+    "karachi": (24.8607, 67.0011, "Asia/Karachi", "PK", "sindh"),
+    "mumbai": (19.0760, 72.8777, "Asia/Kolkata", "IN", "maharashtra"),
+    "delhi": (28.7041, 77.1025, "Asia/Kolkata", "IN", None),
+    "kolkata": (22.5726, 88.3639, "Asia/Kolkata", "IN", "west bengal"),
+    "dhaka": (23.8103, 90.4125, "Asia/Dhaka", "BD", None),
+    "bangkok": (13.7563, 100.5018, "Asia/Bangkok", "TH", None),
+    "singapore": (1.3521, 103.8198, "Asia/Singapore", "SG", None),
+    "jakarta": (-6.2088, 106.8456, "Asia/Jakarta", "ID", None),
+    "manila": (14.5995, 120.9842, "Asia/Manila", "PH", None),
+    "hong kong": (22.3193, 114.1694, "Asia/Hong_Kong", "HK", None),
+    "shanghai": (31.2304, 121.4737, "Asia/Shanghai", "CN", None),
+    "beijing": (39.9042, 116.4074, "Asia/Shanghai", "CN", None),
+    "seoul": (37.5665, 126.9780, "Asia/Seoul", "KR", None),
+    "tokyo": (35.6762, 139.6503, "Asia/Tokyo", "JP", None),
+    "sydney": (-33.8688, 151.2093, "Australia/Sydney", "AU", "new south wales"),
+    "melbourne": (-37.8136, 144.9631, "Australia/Melbourne", "AU", "victoria"),
+    "perth": (-31.9505, 115.8605, "Australia/Perth", "AU", "western australia"),
+    "auckland": (-36.8485, 174.7633, "Pacific/Auckland", "NZ", None)
+}
+
+LOCATION_ALIASES = {
+    "nyc": "new york",
+    "new york city": "new york",
+    "la": "los angeles",
+    "sf": "san francisco",
+    "new delhi": "delhi",
+    "bombay": "mumbai",
+    "calcutta": "kolkata",
+    "peking": "beijing"
+}
+
+# Country names a location may be qualified with, besides the ISO code
+COUNTRY_NAMES = {
+    "US": ("usa", "united states", "united states of america", "america"),
+    "CA": ("canada",),
+    "MX": ("mexico",),
+    "BR": ("brazil", "brasil"),
+    "AR": ("argentina",),
+    "PE": ("peru",),
+    "CO": ("colombia",),
+    "GB": ("uk", "united kingdom", "great britain", "britain"),
+    "IE": ("ireland",),
+    "FR": ("france",),
+    "DE": ("germany", "deutschland"),
+    "ES": ("spain", "espana"),
+    "IT": ("italy", "italia"),
+    "NL": ("netherlands", "the netherlands", "holland"),
+    "SE": ("sweden",),
+    "GR": ("greece",),
+    "RU": ("russia", "russian federation"),
+    "TR": ("turkey", "turkiye"),
+    "EG": ("egypt",),
+    "NG": ("nigeria",),
+    "KE": ("kenya",),
+    "ZA": ("south africa",),
+    "AE": ("uae", "united arab emirates"),
+    "IR": ("iran",),
+    "PK": ("pakistan",),
+    "IN": ("india",),
+    "BD": ("bangladesh",),
+    "TH": ("thailand",),
+    "SG": ("singapore",),
+    "ID": ("indonesia",),
+    "PH": ("philippines",),
+    "HK": ("china",),
+    "CN": ("china", "prc"),
+    "KR": ("korea", "south korea"),
+    "JP": ("japan",),
+    "AU": ("australia",),
+    "NZ": ("new zealand",)
+}
+
+# Common abbreviations of the regions in the gazetteer
+REGION_ABBREVIATIONS = {
+    "new york": ("ny",),
+    "california": ("ca", "calif"),
+    "illinois": ("il",),
+    "texas": ("tx",),
+    "arizona": ("az",),
+    "colorado": ("co",),
+    "washington": ("wa",),
+    "florida": ("fl",),
+    "massachusetts": ("ma",),
+    "alaska": ("ak",),
+    "hawaii": ("hi",),
+    "ontario": ("on",),
+    "british columbia": ("bc",),
+    "sao paulo": ("sp",),
+    "rio de janeiro": ("rj",),
+    "new south wales": ("nsw",),
+    "victoria": ("vic",),
+    "western australia": ("wa",)
+}
+
+# Placeholder used when a location cannot be resolved
+DEFAULT_LOCATION = Location("New York", 40.7128, -74.0060, "America/New_York", resolved=False)
+
+COORDINATE_PATTERN = re.compile(r'^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$')
+
+
+def _normalize_part(part: str) -> str:
+    ascii_part = unicodedata.normalize('NFKD', part).encode('ascii', 'ignore').decode('ascii')
+    # Drop dots first so abbreviations like "U.S.A." read as "usa"
+    return ' '.join(re.sub(r'[^a-z ]', ' ', ascii_part.lower().replace('.', '')).split())
+
+
+def normalize_location_name(location: str) -> str:
+    """
+    Normalize a free-form location for gazetteer lookup.
+
+    Args:
+        location (str): Location as entered, e.g. "São Paulo, Brazil"
+
+    Returns:
+        str: Lowercase ASCII city name, e.g. "sao paulo"
+    """
+    return _normalize_part(location.split(',')[0])
+
+
+def _qualifiers_match(location: str, country: str, region: Optional[str]) -> bool:
+    accepted = {country.lower(), *COUNTRY_NAMES[country]}
+    if region:
+        accepted.update((region, *REGION_ABBREVIATIONS.get(region, ())))
+    qualifiers = (_normalize_part(part) for part in location.split(',')[1:])
+    return all(qualifier in accepted for qualifier in qualifiers if qualifier)
+
+
+def resolve_location(birth_location: Optional[str]) -> Location:
+    """
+    Resolve a birth location to coordinates and a time zone.
+
+    Accepts known city names, optionally followed by their region and/or
+    country ("Paris, France"), or "latitude, longitude" pairs. A qualifier
+    that does not fit the city ("Paris, Texas") leaves the location
+    unresolved rather than placing it in the wrong country. Coordinates
+    without a known city use the nominal ``Etc/GMT`` zone for their
+    longitude, which ignores daylight saving time.
+
+    Args:
+        birth_location (str, optional): Birth location
+
+    Returns:
+        Location: Resolved location, or ``DEFAULT_LOCATION`` with
+            ``resolved=False`` when the location is not recognised
+    """
+    if not birth_location:
+        return DEFAULT_LOCATION
+
+    coordinates = COORDINATE_PATTERN.match(birth_location)
+    if coordinates:
+        latitude, longitude = float(coordinates.group(1)), float(coordinates.group(2))
+        if -90 <= latitude <= 90 and -180 <= longitude <= 180:
+            hours = int(round(-longitude / 15.0))
+            timezone = "Etc/GMT" if hours == 0 else f"Etc/GMT{hours:+d}"
+            return Location(birth_location.strip(), latitude, longitude, timezone)
+
+    name = normalize_location_name(birth_location)
+    name = LOCATION_ALIASES.get(name, name)
+    if name in KNOWN_LOCATIONS:
+        latitude, longitude, timezone, country, region = KNOWN_LOCATIONS[name]
+        if _qualifiers_match(birth_location, country, region):
+            return Location(name.title(), latitude, longitude, timezone)
+
+    return DEFAULT_LOCATION
@@ -0,0 +1,233 @@
+import os
+import logging
+import datetime
+import numpy as np
+from functools import lru_cache
+from typing import Dict, Any, Optional
+import ephem
+from backend.config.settings import Config
+from backend.utils.binary_table import read_table, write_table
+from backend.utils.tracing import traced
+from .human_design import _apparent_longitude
+from .content import get_catalog
+
+logger = logging.getLogger(__name__)
+
+# Days covered by the daily table; lunations extend a little past both ends
+TABLE_FIRST_DAY = datetime.date(1900, 1, 1)
+TABLE_LAST_DAY = datetime.date(2100, 12, 31)
+LUNATION_MARGIN_DAYS = 70
+
+TABLE_MAGIC = b'PLLUNAR2'
+
+ZODIAC_SIGNS = (
+    "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
+    "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"
+)
+MOON_PHASES = (
+    "New Moon", "Waxing Crescent", "First Quarter", "Waxing Gibbous",
+    "Full Moon", "Waning Gibbous", "Last Quarter", "Waning Crescent"
+)
+
+UNIX_EPOCH = datetime.datetime(1970, 1, 1)
+SECONDS_PER_DAY = 86400
+
+
+def _unix_seconds(date: float) -> int:
+    return round((ephem.Date(date).datetime() - UNIX_EPOCH).total_seconds())
+
+
+def _isoformat(seconds: int) -> str:
+    return (UNIX_EPOCH + datetime.timedelta(seconds=int(seconds))).isoformat(timespec='minutes') + 'Z'
+
+
+class LunarTable:
+    """
+    Precomputed lunations and daily Moon positions for 1900-2100.
+
+    New and full moon instants are stored as Unix seconds; every day has
+    the Moon's tropical sign and illuminated percentage at 12:00 UTC. On
+    disk the table is a flat binary table of the four arrays, which
+    ``load`` memory-maps so lookups are binary searches and index reads
+    over pages shared by every worker.
+    """
+
+    def __init__(
+        self,
+        first_day: int,
+        new_moons: np.ndarray,
+        full_moons: np.ndarray,
+        signs: np.ndarray,
+        illumination: np.ndarray
+    ):
+        self.first_day = first_day
+        self.new_moons = new_moons
+        self.full_moons = full_moons
+        self.signs = signs
+        self.illumination = illumination
+
+    @classmethod
+    def build(cls, first_day: datetime.date = TABLE_FIRST_DAY, last_day: datetime.date = TABLE_LAST_DAY) -> 'LunarTable':
+        """
+        Compute the table with ephem. Takes a few seconds for 1900-2100.
+
+        Args:
+            first_day (date): First day of the daily table
+            last_day (date): Last day of the daily table
+
+        Returns:
+            LunarTable
+        """
+        margin = datetime.timedelta(days=LUNATION_MARGIN_DAYS)
+        start, end = ephem.Date(first_day - margin), ephem.Date(last_day + margin)
+
+        lunations = {}
+        for name, next_event in (("new", ephem.next_new_moon), ("full", ephem.next_full_moon)):
+            instants, date = [], start
+            while True:
+                date = next_event(date)
+                if date > end:
+                    break
+                instants.append(_unix_seconds(date))
+            lunations[name] = np.array(instants, dtype=np.int64)
+
+        days = (last_day - first_day).days + 1
+        signs = np.empty(days, dtype=np.uint8)
+        illumination = np.empty(days, dtype=np.uint8)
+        moon = ephem.Moon()
+        noon = float(ephem.Date(datetime.datetime.combine(first_day, datetime.time(12))))
+        for index in range(days):
+            longitude = _apparent_longitude(moon, noon + index)
+            signs[index] = int(longitude // 30) % 12
+            illumination[index] = round(moon.moon_phase * 100)
+
+        first = (first_day - UNIX_EPOCH.date()).days
+        return cls(first, lunations["new"], lunations["full"], signs, illumination)
+
+    def save(self, path: str):
+        """
+        Write the table as a flat binary file, atomically.
+
+        Args:
+            path (str): Destination path
+        """
+        write_table(path, TABLE_MAGIC, {
+            "new_moons": self.new_moons,
+            "full_moons": self.full_moons,
+            "signs": self.signs,
+            "illumination": self.illumination
+        }, {"first_day": self.first_day})
+
+    @classmethod
+    def load(cls, path: str) -> 'LunarTable':
+        """
+        Memory-map a table written by ``save``.
+
+        Args:
+            path (str): Path of the table file
+
+        Returns:
+            LunarTable
+
+        Raises:
+            ValueError: If the file is not a lunar table
+        """
+        columns, attrs = read_table(path, TABLE_MAGIC)
+        return cls(attrs["first_day"], columns["new_moons"], columns["full_moons"], columns["signs"], columns["illumination"])
+
+    def _cycle(self, index: int) -> Dict[str, Any]:
+        start, end = int(self.new_moons[index]), int(self.new_moons[index + 1])
+        full_moon = int(self.full_moons[np.searchsorted(self.full_moons, start)])
+        return {
+            "new_moon": _isoformat(start),
+            "full_moon": _isoformat(full_moon),
+            "next_new_moon": _isoformat(end),
+            "length_days": round((end - start) / SECONDS_PER_DAY, 2)
+        }
+
+    def cycles_at(self, instant: datetime.datetime) -> Dict[str, Any]:
+        """
+        The Moon's state and the current and next lunar cycles at an instant.
+
+        Args:
+            instant (datetime): Naive UTC instant
+
+        Returns:
+            Dict with the Moon's sign, phase and illumination, and the
+                current and next new-moon-to-new-moon cycles
+
+        Raises:
+            ValueError: If the instant is outside the table
+        """
+        seconds = int((instant - UNIX_EPOCH).total_seconds())
+        day = seconds // SECONDS_PER_DAY - self.first_day
+        index = int(np.searchsorted(self.new_moons, seconds, side='right')) - 1
+        if not 0 <= day < len(self.signs) or index < 0 or index + 2 >= len(self.new_moons):
+            first = UNIX_EPOCH.date() + datetime.timedelta(days=self.first_day)
+            last = first + datetime.timedelta(days=len(self.signs) - 1)
+            raise ValueError(f"Lunar cycles are available for {first} to {last}")
+
+        # Phase angle, piecewise linear between new, full and next new moon
+        start, end = int(self.new_moons[index]), int(self.new_moons[index + 1])
+        full_moon = int(self.full_moons[np.searchsorted(self.full_moons, start)])
+        if seconds < full_moon:
+            fraction = 0.5 * (seconds - start) / (full_moon - start)
+        else:
+            fraction = 0.5 + 0.5 * (seconds - full_moon) / (end - full_moon)
+
+        return {
+            "instant": instant.isoformat(timespec='minutes') + 'Z',
+            "moon": {
+                "sign": ZODIAC_SIGNS[self.signs[day]],
+                "phase": MOON_PHASES[int(fraction * 8 + 0.5) % 8],
+                "illumination": int(self.illumination[day]),
+                "cycle_day": (seconds - start) // SECONDS_PER_DAY + 1
+            },
+            "current_cycle": self._cycle(index),
+            "next_cycle": self._cycle(index + 1)
+        }
+
+
+@lru_cache(maxsize=None)
+def get_lunar_table() -> LunarTable:
+    """
+    The lunar table, memory-mapped once per process.
+
+    Returns:
+        LunarTable: Table from ``Config.LUNAR_TABLE_PATH``
+
+    Raises:
+        FileNotFoundError: If the table has not been built; building it
+            takes ephem minutes, which no request should pay
+    """
+    path = Config.LUNAR_TABLE_PATH
+    if not os.path.exists(path):
+        logger.error(f"Lunar table {path} not found; run tools/lunar_table.py at build time")
+        raise FileNotFoundError(f"Lunar table {path} has not been built")
+    return LunarTable.load(path)
+
+
+@traced("lunar.cycles")
+def calculate_lunar_cycles(date: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Current and next lunar cycle windows, for the Reflector's lunar strategy.
+
+    Args:
+        date (str, optional): Day in YYYY-MM-DD format, read at 12:00 UTC;
+            defaults to now
+
+    Returns:
+        Dict with the Moon's state, the current and next cycles and the
+            Reflector strategy
+
+    Raises:
+        ValueError: If the date is outside the table
+        FileNotFoundError: If the lunar table has not been built
+    """
+    if date is None:
+        instant = datetime.datetime.utcnow().replace(second=0, microsecond=0)
+    else:
+        instant = datetime.datetime.strptime(date, '%Y-%m-%d').replace(hour=12)
+    cycles = get_lunar_table().cycles_at(instant)
+    cycles["strategy"] = get_catalog().design_type("Reflector")["chart"]["strategy"]
+    return cycles
@@ -0,0 +1,258 @@
+import os
+import logging
+import numpy as np
+from functools import lru_cache
+from typing import Dict, Any, Iterable, List, Optional, Sequence
+from backend.config.settings import Config
+from backend.utils.tracing import traced
+from .compatibility import (
+    BUCKET_COUNT,
+    HUMAN_DESIGN_CODES,
+    HUMAN_DESIGN_TYPES,
+    LIFE_PATH_CODES,
+    LIFE_PATH_NUMBERS,
+    bucket_code,
+    get_bucket_scores
+)
+
+logger = logging.getLogger(__name__)
+
+MAX_PAGE_SIZE = 100
+
+# Bucket code -> (life path number, Human Design type)
+BUCKET_LABELS = [
+    (life_path_number, design_type)
+    for life_path_number in LIFE_PATH_NUMBERS
+    for design_type in HUMAN_DESIGN_TYPES
+]
+
+
+class ProfilePool:
+    """
+    Stored profiles grouped into compatibility buckets for top-k matching.
+
+    Every profile in a bucket shares the same (life path, type) code and so
+    the same score against any query, so ranking only orders the 60
+    buckets and then reads profiles off contiguous slices. Profiles are
+    kept sorted by (bucket, profile id); ties are broken by bucket code and
+    then profile id, which keeps pages stable.
+    """
+
+    def __init__(self, profile_ids: Sequence, buckets: Sequence[int]):
+        profile_ids = np.asarray(profile_ids)
+        buckets = np.asarray(buckets, dtype=np.int16)
+        if profile_ids.shape != buckets.shape or profile_ids.ndim != 1:
+            raise ValueError("profile_ids and buckets must be 1-D arrays of the same length")
+        if len(buckets) and (buckets.min() < 0 or buckets.max() >= BUCKET_COUNT):
+            raise ValueError(f"Bucket codes must be in [0, {BUCKET_COUNT})")
+
+        order = np.lexsort((profile_ids, buckets))
+        self.profile_ids = profile_ids[order]
+        self.buckets = buckets[order]
+        self.offsets = np.searchsorted(self.buckets, np.arange(BUCKET_COUNT + 1))
+        self.sizes = np.diff(self.offsets)
+        # Global id index for looking up a stored profile's bucket
+        self._id_order = np.argsort(self.profile_ids, kind='stable')
+
+    def __len__(self) -> int:
+        return len(self.profile_ids)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> 'ProfilePool':
+        """
+        Build a pool from profile dicts.
+
+        Args:
+            records (Iterable[Dict]): Profiles with profile_id,
+                life_path_number and human_design_type
+
+        Returns:
+            ProfilePool
+        """
+        profile_ids, buckets = [], []
+        for record in records:
+            profile_ids.append(record['profile_id'])
+            buckets.append(bucket_code(record['life_path_number'], record['human_design_type']))
+        return cls(profile_ids, buckets)
+
+    @classmethod
+    def load(cls, path: str) -> 'ProfilePool':
+        """
+        Load a pool saved with ``save``.
+
+        Args:
+            path (str): Path of the ``.npz`` file
+
+        Returns:
+            ProfilePool
+        """
+        with np.load(path, allow_pickle=False) as stored:
+            return cls(stored['profile_ids'], stored['buckets'])
+
+    def save(self, path: str):
+        """
+        Save the pool as an uncompressed ``.npz`` file.
+
+        Args:
+            path (str): Destination path
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        np.savez(path, profile_ids=self.profile_ids, buckets=self.buckets)
+
+    def bucket_of(self, profile_id: Any) -> Optional[int]:
+        """
+        Bucket code of a stored profile.
+
+        Args:
+            profile_id: Profile id
+
+        Returns:
+            int, or None if the profile is not in the pool
+        """
+        if not len(self):
+            return None
+        try:
+            position = np.searchsorted(self.profile_ids, profile_id, sorter=self._id_order)
+        except (TypeError, ValueError):
+            return None
+        if position < len(self) and self.profile_ids[self._id_order[position]] == profile_id:
+            return int(self.buckets[self._id_order[position]])
+        return None
+
+    def top_k(
+        self,
+        life_path_number: int,
+        design_type: str,
+        limit: int = 20,
+        offset: int = 0,
+        life_path_numbers: Optional[List[int]] = None,
+        design_types: Optional[List[str]] = None,
+        min_score: Optional[float] = None,
+        exclude_ids: Sequence = ()
+    ) -> Dict[str, Any]:
+        """
+        Rank stored profiles by compatibility with a query profile.
+
+        Args:
+            life_path_number (int): Query life path number
+            design_type (str): Query Human Design type
+            limit (int): Page size
+            offset (int): Number of ranked matches to skip
+            life_path_numbers (List[int], optional): Only match these life paths
+            design_types (List[str], optional): Only match these types
+            min_score (float, optional): Minimum compatibility score
+            exclude_ids (Sequence): Profile ids never returned, e.g. the
+                requester's own profile
+
+        Returns:
+            Dict with total, offset, limit, next_offset and matches
+
+        Raises:
+            ValueError: If a life path number or type is unknown
+        """
+        try:
+            query = bucket_code(life_path_number, design_type)
+            life_path_mask = np.ones(len(LIFE_PATH_NUMBERS), dtype=bool)
+            if life_path_numbers is not None:
+                life_path_mask[:] = False
+                life_path_mask[[LIFE_PATH_CODES[number] for number in life_path_numbers]] = True
+            type_mask = np.ones(len(HUMAN_DESIGN_TYPES), dtype=bool)
+            if design_types is not None:
+                type_mask[:] = False
+                type_mask[[HUMAN_DESIGN_CODES[name] for name in design_types]] = True
+        except KeyError as e:
+            raise ValueError(f"Unknown life path number or Human Design type: {e.args[0]}")
+
+        scores = get_bucket_scores()[query]
+        sizes = self.sizes.copy()
+
+        excluded = {}
+        for profile_id in set(exclude_ids):
+            bucket = self.bucket_of(profile_id)
+            if bucket is not None:
+                excluded.setdefault(bucket, set()).add(profile_id)
+                sizes[bucket] -= 1
+
+        eligible = (sizes > 0) & np.outer(life_path_mask, type_mask).ravel()
+        if min_score is not None:
+            eligible &= scores >= min_score
+
+        candidates = np.flatnonzero(eligible)
+        ranked = candidates[np.lexsort((candidates, -scores[candidates]))]
+        ends = np.cumsum(sizes[ranked])
+        total = int(ends[-1]) if len(ends) else 0
+
+        matches = []
+        position = int(np.searchsorted(ends, offset, side='right'))
+        skip = offset - (int(ends[position - 1]) if position else 0)
+        while len(matches) < limit and position < len(ranked):
+            bucket = int(ranked[position])
+            profile_ids = self.profile_ids[self.offsets[bucket]:self.offsets[bucket + 1]]
+            if bucket in excluded:
+                profile_ids = profile_ids[~np.isin(profile_ids, list(excluded[bucket]))]
+            life_path, name = BUCKET_LABELS[bucket]
+            score = round(float(scores[bucket]), 4)
+            for profile_id in profile_ids[skip:skip + limit - len(matches)].tolist():
+                matches.append({
+                    "profile_id": profile_id,
+                    "life_path_number": life_path,
+                    "human_design_type": name,
+                    "score": score
+                })
+            skip = 0
+            position += 1
+
+        next_offset = offset + len(matches)
+        return {
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "next_offset": next_offset if next_offset < total else None,
+            "matches": matches
+        }
+
+
+@lru_cache(maxsize=None)
+def get_profile_pool() -> ProfilePool:
+    """
+    The stored profile pool, loaded once per process.
+
+    Returns:
+        ProfilePool: Pool from ``Config.PROFILE_POOL_PATH``, or an empty
+            pool if the file does not exist
+    """
+    path = Config.PROFILE_POOL_PATH
+    if not os.path.exists(path):
+        logger.warning(f"Profile pool {path} not found, matching against an empty pool")
+        return ProfilePool([], [])
+    pool = ProfilePool.load(path)
+    logger.info(f"Loaded {len(pool)} profiles from {path}")
+    return pool
+
+
+@traced("matching.find")
+def find_matches(
+    life_path_number: int,
+    design_type: str,
+    limit: int = 20,
+    offset: int = 0,
+    **filters
+) -> Dict[str, Any]:
+    """
+    Best matches for a profile from the stored profile pool.
+
+    Args:
+        life_path_number (int): Query life path number
+        design_type (str): Query Human Design type
+        limit (int): Page size
+        offset (int): Number of ranked matches to skip
+        **filters: Filters accepted by ``ProfilePool.top_k``
+
+    Returns:
+        Dict with the query and a page of ranked matches
+    """
+    result = get_profile_pool().top_k(life_path_number, design_type, limit, offset, **filters)
+    result["query"] = {"life_path_number": life_path_number, "human_design_type": design_type}
+    return result
@@ -0,0 +1,434 @@
+import os
+import re
+import json
+import hashlib
+import logging
+import tempfile
+import threading
+import requests
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Tuple
+from backend.config.settings import Config
+from backend.services.content import get_catalog
+from backend.utils.batching import MicroBatcher
+from backend.utils.resilience import OPEN, CircuitBreaker, hedged_call
+from backend.utils.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever a template changes so previously generated text is not reused
+TEMPLATE_VERSION = 1
+
+PROMPT_TEMPLATES = {
+    "human_design": {
+        "fields": ("type", "strategy", "authority", "profile", "defined_centers"),
+        "template": (
+            "Write a warm, encouraging two-paragraph interpretation of a Human Design chart. "
+            "Type: {type}. Strategy: {strategy}. Authority: {authority}. Profile: {profile}. "
+            "Defined centers: {defined_centers}."
+        )
+    },
+    "numerology": {
+        "fields": ("life_path_number", "description"),
+        "template": (
+            "Write a warm, encouraging two-paragraph interpretation for someone with "
+            "Life Path number {life_path_number}. Core theme: {description}"
+        )
+    }
+}
+
+NARRATIVE_ID_PATTERN = re.compile(r'^[a-z_]+-[0-9a-f]{32}-v\d+$')
+
+
+class InferenceClient:
+    """
+    Minimal client for the Hugging Face text generation inference API.
+
+    Calls go through a circuit breaker, so a failing or slow upstream is
+    left alone for a while instead of tying up narrative workers. With
+    hedging enabled, a call still running after the recent p95 latency is
+    sent a second time and the first answer wins; each attempt is recorded
+    by the breaker on its own, so its latencies are the upstream's.
+    """
+
+    def __init__(
+        self,
+        api_url: Optional[str] = None,
+        model: Optional[str] = None,
+        api_key: Optional[str] = None,
+        timeout: Optional[float] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        hedge: Optional[bool] = None
+    ):
+        self.api_url = (api_url or Config.HUGGING_FACE_API_URL).rstrip('/')
+        self.model = model or Config.HUGGING_FACE_MODEL
+        self.api_key = api_key if api_key is not None else Config.HUGGING_FACE_API_KEY
+        self.timeout = timeout or Config.HUGGING_FACE_TIMEOUT
+        self.session = requests.Session()
+        self.breaker = breaker or CircuitBreaker(
+            "inference",
+            window=Config.INFERENCE_BREAKER_WINDOW,
+            min_calls=Config.INFERENCE_BREAKER_MIN_CALLS,
+            failure_rate=Config.INFERENCE_BREAKER_FAILURE_RATE,
+            slow_call=Config.INFERENCE_BREAKER_SLOW_CALL,
+            slow_call_rate=Config.INFERENCE_BREAKER_SLOW_CALL_RATE,
+            open_seconds=Config.INFERENCE_BREAKER_OPEN_SECONDS
+        )
+        self.hedge = Config.INFERENCE_HEDGING_ENABLED if hedge is None else hedge
+        self.hedge_min_delay = Config.INFERENCE_HEDGE_MIN_DELAY_MS / 1000.0
+        self._hedge_lock = threading.Lock()
+        self._hedge_pool = None
+        self._hedge_pid = None
+        self._hedge_counters = {"hedged": 0, "hedge_wins": 0}
+
+    def available(self) -> bool:
+        """
+        Whether calls are currently let through.
+
+        Returns:
+            bool: False while the circuit is open
+        """
+        return self.breaker.state != OPEN
+
+    def _hedge_delay(self) -> Optional[float]:
+        if not self.hedge:
+            return None
+        p95 = self.breaker.latency_percentile(0.95)
+        return max(p95, self.hedge_min_delay) if p95 is not None else None
+
+    def _pool(self) -> ThreadPoolExecutor:
+        # Threads do not survive fork, so each worker process starts its own pool
+        with self._hedge_lock:
+            if self._hedge_pid != os.getpid():
+                self._hedge_pool = ThreadPoolExecutor(
+                    max_workers=2 * Config.NARRATIVE_MAX_IN_FLIGHT, thread_name_prefix="inference-hedge"
+                )
+                self._hedge_pid = os.getpid()
+            return self._hedge_pool
+
+    def generate(self, prompts: List[str]) -> List[str]:
+        """
+        Generate text for several prompts in a single inference call.
+
+        Args:
+            prompts (List[str]): Prompts to complete
+
+        Returns:
+            List[str]: Generated text, in prompt order
+
+        Raises:
+            CircuitOpenError: If the circuit breaker refuses the call
+            requests.RequestException: If the call fails
+        """
+        delay = self._hedge_delay()
+        if delay is None:
+            return self.breaker.call(self._post, prompts)
+
+        texts, attempts, winner = hedged_call(lambda: self.breaker.call(self._post, prompts), delay, self._pool())
+        with self._hedge_lock:
+            self._hedge_counters["hedged"] += attempts - 1
+            self._hedge_counters["hedge_wins"] += winner
+        return texts
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Circuit breaker state and hedging counters.
+
+        Returns:
+            Dict of breaker statistics plus hedging, hedged and hedge_wins
+        """
+        with self._hedge_lock:
+            counters = dict(self._hedge_counters)
+        return dict(self.breaker.stats(), hedging=self.hedge, **counters)
+
+    def _post(self, prompts: List[str]) -> List[str]:
+        headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+        response = self.session.post(
+            f"{self.api_url}/{self.model}",
+            headers=headers,
+            json={
+                "inputs": prompts,
+                "parameters": {"max_new_tokens": 250},
+                "options": {"wait_for_model": True}
+            },
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+
+        texts = []
+        for entry in response.json():
+            # Batched text2text responses may nest one list per input
+            if isinstance(entry, list):
+                entry = entry[0]
+            texts.append(entry["generated_text"].strip())
+        return texts
+
+
+class NarrativeCache:
+    """
+    On-disk cache of generated narratives, one JSON file per narrative.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or Config.NARRATIVE_CACHE_DIR
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            with open(self._path(key), encoding='utf-8') as cache_file:
+                return json.load(cache_file)["text"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, key: str, text: str):
+        # Write then rename so concurrent readers never see a partial file
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(handle, 'w', encoding='utf-8') as cache_file:
+            json.dump({"text": text, "template_version": TEMPLATE_VERSION}, cache_file)
+        os.replace(temp_path, self._path(key))
+
+
+class NarrativeService:
+    """
+    Generate interpretive text for computed charts.
+
+    Cached narratives are returned immediately. Anything else is queued for
+    batched generation and reported as pending until it lands in the cache.
+    While the inference API is unavailable (its circuit is open), or when
+    generation fails, the chart's static description from the content
+    catalog is returned instead, with status ``fallback``; it is not
+    cached, so a later request can still get a generated narrative. Only
+    the ``max_failed`` most recent failures are remembered for polling.
+    """
+
+    def __init__(
+        self,
+        client: Optional[InferenceClient] = None,
+        cache: Optional[NarrativeCache] = None,
+        window_ms: Optional[float] = None,
+        max_batch_size: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        max_failed: Optional[int] = None
+    ):
+        self.client = client or InferenceClient()
+        self.cache = cache or NarrativeCache()
+        self.batcher = MicroBatcher(
+            self._generate_batch,
+            window_ms=window_ms if window_ms is not None else Config.NARRATIVE_BATCH_WINDOW_MS,
+            max_batch_size=max_batch_size or Config.NARRATIVE_MAX_BATCH_SIZE,
+            max_in_flight=max_in_flight or Config.NARRATIVE_MAX_IN_FLIGHT,
+            name="narrative"
+        )
+        self.max_failed = max_failed or Config.NARRATIVE_MAX_FAILED
+        self._lock = threading.RLock()
+        self._pending = {}
+        self._fallbacks = {}  # fallback text of pending narratives
+        self._failed = OrderedDict()  # narrative id -> (error, fallback text), oldest first
+
+    @staticmethod
+    def build_prompt(kind: str, chart: Dict[str, Any]) -> Tuple[str, str]:
+        """
+        Build the cache key and prompt for a chart.
+
+        The key is derived only from the chart fields the template uses, so
+        charts that read the same produce the same narrative.
+
+        Args:
+            kind (str): Template name, e.g. ``human_design``
+            chart (Dict): Computed chart
+
+        Returns:
+            Tuple of (narrative id, prompt)
+
+        Raises:
+            ValueError: If the kind is unknown or the chart lacks a field
+        """
+        if kind not in PROMPT_TEMPLATES:
+            raise ValueError(f"Unknown narrative kind: {kind}")
+        spec = PROMPT_TEMPLATES[kind]
+
+        missing = [field for field in spec["fields"] if field not in chart]
+        if missing:
+            raise ValueError(f"Chart is missing fields for {kind} narrative: {', '.join(missing)}")
+
+        values = {field: chart[field] for field in spec["fields"]}
+        signature = hashlib.sha256(
+            json.dumps([kind, values], sort_keys=True, separators=(',', ':')).encode('utf-8')
+        ).hexdigest()[:32]
+
+        prompt_values = {
+            field: ', '.join(value) if isinstance(value, list) else value
+            for field, value in values.items()
+        }
+        return f"{kind}-{signature}-v{TEMPLATE_VERSION}", spec["template"].format(**prompt_values)
+
+    @staticmethod
+    def fallback_text(kind: str, chart: Dict[str, Any]) -> str:
+        """
+        Static interpretation of a chart from the content catalog.
+
+        Args:
+            kind (str): Template name
+            chart (Dict): Computed chart with the template's fields
+
+        Returns:
+            str
+        """
+        catalog = get_catalog()
+        if kind == "numerology":
+            return catalog.life_path(chart["life_path_number"])["description"]
+        details = catalog.design_type(chart["type"])["chart"]
+        return (
+            f"{details['description']} Strategy: {chart['strategy']}. "
+            f"Authority: {chart['authority']}. Signature: {details['signature']}."
+        )
+
+    def request(self, kind: str, chart: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Return a cached narrative, or queue its generation.
+
+        Args:
+            kind (str): Template name
+            chart (Dict): Computed chart
+
+        Returns:
+            Dict with ``status`` (``ready``, ``pending`` or ``fallback``)
+                and ``narrative_id``, plus ``text`` unless pending
+        """
+        narrative_id, prompt = self.build_prompt(kind, chart)
+
+        text = self.cache.get(narrative_id)
+        if text is not None:
+            return {"status": "ready", "narrative_id": narrative_id, "text": text}
+
+        if not self.client.available():
+            return {"status": "fallback", "narrative_id": narrative_id, "text": self.fallback_text(kind, chart)}
+
+        fallback = self.fallback_text(kind, chart)
+        with self._lock:
+            if narrative_id not in self._pending:
+                self._failed.pop(narrative_id, None)
+                self._fallbacks[narrative_id] = fallback
+                future = self.batcher.submit((narrative_id, prompt))
+                self._pending[narrative_id] = future
+                future.add_done_callback(lambda done: self._finish(narrative_id, done))
+
+        return {"status": "pending", "narrative_id": narrative_id}
+
+    def poll(self, narrative_id: str) -> Dict[str, Any]:
+        """
+        Report the state of a previously requested narrative.
+
+        Args:
+            narrative_id (str): Identifier returned by ``request``
+
+        Returns:
+            Dict with ``status`` of ``ready``, ``pending``, ``fallback``
+                (generation failed, static text instead) or ``unknown``
+        """
+        if not NARRATIVE_ID_PATTERN.match(narrative_id):
+            return {"status": "unknown", "narrative_id": narrative_id}
+
+        text = self.cache.get(narrative_id)
+        if text is not None:
+            return {"status": "ready", "narrative_id": narrative_id, "text": text}
+
+        with self._lock:
+            if narrative_id in self._pending:
+                return {"status": "pending", "narrative_id": narrative_id}
+            if narrative_id in self._failed:
+                error, fallback = self._failed[narrative_id]
+                return {"status": "fallback", "narrative_id": narrative_id, "text": fallback, "error": error}
+
+        return {"status": "unknown", "narrative_id": narrative_id}
+
+    def _generate_batch(self, items: List[Tuple[str, str]]) -> List[str]:
+        texts = self.client.generate([prompt for _, prompt in items])
+        for (narrative_id, _), text in zip(items, texts):
+            self.cache.put(narrative_id, text)
+        return texts
+
+    def _finish(self, narrative_id: str, future):
+        with self._lock:
+            self._pending.pop(narrative_id, None)
+            fallback = self._fallbacks.pop(narrative_id, None)
+            error = future.exception()
+            if error is not None:
+                logger.error(f"Narrative generation failed for {narrative_id}: {error}")
+                self._failed[narrative_id] = (str(error), fallback)
+                self._failed.move_to_end(narrative_id)
+                while len(self._failed) > self.max_failed:
+                    self._failed.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Inference client health and narratives waiting or failed.
+
+        Returns:
+            Dict of circuit breaker and hedging statistics plus pending
+                and failed counts
+        """
+        with self._lock:
+            pending, failed = len(self._pending), len(self._failed)
+        return dict(self.client.stats(), pending=pending, failed=failed)
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_narrative_service() -> NarrativeService:
+    """
+    Shared narrative service, created on first use.
+
+    Returns:
+        NarrativeService: Process-wide service instance
+    """
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = NarrativeService()
+    return _service
+
+
+@traced("narrative.request")
+def request_narrative(kind: str, chart: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Narrative wrapper using the shared service.
+
+    Args:
+        kind (str): Template name
+        chart (Dict): Computed chart
+
+    Returns:
+        Dict with narrative status
+    """
+    return get_narrative_service().request(kind, chart)
+
+
+def poll_narrative(narrative_id: str) -> Dict[str, Any]:
+    """
+    Poll wrapper using the shared service.
+
+    Args:
+        narrative_id (str): Identifier returned by ``request_narrative``
+
+    Returns:
+        Dict with narrative status
+    """
+    return get_narrative_service().poll(narrative_id)
+
+
+def narrative_metrics() -> Dict[str, Any]:
+    """
+    Metrics wrapper using the shared service.
+
+    Returns:
+        Dict of inference client and queue statistics
+    """
+    return get_narrative_service().stats()
@@ -1,6 +1,62 @@
+import re
 import datetime
+import string
+import unicodedata
 import numpy as np
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+from backend.utils.tracing import traced
+from .content import get_catalog
+
+# Positions of the digits in a YYYY-MM-DD string
+DATE_DIGIT_POSITIONS = [0, 1, 2, 3, 5, 6, 8, 9]
+
+# Pythagorean letter values (A-I = 1-9, J-R = 1-9, S-Z = 1-8) as byte
+# translation tables: each letter byte becomes its value, every other byte
+# becomes 0, so a name's total is the sum of its translated bytes. Y counts
+# as a consonant; personality (consonants) is the total minus the vowels.
+VOWELS = 'AEIOU'
+LETTER_VALUES = {letter: index % 9 + 1 for index, letter in enumerate(string.ascii_uppercase)}
+
+
+def _letter_table(letters: str) -> bytes:
+    table = bytearray(256)
+    for letter in letters:
+        table[ord(letter)] = table[ord(letter.lower())] = LETTER_VALUES[letter]
+    return bytes(table)
+
+
+EXPRESSION_TABLE = _letter_table(string.ascii_uppercase)
+SOUL_URGE_TABLE = _letter_table(VOWELS)
+
+NAME_NUMBER_KEYS = ("expression_number", "soul_urge_number", "personality_number")
+
+# Letters that NFKD does not decompose into an ASCII base letter
+TRANSLITERATIONS = {
+    'ß': 'ss', 'Æ': 'AE', 'æ': 'ae', 'Œ': 'OE', 'œ': 'oe', 'Ø': 'O', 'ø': 'o',
+    'Ł': 'L', 'ł': 'l', 'Đ': 'D', 'đ': 'd', 'Þ': 'TH', 'þ': 'th', 'Ð': 'D', 'ð': 'd', 'ı': 'i'
+}
+TRANSLITERATION_TABLE = str.maketrans(TRANSLITERATIONS)
+# str.translate with a dict is slow; only names containing these letters need it
+TRANSLITERATED_LETTERS = re.compile(f"[{''.join(TRANSLITERATIONS)}]")
+
+
+def ascii_name(name: str) -> str:
+    """
+    Transliterate a name to ASCII letters for numerology.
+
+    Args:
+        name (str): Name as entered, e.g. "Zoë Łukasiewicz"
+
+    Returns:
+        str: ASCII form, e.g. "Zoe Lukasiewicz"; characters without an
+            ASCII equivalent are dropped
+    """
+    if name.isascii():
+        return name
+    if TRANSLITERATED_LETTERS.search(name):
+        name = name.translate(TRANSLITERATION_TABLE)
+    decomposed = unicodedata.normalize('NFKD', name)
+    return decomposed.encode('ascii', 'ignore').decode('ascii')
 
 class NumerologyCalculator:
     """
@@ -23,6 +79,7 @@ class NumerologyCalculator:
         return number
     
     @staticmethod
+    @traced("numerology.life_path")
     def calculate_life_path(birth_date: str) -> Dict[str, Any]:
         """
         Calculate comprehensive life path number with advanced insights.
@@ -56,6 +113,137 @@ class NumerologyCalculator:
         except Exception as e:
             return {"error": f"Numerology calculation failed: {str(e)}"}
     
+    @staticmethod
+    def calculate_life_path_batch(birth_dates: List[str]) -> List[Dict[str, Any]]:
+        """
+        Calculate life path details for many birth dates at once.
+        
+        Digit sums are computed with array arithmetic over the raw date
+        bytes; only malformed dates fall back to the single-date path.
+        
+        Args:
+            birth_dates (List[str]): Birth dates in YYYY-MM-DD format
+        
+        Returns:
+            List of life path dicts, in input order
+        """
+        if not birth_dates:
+            return []
+        
+        raw = np.array([
+            date if isinstance(date, str) and len(date) == 10 and date.isascii() else ''
+            for date in birth_dates
+        ], dtype='S10')
+        chars = raw.view(np.uint8).reshape(len(raw), 10)
+        digits = chars[:, DATE_DIGIT_POSITIONS].astype(np.int64) - ord('0')
+        
+        well_formed = (
+            np.char.str_len(raw) == 10
+        ) & (chars[:, 4] == ord('-')) & (chars[:, 7] == ord('-')) & np.all((digits >= 0) & (digits <= 9), axis=1)
+        
+        # Reject impossible calendar dates by round-tripping through datetime64
+        year = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+        month = digits[:, 4] * 10 + digits[:, 5]
+        day = digits[:, 6] * 10 + digits[:, 7]
+        in_range = well_formed & (month >= 1) & (month <= 12) & (day >= 1) & (day <= 31)
+        months = np.where(in_range, (year - 1970) * 12 + month - 1, 0).astype('datetime64[M]')
+        days = months.astype('datetime64[D]') + np.where(in_range, day - 1, 0)
+        valid = in_range & (days.astype('datetime64[M]') == months)
+        
+        life_path_numbers = REDUCED_NUMBERS[np.where(valid, digits.sum(axis=1), 0)]
+        
+        details = {}
+        results = []
+        for index, number in enumerate(life_path_numbers.tolist()):
+            if not valid[index]:
+                results.append(NumerologyCalculator.calculate_life_path(birth_dates[index]))
+                continue
+            if number not in details:
+                details[number] = {
+                    "life_path_number": number,
+                    "description": NumerologyCalculator.get_life_path_description(number),
+                    "challenges": NumerologyCalculator.get_life_challenges(number),
+                    "potential_careers": NumerologyCalculator.get_career_suggestions(number)
+                }
+            results.append(dict(details[number]))
+        
+        return results
+    
+    @staticmethod
+    @traced("numerology.name_numbers")
+    def calculate_name_numbers(full_name: str) -> Dict[str, Any]:
+        """
+        Calculate expression, soul urge and personality numbers from a name.
+        
+        Args:
+            full_name (str): Full birth name; any script NFKD can reduce to
+                Latin letters
+        
+        Returns:
+            Dict with expression (destiny), soul urge and personality numbers
+        """
+        if not isinstance(full_name, str):
+            return {"error": "Name numerology failed: name must be a string"}
+        
+        name = ascii_name(full_name).encode('ascii')
+        expression = sum(name.translate(EXPRESSION_TABLE))
+        if not expression:
+            return {"error": "Name numerology failed: no Latin letters in name"}
+        
+        soul_urge = sum(name.translate(SOUL_URGE_TABLE))
+        totals = (expression, soul_urge, expression - soul_urge)
+        return dict(zip(NAME_NUMBER_KEYS, (
+            REDUCED_TOTALS[total] if total < len(REDUCED_TOTALS) else NumerologyCalculator.reduce_number(total)
+            for total in totals
+        )))
+    
+    @staticmethod
+    def calculate_name_numbers_batch(full_names: List[str]) -> List[Dict[str, Any]]:
+        """
+        Calculate name numbers for many names at once.
+        
+        Names are transliterated one by one, then concatenated into a single
+        byte buffer whose letter values and per-name sums are computed with
+        array lookups and segmented reductions.
+        
+        Args:
+            full_names (List[str]): Full birth names
+        
+        Returns:
+            List of name number dicts, in input order
+        """
+        if not full_names:
+            return []
+        
+        encoded = [
+            ascii_name(name).encode('ascii') if isinstance(name, str) else b''
+            for name in full_names
+        ]
+        lengths = np.fromiter((len(name) for name in encoded), dtype=np.int64, count=len(encoded))
+        buffer = np.frombuffer(b''.join(encoded) + b'\x00', dtype=np.uint8)
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        
+        # reduceat of an empty segment returns its start element; zero it instead
+        def segment_sums(table: np.ndarray) -> np.ndarray:
+            return np.where(lengths > 0, np.add.reduceat(table[buffer].astype(np.int64), starts), 0)
+        
+        expression = segment_sums(EXPRESSION_VALUES)
+        soul_urge = segment_sums(SOUL_URGE_VALUES)
+        
+        def reduced(totals: np.ndarray) -> List[int]:
+            numbers = REDUCED_NUMBERS[np.minimum(totals, len(REDUCED_NUMBERS) - 1)]
+            overflow = np.flatnonzero(totals >= len(REDUCED_NUMBERS))
+            numbers[overflow] = [NumerologyCalculator.reduce_number(int(totals[index])) for index in overflow]
+            return numbers.tolist()
+        
+        results = []
+        for index, numbers in enumerate(zip(reduced(expression), reduced(soul_urge), reduced(expression - soul_urge))):
+            if not numbers[0]:
+                results.append(NumerologyCalculator.calculate_name_numbers(full_names[index]))
+                continue
+            results.append(dict(zip(NAME_NUMBER_KEYS, numbers)))
+        return results
+    
     @staticmethod
     def get_life_path_description(number: int) -> str:
         """
@@ -67,21 +255,7 @@ class NumerologyCalculator:
         Returns:
             str: Detailed life path description
         """
-        descriptions = {
-            1: "The Leader: Independent, innovative, and pioneering. You're destined to forge your own path and inspire others through your originality and courage.",
-            2: "The Mediator: Sensitive, diplomatic, and cooperative. Your strength lies in creating harmony, understanding, and building meaningful relationships.",
-            3: "The Communicator: Creative, expressive, and social. Your journey involves self-expression, spreading joy, and inspiring others through art and communication.",
-            4: "The Builder: Disciplined, practical, and reliable. Your path is about creating stable foundations, working methodically, and bringing structure to chaos.",
-            5: "The Freedom Seeker: Adventurous, versatile, and progressive. Your life is about experiencing change, learning through diverse experiences, and embracing personal freedom.",
-            6: "The Nurturer: Compassionate, responsible, and harmonious. Your mission involves creating balance, caring for others, and building loving, supportive environments.",
-            7: "The Seeker: Analytical, spiritual, and introspective. Your journey is about deep understanding, spiritual growth, and uncovering life's mysteries.",
-            8: "The Powerhouse: Ambitious, confident, and material-focused. Your path involves mastering personal power, achieving material success, and creating abundance.",
-            9: "The Humanitarian: Compassionate, global-minded, and transformative. Your mission is to serve humanity, show unconditional love, and bring healing.",
-            11: "The Intuitive Master: Spiritually advanced, with heightened intuition and potential for significant societal impact. Balancing spiritual insights with practical implementation.",
-            22: "The Master Builder: Extraordinary potential to turn big dreams into reality. Capable of creating large-scale systems that benefit humanity.",
-            33: "The Master Teacher: Rare spiritual calling to uplift and transform human consciousness through compassion and wisdom."
-        }
-        return descriptions.get(number, "A unique life path with complex and evolving characteristics.")
+        return get_catalog().life_path(number)["description"]
     
     @staticmethod
     def get_life_challenges(number: int) -> Dict[str, str]:
@@ -92,26 +266,12 @@ class NumerologyCalculator:
             number (int): Life path number
         
         Returns:
-            Dict of challenges and growth opportunities
-        """
-        challenges = {
-            1: {
-                "core_challenge": "Overcoming self-doubt and fear of failure",
-                "growth_opportunity": "Developing confidence and learning to lead authentically"
-            },
-            2: {
-                "core_challenge": "Balancing personal needs with others' expectations",
-                "growth_opportunity": "Developing healthy boundaries and self-worth"
-            },
-            # Add more detailed challenges for other numbers
-        }
-        return challenges.get(number, {
-            "core_challenge": "Navigating personal growth and self-discovery",
-            "growth_opportunity": "Embracing life's lessons with openness and resilience"
-        })
+            Read-only dict of challenges and growth opportunities
+        """
+        return get_catalog().life_path(number)["challenges"]
     
     @staticmethod
-    def get_career_suggestions(number: int) -> List[str]:
+    def get_career_suggestions(number: int) -> Tuple[str, ...]:
         """
         Provide career suggestions based on life path number.
         
@@ -119,24 +279,29 @@ class NumerologyCalculator:
             number (int): Life path number
         
         Returns:
-            List of potential career paths
+            Tuple of potential career paths
         """
-        career_suggestions = {
-            1: ["Entrepreneur", "Executive", "Innovation Consultant"],
-            2: ["Counselor", "Diplomat", "HR Professional"],
-            3: ["Artist", "Performer", "Marketing Creative"],
-            # Add more career suggestions
-        }
-        return career_suggestions.get(number, ["Diverse career paths with multiple opportunities"])
+        return get_catalog().life_path(number)["careers"]
 
-def calculate_numerology(birth_date: str) -> Dict[str, Any]:
+def calculate_numerology(birth_date: str, full_name: Optional[str] = None) -> Dict[str, Any]:
     """
     Comprehensive numerology calculation wrapper.
     
     Args:
         birth_date (str): Birth date in YYYY-MM-DD format
+        full_name (str, optional): Full birth name for name-based numbers
     
     Returns:
         Dict with numerological insights
     """
-    return NumerologyCalculator.calculate_life_path(birth_date)
+    result = NumerologyCalculator.calculate_life_path(birth_date)
+    if full_name and 'error' not in result:
+        result.update(NumerologyCalculator.calculate_name_numbers(full_name))
+    return result
+
+# Reduced value of every digit sum a birth date, or a name of up to ~450 letters, can produce
+REDUCED_NUMBERS = np.array([NumerologyCalculator.reduce_number(total) for total in range(4096)])
+REDUCED_TOTALS = tuple(REDUCED_NUMBERS.tolist())
+
+EXPRESSION_VALUES = np.frombuffer(EXPRESSION_TABLE, dtype=np.uint8)
+SOUL_URGE_VALUES = np.frombuffer(SOUL_URGE_TABLE, dtype=np.uint8)
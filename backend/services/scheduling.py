@@ -0,0 +1,111 @@
+from typing import Dict, Any, Optional
+from backend.config.settings import Config
+from backend.utils.batching import MicroBatcher
+from backend.utils.deadlines import check_deadline, wait_result
+from backend.utils.singleflight import SingleFlight
+from backend.utils.profiling import profiling_active
+from backend.utils.tracing import traced
+from .numerology import NumerologyCalculator, calculate_numerology
+from .human_design import HumanDesignCalculator, calculate_human_design
+from .hugging_face import get_possible_ascendants
+from .locations import resolve_location
+
+numerology_batcher = MicroBatcher(
+    NumerologyCalculator.calculate_life_path_batch,
+    window_ms=Config.CHART_BATCH_WINDOW_MS,
+    max_batch_size=Config.CHART_BATCH_MAX_SIZE,
+    max_in_flight=Config.CHART_BATCH_MAX_IN_FLIGHT,
+    name="numerology"
+)
+
+
+# Identical ascendant sweeps and Human Design charts in flight share one computation
+chart_flights = SingleFlight(
+    "charts",
+    cross_process=Config.SINGLE_FLIGHT_CROSS_PROCESS,
+    directory=Config.SINGLE_FLIGHT_DIR,
+    result_ttl=Config.SINGLE_FLIGHT_RESULT_TTL,
+    timeout=Config.CHART_BATCH_TIMEOUT
+)
+
+
+@traced("schedule.numerology")
+def schedule_numerology(birth_date: str, full_name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Numerology calculation routed through the request micro-batcher.
+    
+    Args:
+        birth_date (str): Birth date in YYYY-MM-DD format
+        full_name (str, optional): Full birth name for name-based numbers
+    
+    Returns:
+        Dict with numerological insights
+    """
+    if not Config.CHART_BATCHING_ENABLED or profiling_active():
+        check_deadline("the numerology calculation")
+        return calculate_numerology(birth_date, full_name)
+    # Past the request's deadline, a batch that has not started skips this chart
+    result = wait_result(numerology_batcher.submit(birth_date), Config.CHART_BATCH_TIMEOUT, cancel=True)
+    if full_name and 'error' not in result:
+        result.update(NumerologyCalculator.calculate_name_numbers(full_name))
+    return result
+
+
+@traced("schedule.human_design")
+def schedule_human_design(
+    birth_date: str, 
+    birth_time: Optional[str] = None, 
+    birth_location: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Human Design calculation shared between identical concurrent requests.
+    
+    Args:
+        birth_date (str): Birth date in YYYY-MM-DD format
+        birth_time (str, optional): Birth time
+        birth_location (str, optional): Birth location
+    
+    Returns:
+        Dict with Human Design insights
+    """
+    # Profiled requests compute on their own thread, where the profiler sees the work
+    if profiling_active():
+        check_deadline("the Human Design calculation")
+        return calculate_human_design(birth_date, birth_time, birth_location)
+    key = ("human_design", birth_date, HumanDesignCalculator.normalize_birth_time(birth_time), resolve_location(birth_location))
+    check_deadline("the Human Design calculation")
+    return chart_flights.do(key, calculate_human_design, birth_date, birth_time, birth_location)
+
+
+@traced("schedule.ascendants")
+def schedule_ascendants(birth_date: str, birth_location: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Ascendant sweep shared between identical concurrent requests.
+    
+    Args:
+        birth_date (str): Birth date in YYYY-MM-DD format
+        birth_location (str, optional): Birth location
+    
+    Returns:
+        Dict with possible ascendants and their time windows
+    """
+    check_deadline("the ascendant sweep")
+    if profiling_active():
+        return get_possible_ascendants(birth_date, birth_location)
+    key = ("ascendants", birth_date, resolve_location(birth_location))
+    return chart_flights.do(key, get_possible_ascendants, birth_date, birth_location)
+
+
+def batching_metrics() -> Dict[str, Any]:
+    """
+    Numerology batch-size distribution and added queueing latency, and
+    single-flight counters.
+    
+    Returns:
+        Dict of batcher and single-flight statistics
+    """
+    return {
+        "enabled": Config.CHART_BATCHING_ENABLED,
+        "numerology": numerology_batcher.stats(),
+        "single_flight": chart_flights.stats()
+    }
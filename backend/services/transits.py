@@ -0,0 +1,327 @@
+import os
+import logging
+import datetime
+import numpy as np
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Sequence
+import ephem
+from scipy import optimize
+from backend.config.settings import Config
+from backend.utils.binary_table import read_table, write_table
+from backend.utils.tracing import traced
+from .human_design import _apparent_longitude, _wrap_degrees
+from .lunar import UNIX_EPOCH, ZODIAC_SIGNS, _isoformat, _unix_seconds
+
+logger = logging.getLogger(__name__)
+
+INDEX_MAGIC = b'PLTRNS01'
+INDEX_FIRST_YEAR = 1970
+INDEX_LAST_YEAR = 2070
+
+# Longest range answered by one query
+MAX_QUERY_DAYS = 366
+
+# Body, ephem class and sampling step in days. Steps are short enough that
+# no body crosses a whole sign or turns twice between samples.
+TRANSIT_BODIES = (
+    ("Sun", ephem.Sun, 5.0),
+    ("Moon", ephem.Moon, 1.0),
+    ("Mercury", ephem.Mercury, 1.0),
+    ("Venus", ephem.Venus, 2.0),
+    ("Mars", ephem.Mars, 2.0),
+    ("Jupiter", ephem.Jupiter, 5.0),
+    ("Saturn", ephem.Saturn, 5.0),
+    ("Uranus", ephem.Uranus, 5.0),
+    ("Neptune", ephem.Neptune, 5.0),
+    ("Pluto", ephem.Pluto, 5.0)
+)
+BODY_NAMES = tuple(name for name, _, _ in TRANSIT_BODIES)
+BODY_CODES = {name: code for code, name in enumerate(BODY_NAMES)}
+
+EVENT_KINDS = (
+    "ingress", "retrograde_ingress", "station_retrograde", "station_direct",
+    "new_moon", "first_quarter", "full_moon", "last_quarter"
+)
+EVENT_CODES = {kind: code for code, kind in enumerate(EVENT_KINDS)}
+LUNATIONS = (
+    ("new_moon", ephem.next_new_moon),
+    ("first_quarter", ephem.next_first_quarter_moon),
+    ("full_moon", ephem.next_full_moon),
+    ("last_quarter", ephem.next_last_quarter_moon)
+)
+
+# Root-finding tolerance in days (about a second)
+ROOT_TOLERANCE = 1e-5
+SPEED_STEP = 0.01
+
+
+def _body_events(body_class, step: float, start: float, end: float) -> List[tuple]:
+    """
+    Sign ingresses and stations of one body between two ephem dates.
+
+    Stations are bracketed where the sampled motion changes direction and
+    solved on the longitude's rate of change; between stations longitude
+    is monotonic, so each sign boundary crossed between two breakpoints is
+    one bracketed root.
+    """
+    body = body_class()
+
+    def longitude(date: float) -> float:
+        return _apparent_longitude(body, date)
+
+    def speed(date: float) -> float:
+        return _wrap_degrees(longitude(date + SPEED_STEP) - longitude(date - SPEED_STEP))
+
+    dates = np.arange(start, end + step, step)
+    longitudes = np.array([longitude(date) for date in dates])
+    motion = np.sign(_wrap_degrees(np.diff(longitudes)))
+
+    events = []
+    stations = []
+    for index in np.flatnonzero(motion[1:] != motion[:-1]) + 1:
+        low, high = dates[index - 1], dates[index + 1]
+        if speed(low) * speed(high) >= 0:
+            continue
+        date = optimize.brentq(speed, low, high, xtol=ROOT_TOLERANCE)
+        kind = "station_retrograde" if motion[index] < 0 else "station_direct"
+        stations.append(date)
+        events.append((date, kind, int(longitude(date) // 30) % 12))
+
+    breakpoints = np.concatenate([dates, stations])
+    order = np.argsort(breakpoints)
+    breakpoints = breakpoints[order]
+    longitudes = np.concatenate([longitudes, [longitude(date) for date in stations]])[order]
+    unwrapped = np.degrees(np.unwrap(np.radians(longitudes)))
+
+    signs = np.floor(unwrapped / 30).astype(np.int64)
+    for index in np.flatnonzero(signs[1:] != signs[:-1]):
+        low, high = breakpoints[index], breakpoints[index + 1]
+        forward = unwrapped[index + 1] > unwrapped[index]
+        first, last = sorted((signs[index], signs[index + 1]))
+        for boundary_sign in range(first + 1, last + 1):
+            boundary = (boundary_sign * 30) % 360
+
+            def residual(date: float) -> float:
+                return _wrap_degrees(longitude(date) - boundary)
+
+            date = optimize.brentq(residual, low, high, xtol=ROOT_TOLERANCE)
+            if forward:
+                events.append((date, "ingress", boundary_sign % 12))
+            else:
+                events.append((date, "retrograde_ingress", (boundary_sign - 1) % 12))
+    return events
+
+
+class TransitIndex:
+    """
+    Sorted index of sign ingresses, stations and lunations.
+
+    Events are stored column-wise (Unix seconds, body, kind, sign) in time
+    order, so a date range is two binary searches on the time column and
+    the answer is a contiguous slice of every column. ``load`` memory-maps
+    the columns, so workers share the index pages and never touch ephem.
+    """
+
+    def __init__(
+        self,
+        first_year: int,
+        last_year: int,
+        times: np.ndarray,
+        bodies: np.ndarray,
+        kinds: np.ndarray,
+        signs: np.ndarray
+    ):
+        self.first_year = first_year
+        self.last_year = last_year
+        self.times = times
+        self.bodies = bodies
+        self.kinds = kinds
+        self.signs = signs
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    @classmethod
+    def build(cls, first_year: int = INDEX_FIRST_YEAR, last_year: int = INDEX_LAST_YEAR) -> 'TransitIndex':
+        """
+        Compute every event with ephem. Takes a few seconds per decade.
+
+        Args:
+            first_year (int): First year covered
+            last_year (int): Last year covered (inclusive)
+
+        Returns:
+            TransitIndex
+        """
+        start = float(ephem.Date(datetime.datetime(first_year, 1, 1)))
+        end = float(ephem.Date(datetime.datetime(last_year + 1, 1, 1)))
+
+        events = []
+        for name, body_class, step in TRANSIT_BODIES:
+            for date, kind, sign in _body_events(body_class, step, start, end):
+                events.append((date, BODY_CODES[name], EVENT_CODES[kind], sign))
+
+        moon = ephem.Moon()
+        for kind, next_event in LUNATIONS:
+            date = next_event(start)
+            while date < end:
+                sign = int(_apparent_longitude(moon, date) // 30) % 12
+                events.append((float(date), BODY_CODES["Moon"], EVENT_CODES[kind], sign))
+                date = next_event(date)
+
+        events = [event for event in events if start <= event[0] < end]
+        events.sort()
+        times = np.array([_unix_seconds(event[0]) for event in events], dtype=np.int64)
+        columns = np.array([event[1:] for event in events], dtype=np.uint8).reshape(-1, 3)
+        return cls(first_year, last_year, times, columns[:, 0].copy(), columns[:, 1].copy(), columns[:, 2].copy())
+
+    def save(self, path: str):
+        """
+        Write the index as a flat binary table, atomically.
+
+        Args:
+            path (str): Destination path
+        """
+        write_table(path, INDEX_MAGIC, {
+            "times": self.times,
+            "bodies": self.bodies,
+            "kinds": self.kinds,
+            "signs": self.signs
+        }, {
+            "first_year": self.first_year,
+            "last_year": self.last_year,
+            "bodies": list(BODY_NAMES),
+            "kinds": list(EVENT_KINDS)
+        })
+
+    @classmethod
+    def load(cls, path: str) -> 'TransitIndex':
+        """
+        Memory-map an index written by ``save``.
+
+        Args:
+            path (str): Path of the index file
+
+        Returns:
+            TransitIndex
+
+        Raises:
+            ValueError: If the file is not a transit index for these bodies
+                and event kinds
+        """
+        columns, attrs = read_table(path, INDEX_MAGIC)
+        if attrs.get("bodies") != list(BODY_NAMES) or attrs.get("kinds") != list(EVENT_KINDS):
+            raise ValueError(f"{path} was built for different bodies or event kinds")
+        return cls(attrs["first_year"], attrs["last_year"], columns["times"], columns["bodies"], columns["kinds"], columns["signs"])
+
+    def covers(self, start: datetime.datetime, end: datetime.datetime) -> bool:
+        """
+        Whether a half-open UTC range lies within the indexed years.
+
+        Args:
+            start (datetime): Naive UTC start
+            end (datetime): Naive UTC end
+
+        Returns:
+            bool
+        """
+        return bool(len(self)) and (
+            datetime.datetime(self.first_year, 1, 1) <= start and end <= datetime.datetime(self.last_year + 1, 1, 1)
+        )
+
+    def query(
+        self,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        bodies: Optional[Sequence[str]] = None,
+        kinds: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Events in a half-open time range, in time order.
+
+        Args:
+            start (datetime): Naive UTC start, inclusive
+            end (datetime): Naive UTC end, exclusive
+            bodies (Sequence[str], optional): Only these bodies
+            kinds (Sequence[str], optional): Only these event kinds
+
+        Returns:
+            List of event dicts with time, body, event and sign
+        """
+        first, last = np.searchsorted(
+            self.times, [(start - UNIX_EPOCH).total_seconds(), (end - UNIX_EPOCH).total_seconds()]
+        )
+        window = slice(int(first), int(last))
+        selected = np.ones(last - first, dtype=bool)
+        if bodies is not None:
+            selected &= np.isin(self.bodies[window], [BODY_CODES[name] for name in bodies])
+        if kinds is not None:
+            selected &= np.isin(self.kinds[window], [EVENT_CODES[kind] for kind in kinds])
+
+        return [
+            {"time": _isoformat(time), "body": BODY_NAMES[body], "event": EVENT_KINDS[kind], "sign": ZODIAC_SIGNS[sign]}
+            for time, body, kind, sign in zip(
+                self.times[window][selected].tolist(), self.bodies[window][selected].tolist(),
+                self.kinds[window][selected].tolist(), self.signs[window][selected].tolist()
+            )
+        ]
+
+
+@lru_cache(maxsize=None)
+def get_transit_index() -> TransitIndex:
+    """
+    The transit index, memory-mapped once per process.
+
+    Returns:
+        TransitIndex: Index from ``Config.TRANSIT_INDEX_PATH``
+
+    Raises:
+        FileNotFoundError: If the index has not been built
+    """
+    path = Config.TRANSIT_INDEX_PATH
+    if not os.path.exists(path):
+        logger.error(f"Transit index {path} not found; run tools/transit_index.py at build time")
+        raise FileNotFoundError(f"Transit index {path} has not been built")
+    index = TransitIndex.load(path)
+    logger.info(f"Loaded {len(index)} transit events from {path}")
+    return index
+
+
+@traced("transits.find")
+def find_transits(
+    start_date: str,
+    end_date: str,
+    bodies: Optional[Sequence[str]] = None,
+    kinds: Optional[Sequence[str]] = None
+) -> Dict[str, Any]:
+    """
+    Ingresses, stations and lunations between two dates.
+
+    Args:
+        start_date (str): First day in YYYY-MM-DD format (UTC)
+        end_date (str): Last day (inclusive) in YYYY-MM-DD format (UTC)
+        bodies (Sequence[str], optional): Only these bodies
+        kinds (Sequence[str], optional): Only these event kinds
+
+    Returns:
+        Dict with the range and its events
+
+    Raises:
+        ValueError: If the range is reversed, too long or outside the index
+    """
+    start = datetime.datetime.strptime(start_date, '%Y-%m-%d')
+    end = datetime.datetime.strptime(end_date, '%Y-%m-%d') + datetime.timedelta(days=1)
+    if end <= start:
+        raise ValueError("end_date must not be before start_date")
+    if (end - start).days > MAX_QUERY_DAYS:
+        raise ValueError(f"Transit queries cover at most {MAX_QUERY_DAYS} days")
+
+    index = get_transit_index()
+    if not index.covers(start, end):
+        raise ValueError(f"Transits are available for {index.first_year}-01-01 to {index.last_year}-12-31")
+
+    return {
+        "start_date": start_date,
+        "end_date": end_date,
+        "events": index.query(start, end, bodies, kinds)
+    }
@@ -0,0 +1,45 @@
+import hmac
+from functools import wraps
+from typing import Callable, Optional
+from flask import request, jsonify
+from backend.config.settings import Config
+
+ADMIN_HEADER = 'X-Admin-Token'
+
+
+def is_admin_token(token: Optional[str]) -> bool:
+    """
+    Check a token against ``Config.ADMIN_TOKEN``.
+
+    Args:
+        token (str, optional): Token sent by the client
+
+    Returns:
+        bool: False whenever no admin token is configured
+    """
+    if not Config.ADMIN_TOKEN or not token:
+        return False
+    return hmac.compare_digest(token.encode('utf-8'), Config.ADMIN_TOKEN.encode('utf-8'))
+
+
+def admin_required(route: Callable) -> Callable:
+    """
+    Restrict a route to requests carrying the admin token.
+
+    Admin routes answer 404 while no token is configured, so they are
+    invisible in deployments that do not use them.
+
+    Args:
+        route (Callable): Flask view function
+
+    Returns:
+        Callable: Wrapped view function
+    """
+    @wraps(route)
+    def wrapper(*args, **kwargs):
+        if not Config.ADMIN_TOKEN:
+            return jsonify({"error": "Not found"}), 404
+        if not is_admin_token(request.headers.get(ADMIN_HEADER)):
+            return jsonify({"error": "Forbidden", "details": f"A valid {ADMIN_HEADER} header is required"}), 403
+        return route(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,221 @@
+import os
+import re
+import gzip
+import json
+import hashlib
+import logging
+import mimetypes
+from typing import Any, Dict, Optional, Tuple
+from werkzeug.wrappers import Response
+from werkzeug.wsgi import wrap_file
+
+try:
+    import brotli
+except ImportError:  # Brotli variants are skipped without the package
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = 'assets.manifest.json'
+
+# Only these types are worth compressing; images and fonts are already compressed
+COMPRESSIBLE_TYPES = (
+    'text/', 'application/javascript', 'application/json', 'application/manifest+json',
+    'application/xml', 'image/svg+xml', 'image/x-icon', 'application/wasm'
+)
+MIN_COMPRESS_BYTES = 256
+
+# Encodings in order of preference when the client weighs them equally
+ENCODING_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+# Bundler output already carrying a content hash, e.g. main.3f2a9c1e.js
+FINGERPRINTED_NAME = re.compile(r'\.[0-9a-f]{8,}\.')
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+
+
+def _content_type(path: str) -> str:
+    content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    if content_type.startswith('text/') or content_type in ('application/javascript', 'application/json'):
+        content_type += '; charset=utf-8'
+    return content_type
+
+
+def _write(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as output_file:
+        output_file.write(data)
+
+
+def build_assets(source_dir: str, output_dir: str) -> Dict[str, Any]:
+    """
+    Fingerprint and pre-compress a static build.
+
+    Every file is copied to ``output_dir`` under a content-hashed name
+    (``main.js`` -> ``main.<hash>.js``) with ``.gz`` and, when the brotli
+    package is installed, ``.br`` siblings at maximum compression. Variants
+    that do not shrink the file are dropped. Files from earlier builds are
+    kept so pages already loaded can still fetch their assets.
+
+    Args:
+        source_dir (str): Build output, e.g. ``frontend/build``
+        output_dir (str): Directory for hashed files and the manifest
+
+    Returns:
+        Dict: Manifest mapping each source path to its hashed variants
+    """
+    assets = {}
+    for root, directories, files in os.walk(source_dir):
+        directories.sort()
+        for name in sorted(files):
+            source_path = os.path.join(root, name)
+            logical_path = os.path.relpath(source_path, source_dir).replace(os.sep, '/')
+            with open(source_path, 'rb') as source_file:
+                data = source_file.read()
+
+            digest = hashlib.sha256(data).hexdigest()[:16]
+            stem, extension = os.path.splitext(logical_path)
+            hashed_path = f"{stem}.{digest[:12]}{extension}"
+            content_type = _content_type(name)
+            _write(os.path.join(output_dir, hashed_path), data)
+
+            encodings = {}
+            if content_type.startswith(COMPRESSIBLE_TYPES) and len(data) >= MIN_COMPRESS_BYTES:
+                variants = {'gzip': gzip.compress(data, compresslevel=9, mtime=0)}
+                if brotli is not None:
+                    variants['br'] = brotli.compress(data, quality=11)
+                for encoding in ENCODING_SUFFIXES:
+                    compressed = variants.get(encoding)
+                    if compressed is not None and len(compressed) < len(data):
+                        variant_path = hashed_path + ENCODING_SUFFIXES[encoding]
+                        _write(os.path.join(output_dir, variant_path), compressed)
+                        encodings[encoding] = {'path': variant_path, 'size': len(compressed)}
+
+            assets[logical_path] = {
+                'path': hashed_path,
+                'size': len(data),
+                'digest': digest,
+                'content_type': content_type,
+                'fingerprinted': bool(FINGERPRINTED_NAME.search(name)),
+                'encodings': encodings
+            }
+
+    manifest = {'version': 1, 'assets': assets}
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    temporary_path = f"{manifest_path}.{os.getpid()}.tmp"
+    os.makedirs(output_dir, exist_ok=True)
+    with open(temporary_path, 'w', encoding='utf-8') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+    os.replace(temporary_path, manifest_path)
+    return manifest
+
+
+def negotiate_encoding(accept_encoding: Optional[str], available,
+                       preference: Tuple[str, ...] = tuple(ENCODING_SUFFIXES)) -> Optional[str]:
+    """
+    Pick the best available content coding for an ``Accept-Encoding`` header.
+
+    Args:
+        accept_encoding (str, optional): Request header value
+        available: Encodings with a pre-compressed variant
+        preference (Tuple[str, ...]): Encodings to consider, best first,
+            deciding between encodings the client weighs equally
+
+    Returns:
+        str: One of ``preference``, e.g. ``'br'`` or ``'gzip'``, or None
+            for the identity encoding
+    """
+    if not accept_encoding or not available:
+        return None
+
+    weights = {}
+    for part in accept_encoding.split(','):
+        coding, _, parameters = part.strip().partition(';')
+        quality = 1.0
+        if parameters.strip().startswith('q='):
+            try:
+                quality = float(parameters.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        weights[coding.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in preference:
+        quality = weights.get(encoding, weights.get('*', 0.0))
+        if encoding in available and quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class StaticAssets:
+    """
+    Serve a pre-built asset directory from its in-memory manifest.
+
+    Hashed paths and bundler-fingerprinted files are sent with an immutable
+    ``Cache-Control``; everything else (``index.html``) must revalidate its
+    ETag. With ``accel_redirect_prefix`` set, responses carry only headers
+    and an ``X-Accel-Redirect`` so nginx sends the bytes; otherwise the file
+    is handed to the server's ``wsgi.file_wrapper`` (sendfile in gunicorn).
+    """
+
+    def __init__(self, asset_dir: str, accel_redirect_prefix: Optional[str] = None):
+        self.asset_dir = asset_dir
+        self.accel_redirect_prefix = accel_redirect_prefix.rstrip('/') + '/' if accel_redirect_prefix else None
+        self.assets = {}
+        manifest_path = os.path.join(asset_dir, MANIFEST_NAME)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding='utf-8') as manifest_file:
+                self.assets = json.load(manifest_file)['assets']
+        else:
+            logger.warning(f"No asset manifest at {manifest_path}; run tools/build_assets.py")
+        self.hashed_paths = {asset['path']: logical_path for logical_path, asset in self.assets.items()}
+
+    def __bool__(self) -> bool:
+        return bool(self.assets)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self.assets or path in self.hashed_paths
+
+    def response(self, path: str, environ: Dict[str, Any]) -> Optional[Response]:
+        """
+        Build the response for a static asset request.
+
+        Args:
+            path (str): Logical (``static/js/main.js``) or hashed path
+            environ (Dict): WSGI environ of the request
+
+        Returns:
+            Response, or None if the path is not in the manifest
+        """
+        immutable = path in self.hashed_paths
+        asset = self.assets.get(self.hashed_paths.get(path, path))
+        if asset is None:
+            return None
+
+        encoding = negotiate_encoding(environ.get('HTTP_ACCEPT_ENCODING'), asset['encodings'])
+        variant_path = asset['encodings'][encoding]['path'] if encoding else asset['path']
+        etag = f'"{asset["digest"]}-{encoding}"' if encoding else f'"{asset["digest"]}"'
+
+        headers = {
+            'Cache-Control': IMMUTABLE_CACHE_CONTROL if immutable or asset['fingerprinted'] else REVALIDATE_CACHE_CONTROL,
+            'ETag': etag
+        }
+        if asset['encodings']:
+            headers['Vary'] = 'Accept-Encoding'
+
+        if_none_match = environ.get('HTTP_IF_NONE_MATCH', '')
+        if if_none_match.strip() == '*' or etag in (tag.strip().replace('W/', '', 1) for tag in if_none_match.split(',')):
+            return Response(status=304, headers=headers)
+
+        headers['Content-Type'] = asset['content_type']
+        if encoding:
+            headers['Content-Encoding'] = encoding
+
+        if self.accel_redirect_prefix:
+            headers['X-Accel-Redirect'] = self.accel_redirect_prefix + variant_path
+            return Response(b'', headers=headers)
+
+        headers['Content-Length'] = str(asset['encodings'][encoding]['size'] if encoding else asset['size'])
+        asset_file = open(os.path.join(self.asset_dir, variant_path), 'rb')
+        return Response(wrap_file(environ, asset_file), headers=headers, direct_passthrough=True)
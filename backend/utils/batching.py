@@ -0,0 +1,178 @@
+import os
+import queue
+import threading
+import time
+import logging
+from collections import Counter, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class MicroBatcher:
+    """
+    Collect concurrently submitted items into batches for a single call.
+
+    Items are gathered until either ``max_batch_size`` items are queued or
+    ``window_ms`` has elapsed since the first item of the batch arrived.
+    At most ``max_in_flight`` batches are processed at once; while every
+    slot is busy, new items keep accumulating into the next batch.
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[Any]], List[Any]],
+        window_ms: float = 2.0,
+        max_batch_size: int = 32,
+        max_in_flight: int = 4,
+        name: str = "batcher",
+        latency_samples: int = 4096
+    ):
+        """
+        Args:
+            process_batch (Callable): Maps a list of items to a list of results
+                in the same order
+            window_ms (float): Maximum time to wait for a batch to fill
+            max_batch_size (int): Maximum number of items per batch
+            max_in_flight (int): Maximum number of batches processed concurrently
+            name (str): Name used for the collector thread and log messages
+            latency_samples (int): Number of recent queueing latencies kept
+                for percentile metrics
+        """
+        self.process_batch = process_batch
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_in_flight = max(1, max_in_flight)
+        self.name = name
+
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue = None
+        self._slots = None
+        self._executor = None
+
+        self._metrics_lock = threading.Lock()
+        self._batch_sizes = Counter()
+        self._cancelled = 0
+        self._queue_latencies = deque(maxlen=latency_samples)
+
+    def _ensure_started(self):
+        # Threads do not survive fork, so each worker process starts its own collector
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue()
+            self._slots = threading.BoundedSemaphore(self.max_in_flight)
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_in_flight,
+                thread_name_prefix=f"{self.name}-worker"
+            )
+            threading.Thread(target=self._collect, name=f"{self.name}-collector", daemon=True).start()
+            self._pid = os.getpid()
+
+    def submit(self, item: Any) -> Future:
+        """
+        Queue an item for the next batch.
+
+        Args:
+            item (Any): Item passed to ``process_batch``
+
+        Returns:
+            Future: Resolved with the item's result
+        """
+        self._ensure_started()
+        future = Future()
+        self._queue.put((item, future, time.perf_counter()))
+        return future
+
+    def _collect(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.perf_counter() + self.window
+
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self._slots.acquire()
+            # Anything that arrived while waiting for a slot joins this batch
+            while len(batch) < self.max_batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._executor.submit(self._run, batch)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Batch-size distribution and queueing latency added by batching.
+
+        Returns:
+            Dict with batch counts, size distribution, items cancelled before
+                their batch ran and latency percentiles in milliseconds over
+                the most recent items
+        """
+        with self._metrics_lock:
+            sizes = dict(sorted(self._batch_sizes.items()))
+            latencies = sorted(self._queue_latencies)
+            cancelled = self._cancelled
+
+        batches = sum(sizes.values())
+        items = sum(size * count for size, count in sizes.items())
+        return {
+            "batches": batches,
+            "items": items,
+            "cancelled": cancelled,
+            "mean_batch_size": round(items / batches, 2) if batches else 0.0,
+            "batch_size_distribution": sizes,
+            "queue_latency_ms": {
+                "p50": round(_percentile(latencies, 0.50) * 1000, 3),
+                "p95": round(_percentile(latencies, 0.95) * 1000, 3),
+                "p99": round(_percentile(latencies, 0.99) * 1000, 3),
+                "max": round(latencies[-1] * 1000, 3) if latencies else 0.0
+            },
+            "window_ms": self.window * 1000,
+            "max_batch_size": self.max_batch_size
+        }
+
+    def _run(self, batch: List[tuple]):
+        started = time.perf_counter()
+        # Items whose caller gave up (a cancelled future) are not computed
+        live = [entry for entry in batch if entry[1].set_running_or_notify_cancel()]
+        with self._metrics_lock:
+            self._cancelled += len(batch) - len(live)
+            if live:
+                self._batch_sizes[len(live)] += 1
+            self._queue_latencies.extend(started - enqueued for _, _, enqueued in batch)
+        batch = live
+
+        try:
+            if not batch:
+                return
+            results = self.process_batch([item for item, _, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"{self.name}: expected {len(batch)} results, got {len(results)}")
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
+        except Exception as e:
+            logger.error(f"{self.name}: batch of {len(batch)} failed: {e}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._slots.release()
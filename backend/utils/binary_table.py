@@ -0,0 +1,86 @@
+import os
+import json
+import numpy as np
+from typing import Any, Dict, Tuple
+
+# Columns start on cache-line boundaries
+ALIGNMENT = 64
+PREAMBLE_DTYPE = np.dtype([('magic', 'S8'), ('data_offset', '<u4')])
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def write_table(path: str, magic: bytes, columns: Dict[str, np.ndarray], attrs: Dict[str, Any] = None):
+    """
+    Write arrays as a flat, memory-mappable binary table.
+
+    The file starts with ``magic``, the size of a JSON header describing
+    every column (dtype, shape, byte offset) plus ``attrs``, and then the
+    raw column data, each column aligned to 64 bytes. The file is replaced
+    atomically so running workers keep their mapping of the old one.
+
+    Args:
+        path (str): Destination path
+        magic (bytes): Eight-byte file type and version tag
+        columns (Dict[str, np.ndarray]): Column name to C-ordered array
+        attrs (Dict, optional): JSON-serializable table metadata
+    """
+    layout, offset = {}, 0
+    arrays = {}
+    for name, array in columns.items():
+        array = np.ascontiguousarray(array)
+        arrays[name] = array
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset = _aligned(offset + array.nbytes)
+
+    header = json.dumps({"columns": layout, "attrs": attrs or {}}, sort_keys=True).encode('utf-8')
+    data_start = _aligned(PREAMBLE_DTYPE.itemsize + len(header))
+    preamble = np.array([(magic, data_start)], dtype=PREAMBLE_DTYPE)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, 'wb') as table_file:
+        table_file.write(preamble.tobytes())
+        table_file.write(header)
+        for name, array in arrays.items():
+            table_file.seek(data_start + layout[name]["offset"])
+            table_file.write(array.tobytes())
+        table_file.truncate(data_start + offset)
+    os.replace(temporary_path, path)
+
+
+def read_table(path: str, magic: bytes) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """
+    Memory-map a table written by ``write_table``.
+
+    Args:
+        path (str): Table path
+        magic (bytes): Expected file type and version tag
+
+    Returns:
+        Tuple of (column name to read-only ``np.memmap``, attrs)
+
+    Raises:
+        ValueError: If the file is not a table of the expected type
+    """
+    with open(path, 'rb') as table_file:
+        preamble = np.frombuffer(table_file.read(PREAMBLE_DTYPE.itemsize), dtype=PREAMBLE_DTYPE)
+        if len(preamble) != 1 or preamble['magic'][0] != magic:
+            raise ValueError(f"{path} is not a {magic.decode('ascii', 'replace')} table")
+        data_start = int(preamble['data_offset'][0])
+        header = json.loads(table_file.read(data_start - PREAMBLE_DTYPE.itemsize).rstrip(b'\0'))
+
+    columns = {}
+    for name, column in header["columns"].items():
+        shape = tuple(column["shape"])
+        if not np.prod(shape):  # mmap cannot map zero bytes
+            columns[name] = np.empty(shape, dtype=np.dtype(column["dtype"]))
+            continue
+        columns[name] = np.memmap(
+            path, dtype=np.dtype(column["dtype"]), mode='r', offset=data_start + column["offset"], shape=shape
+        )
+    return columns, header["attrs"]
@@ -0,0 +1,228 @@
+import re
+import json
+import time
+import logging
+import threading
+import datetime
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional
+from werkzeug.wrappers import Response
+
+logger = logging.getLogger(__name__)
+
+DEADLINE_HEADER = 'X-Request-Deadline'
+TIMEOUT_HEADER = 'X-Request-Timeout'
+
+# Relative timeouts: seconds, optionally with an s or ms unit, e.g. 10, 9.5s, 800ms
+TIMEOUT_VALUE = re.compile(r'^(\d+(?:\.\d+)?)\s*(ms|s)?$')
+
+
+class DeadlineExceeded(TimeoutError):
+    """The request's deadline passed before its work finished."""
+
+
+class _DeadlineState(threading.local):
+    # time.monotonic() by which the request on this thread must be answered
+    deadline = None
+
+
+_deadlines = _DeadlineState()
+
+
+def parse_deadline(deadline: Optional[str], timeout: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Deadline of a request from its headers, as a ``time.monotonic()`` value.
+
+    ``X-Request-Deadline`` is an absolute time, as Unix seconds or an
+    ISO 8601 timestamp with a time zone; it assumes clocks roughly in
+    sync. ``X-Request-Timeout`` is relative to arrival, in seconds or with
+    an ``s``/``ms`` unit. With both, the earlier one wins.
+
+    Args:
+        deadline (str, optional): ``X-Request-Deadline`` value
+        timeout (str, optional): ``X-Request-Timeout`` value
+        now (float, optional): ``time.monotonic()`` at arrival
+
+    Returns:
+        float, or None if neither header is set
+
+    Raises:
+        ValueError: If a header is malformed
+    """
+    now = time.monotonic() if now is None else now
+    candidates = []
+
+    if timeout is not None and timeout.strip():
+        match = TIMEOUT_VALUE.match(timeout.strip().lower())
+        if not match:
+            raise ValueError(f"{TIMEOUT_HEADER} must be seconds, e.g. 10, 9.5s or 800ms")
+        seconds = float(match.group(1)) / (1000.0 if match.group(2) == 'ms' else 1.0)
+        candidates.append(now + seconds)
+
+    if deadline is not None and deadline.strip():
+        value = deadline.strip()
+        try:
+            epoch = float(value)
+        except ValueError:
+            try:
+                parsed = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+            except ValueError:
+                raise ValueError(f"{DEADLINE_HEADER} must be Unix seconds or an ISO 8601 timestamp")
+            if parsed.tzinfo is None:
+                raise ValueError(f"{DEADLINE_HEADER} needs a time zone, e.g. 2026-05-15T10:30:00Z")
+            epoch = parsed.timestamp()
+        candidates.append(now + (epoch - time.time()))
+
+    return min(candidates) if candidates else None
+
+
+def remaining() -> Optional[float]:
+    """
+    Seconds left before the current request's deadline.
+
+    Returns:
+        float (negative once passed), or None without a deadline
+    """
+    deadline = _deadlines.deadline
+    return deadline - time.monotonic() if deadline is not None else None
+
+
+def has_time_for(seconds: float) -> bool:
+    """
+    Whether optional work of about ``seconds`` still fits before the deadline.
+
+    Args:
+        seconds (float): Time the work and answering would take
+
+    Returns:
+        bool: True without a deadline
+    """
+    left = remaining()
+    return left is None or left > seconds
+
+
+def check_deadline(step: str):
+    """
+    Stop the current request if its deadline has passed.
+
+    Args:
+        step (str): Work about to start, for the error message
+
+    Raises:
+        DeadlineExceeded: If the deadline has passed
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded(f"Deadline passed {-left * 1000:.0f} ms before {step}")
+
+
+def wait_timeout(timeout: float) -> float:
+    """
+    How long to wait for work done elsewhere: ``timeout`` or the time left.
+
+    Args:
+        timeout (float): Usual wait limit in seconds
+
+    Returns:
+        float: Seconds to wait
+
+    Raises:
+        DeadlineExceeded: If the deadline has already passed
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise DeadlineExceeded(f"Deadline passed {-left * 1000:.0f} ms ago")
+    return min(timeout, left)
+
+
+def deadline_bound() -> bool:
+    """
+    Whether a wait that just timed out was cut short by the deadline.
+
+    Returns:
+        bool
+    """
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def wait_result(future: Future, timeout: float, cancel: bool = False) -> Any:
+    """
+    Result of work done on another thread, given up at the deadline.
+
+    Args:
+        future (Future): Pending result
+        timeout (float): Usual wait limit in seconds
+        cancel (bool): Cancel the work if the deadline cuts the wait short
+            and it has not started; only for futures no one else waits on
+
+    Returns:
+        The future's result
+
+    Raises:
+        DeadlineExceeded: If the deadline passes first
+        concurrent.futures.TimeoutError: If ``timeout`` passes first
+    """
+    try:
+        return future.result(timeout=wait_timeout(timeout))
+    except FutureTimeoutError:
+        if not deadline_bound():
+            raise
+        if cancel:
+            future.cancel()
+        raise DeadlineExceeded("Deadline passed while waiting for a result")
+
+
+def _error(status: str, body: Dict[str, Any]) -> Response:
+    return Response(json.dumps(body), status=status, mimetype='application/json')
+
+
+class DeadlineMiddleware:
+    """
+    Give each request the deadline its client sent, and refuse late ones.
+
+    Requests whose ``X-Request-Deadline`` or ``X-Request-Timeout`` has
+    already passed on arrival are answered ``504`` before any parsing or
+    computation; malformed headers get ``400``. Without either header the
+    request gets ``default_timeout`` seconds, or no deadline when that is
+    0. While the request runs, ``remaining``, ``has_time_for``,
+    ``check_deadline`` and ``wait_timeout`` read the deadline on the
+    serving thread, so service calls stop waiting when the client has
+    given up.
+    """
+
+    def __init__(self, app: Callable, default_timeout: float = 0.0):
+        """
+        Args:
+            app (Callable): WSGI application
+            default_timeout (float): Seconds allowed to requests without a
+                deadline header; 0 for none
+        """
+        self.app = app
+        self.default_timeout = default_timeout
+
+    def __call__(self, environ: Dict[str, Any], start_response: Callable):
+        now = time.monotonic()
+        try:
+            deadline = parse_deadline(environ.get('HTTP_X_REQUEST_DEADLINE'), environ.get('HTTP_X_REQUEST_TIMEOUT'), now)
+        except ValueError as e:
+            field = DEADLINE_HEADER if DEADLINE_HEADER in str(e) else TIMEOUT_HEADER
+            return _error('400 BAD REQUEST', {
+                "error": "Invalid input", "details": str(e), "fields": [{"field": field, "message": str(e)}]
+            })(environ, start_response)
+
+        if deadline is None and self.default_timeout > 0:
+            deadline = now + self.default_timeout
+        if deadline is not None and deadline <= now:
+            logger.info(f"Rejected {environ.get('PATH_INFO')}: deadline passed {(now - deadline) * 1000:.0f} ms before arrival")
+            return _error('504 GATEWAY TIMEOUT', {
+                "error": "Deadline exceeded", "details": "The request's deadline passed before it arrived"
+            })(environ, start_response)
+
+        _deadlines.deadline = deadline
+        try:
+            return self.app(environ, start_response)
+        finally:
+            _deadlines.deadline = None
@@ -0,0 +1,203 @@
+import gc
+import os
+import sys
+import uuid
+import datetime
+import resource
+import threading
+import tracemalloc
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+# Snapshots kept per worker for diffs; each holds every traced allocation site
+MAX_SNAPSHOTS = 4
+
+# Allocations of the introspection itself are left out of snapshots
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, '<unknown>')
+)
+
+
+def _rss() -> Dict[str, Optional[int]]:
+    """Current and peak resident set size of this process, in bytes."""
+    usage = {"rss_bytes": None, "peak_rss_bytes": None}
+    try:
+        with open('/proc/self/status', encoding='ascii') as status_file:
+            for line in status_file:
+                key, _, value = line.partition(':')
+                if key in ('VmRSS', 'VmHWM'):
+                    usage["rss_bytes" if key == 'VmRSS' else "peak_rss_bytes"] = int(value.split()[0]) * 1024
+    except OSError:  # not Linux: only the peak is available
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        usage["peak_rss_bytes"] = peak if sys.platform == 'darwin' else peak * 1024
+    return usage
+
+
+def _module_names() -> Dict[str, str]:
+    """Source file to module name for every loaded module."""
+    names = {}
+    for name, module in list(sys.modules.items()):
+        filename = getattr(module, '__file__', None)
+        if filename:
+            names[filename] = name
+            names[os.path.abspath(filename)] = name
+    return names
+
+
+def _group_by_module(statistics, attributes: Tuple[str, str]) -> Dict[str, List[int]]:
+    """Sum per-file tracemalloc statistics into {module: [size, count]}."""
+    names = _module_names()
+    size_attribute, count_attribute = attributes
+    grouped: Dict[str, List[int]] = {}
+    for statistic in statistics:
+        filename = statistic.traceback[0].filename
+        module = names.get(filename) or names.get(os.path.abspath(filename)) or filename
+        totals = grouped.setdefault(module, [0, 0])
+        totals[0] += getattr(statistic, size_attribute)
+        totals[1] += getattr(statistic, count_attribute)
+    return grouped
+
+
+def _top(grouped: Dict[str, List[int]], prefix: str, limit: int, keys: Tuple[str, str]) -> List[Dict[str, Any]]:
+    rows = [(module, totals) for module, totals in grouped.items() if module.startswith(prefix)]
+    rows.sort(key=lambda row: abs(row[1][0]), reverse=True)
+    return [{"module": module, keys[0]: totals[0], keys[1]: totals[1]} for module, totals in rows[:limit]]
+
+
+class MemoryInspector:
+    """
+    Per-process memory introspection for the admin endpoints.
+
+    Every gunicorn worker answers for itself (``pid`` in every report).
+    ``tracemalloc`` is off by default since it slows allocation; it can be
+    started and stopped at runtime, and snapshots taken while it runs are
+    kept in memory (at most ``MAX_SNAPSHOTS``) for diffs.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshots: 'OrderedDict[str, Tuple[str, tracemalloc.Snapshot]]' = OrderedDict()
+
+    def report(self, prefix: str = '', limit: int = 20) -> Dict[str, Any]:
+        """
+        RSS, garbage collector state and the top allocating modules.
+
+        Args:
+            prefix (str): Only modules starting with this, e.g. ``backend.``
+            limit (int): Number of modules listed
+
+        Returns:
+            Dict with pid, rss, gc and tracemalloc sections
+        """
+        tracing = tracemalloc.is_tracing()
+        memory = {
+            "pid": os.getpid(),
+            **_rss(),
+            "gc": {
+                "counts": list(gc.get_count()),
+                "thresholds": list(gc.get_threshold()),
+                "frozen_objects": gc.get_freeze_count(),
+                "generations": gc.get_stats()
+            },
+            "tracemalloc": {"tracing": tracing}
+        }
+        if tracing:
+            traced, peak = tracemalloc.get_traced_memory()
+            statistics = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS).statistics('filename')
+            memory["tracemalloc"].update({
+                "frames": tracemalloc.get_traceback_limit(),
+                "traced_bytes": traced,
+                "peak_traced_bytes": peak,
+                "overhead_bytes": tracemalloc.get_tracemalloc_memory(),
+                "top_modules": _top(_group_by_module(statistics, ("size", "count")), prefix, limit, ("bytes", "blocks"))
+            })
+        with self._lock:
+            memory["snapshots"] = [
+                {"id": snapshot_id, "taken_at": taken_at} for snapshot_id, (taken_at, _) in self._snapshots.items()
+            ]
+        return memory
+
+    def set_tracing(self, enabled: bool, frames: int = 1) -> Dict[str, Any]:
+        """
+        Start or stop ``tracemalloc`` in this worker.
+
+        Stopping also drops the stored snapshots, which cannot be compared
+        with allocations traced later.
+
+        Args:
+            enabled (bool): Whether to trace allocations
+            frames (int): Frames stored per allocation
+
+        Returns:
+            Dict with the new tracing state
+        """
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        elif not enabled and tracemalloc.is_tracing():
+            tracemalloc.stop()
+            with self._lock:
+                self._snapshots.clear()
+        return {"pid": os.getpid(), "tracing": tracemalloc.is_tracing(), "frames": tracemalloc.get_traceback_limit()}
+
+    def take_snapshot(self) -> Dict[str, Any]:
+        """
+        Store a snapshot of traced allocations for later diffs.
+
+        Returns:
+            Dict with the snapshot id and traced bytes
+
+        Raises:
+            RuntimeError: If tracemalloc is not tracing
+        """
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not tracing; enable it first")
+
+        snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+        snapshot_id = uuid.uuid4().hex[:12]
+        taken_at = datetime.datetime.utcnow().isoformat(timespec='seconds') + 'Z'
+        with self._lock:
+            self._snapshots[snapshot_id] = (taken_at, snapshot)
+            while len(self._snapshots) > MAX_SNAPSHOTS:
+                self._snapshots.popitem(last=False)
+        return {"pid": os.getpid(), "id": snapshot_id, "taken_at": taken_at, "traced_bytes": tracemalloc.get_traced_memory()[0]}
+
+    def diff(self, from_id: str, to_id: Optional[str] = None, prefix: str = '', limit: int = 20) -> Dict[str, Any]:
+        """
+        Allocation growth per module between two snapshots.
+
+        Args:
+            from_id (str): Earlier snapshot
+            to_id (str, optional): Later snapshot; a fresh one if omitted
+            prefix (str): Only modules starting with this
+            limit (int): Number of modules listed
+
+        Returns:
+            Dict with total and per-module byte and block differences,
+                largest changes first
+
+        Raises:
+            KeyError: If a snapshot id is unknown in this worker
+            RuntimeError: If ``to_id`` is omitted and tracemalloc is off
+        """
+        with self._lock:
+            first = self._snapshots[from_id][1]
+            second = self._snapshots[to_id][1] if to_id else None
+        if second is None:
+            if not tracemalloc.is_tracing():
+                raise RuntimeError("tracemalloc is not tracing; enable it first")
+            second = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+
+        statistics = second.compare_to(first, 'filename')
+        grouped = _group_by_module(statistics, ("size_diff", "count_diff"))
+        return {
+            "pid": os.getpid(),
+            "from": from_id,
+            "to": to_id or "now",
+            "total_bytes_diff": sum(totals[0] for totals in grouped.values()),
+            "modules": _top(grouped, prefix, limit, ("bytes_diff", "blocks_diff"))
+        }
+
+
+memory_inspector = MemoryInspector()
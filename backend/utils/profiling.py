@@ -0,0 +1,247 @@
+import os
+import re
+import sys
+import json
+import time
+import uuid
+import random
+import logging
+import datetime
+import threading
+from typing import Any, Callable, Dict, List, Optional
+from backend.utils.admin import is_admin_token
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ID = re.compile(r'^\d{8}T\d{12}-[0-9a-f]{8}$')
+
+_profiling = threading.local()
+
+
+def profiling_active() -> bool:
+    """
+    Whether the current thread is running under a ``StackProfiler``.
+
+    Schedulers check this to run a profiled request's work inline instead
+    of on a batching thread the profiler cannot see.
+
+    Returns:
+        bool
+    """
+    return getattr(_profiling, 'active', False)
+
+
+class StackProfiler:
+    """
+    Deterministic profiler producing collapsed stacks.
+
+    ``sys.setprofile`` reports every Python and C call and return on the
+    calling thread only; elapsed time between events is charged to the
+    innermost frame of a call tree keyed by ``module.function``. Work
+    handed to other threads shows up as time spent waiting on it, so the
+    chart schedulers compute inline while ``profiling_active()``.
+    """
+
+    def __init__(self):
+        self.root: List[Any] = [0, {}]  # [self nanoseconds, children by label]
+        self._stack: List[List[Any]] = [self.root]
+        self._last = 0
+
+    def _event(self, frame, event: str, arg: Any):
+        now = time.perf_counter_ns()
+        stack = self._stack
+        stack[-1][0] += now - self._last
+        if event == 'call':
+            code = frame.f_code
+            label = f"{frame.f_globals.get('__name__', '?')}.{getattr(code, 'co_qualname', code.co_name)}"
+            stack.append(stack[-1][1].setdefault(label, [0, {}]))
+        elif event == 'c_call':
+            label = f"{getattr(arg, '__module__', None) or 'builtins'}.{getattr(arg, '__qualname__', repr(arg))}"
+            stack.append(stack[-1][1].setdefault(label, [0, {}]))
+        elif len(stack) > 1:  # return, c_return, c_exception
+            stack.pop()
+        self._last = time.perf_counter_ns()
+
+    def run(self, function: Callable[..., Any], *args) -> Any:
+        """
+        Call ``function(*args)`` under the profiler.
+
+        Args:
+            function (Callable): Function to profile
+            *args: Its arguments
+
+        Returns:
+            Whatever ``function`` returns
+        """
+        _profiling.active = True
+        self._last = time.perf_counter_ns()
+        sys.setprofile(self._event)
+        try:
+            return function(*args)
+        finally:
+            sys.setprofile(None)
+            _profiling.active = False
+
+    def collapsed(self) -> str:
+        """
+        The call tree in collapsed-stack format.
+
+        Returns:
+            str: One ``frame;frame;frame microseconds`` line per stack with
+                self time, ready for flamegraph.pl or speedscope
+        """
+        lines = []
+        pending = [((), self.root)]
+        while pending:
+            path, (nanoseconds, children) = pending.pop()
+            if path and nanoseconds >= 1000:
+                lines.append(f"{';'.join(path)} {nanoseconds // 1000}")
+            pending.extend((path + (label,), child) for label, child in children.items())
+        return '\n'.join(sorted(lines)) + '\n'
+
+
+class ProfileStore:
+    """
+    Rotating directory of collapsed-stack profiles.
+
+    Each profile is a ``<id>.collapsed`` file plus a ``<id>.json`` sidecar
+    with request metadata, written atomically. Ids start with a UTC
+    timestamp, so name order is age order and only the newest
+    ``max_profiles`` are kept.
+    """
+
+    def __init__(self, directory: str, max_profiles: int = 100):
+        self.directory = directory
+        self.max_profiles = max_profiles
+
+    @staticmethod
+    def new_id() -> str:
+        return f"{datetime.datetime.utcnow():%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}"
+
+    def _write(self, path: str, text: str):
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, 'w', encoding='utf-8') as profile_file:
+            profile_file.write(text)
+        os.replace(temporary_path, path)
+
+    def save(self, profile_id: str, metadata: Dict[str, Any], collapsed: str):
+        """
+        Store a profile and drop the oldest ones beyond ``max_profiles``.
+
+        Args:
+            profile_id (str): Id from ``new_id``
+            metadata (Dict): Request metadata for the listing
+            collapsed (str): Collapsed stacks
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, profile_id)
+        self._write(base + '.collapsed', collapsed)
+        self._write(base + '.json', json.dumps(dict(metadata, id=profile_id, bytes=len(collapsed))))
+
+        stale_ids = self._ids()[:-self.max_profiles] if self.max_profiles > 0 else []
+        for stale_id in stale_ids:
+            for extension in ('.json', '.collapsed'):
+                try:
+                    os.remove(os.path.join(self.directory, stale_id + extension))
+                except FileNotFoundError:  # another worker rotated it first
+                    pass
+
+    def _ids(self) -> List[str]:
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(name[:-5] for name in names if name.endswith('.json') and PROFILE_ID.match(name[:-5]))
+
+    def list(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Metadata of the most recent profiles, newest first.
+
+        Args:
+            limit (int): Maximum number of profiles
+
+        Returns:
+            List of metadata dicts
+        """
+        profiles = []
+        for profile_id in reversed(self._ids()[-limit:] if limit > 0 else []):
+            try:
+                with open(os.path.join(self.directory, profile_id + '.json'), encoding='utf-8') as metadata_file:
+                    profiles.append(json.load(metadata_file))
+            except (OSError, ValueError):  # rotated away while listing
+                continue
+        return profiles
+
+    def read(self, profile_id: str) -> Optional[str]:
+        """
+        Collapsed stacks of one profile.
+
+        Args:
+            profile_id (str): Profile id
+
+        Returns:
+            str, or None if there is no such profile
+        """
+        if not PROFILE_ID.match(profile_id):
+            return None
+        try:
+            with open(os.path.join(self.directory, profile_id + '.collapsed'), encoding='utf-8') as profile_file:
+                return profile_file.read()
+        except FileNotFoundError:
+            return None
+
+
+class ProfilingMiddleware:
+    """
+    Profile selected requests and store their collapsed stacks.
+
+    A request is profiled when it carries an ``X-Profile`` header together
+    with a valid ``X-Admin-Token``, or when it falls in the random
+    ``sample_rate`` fraction. Profiled responses carry ``X-Profile-Id``.
+    Only the WSGI call is profiled, not the iteration of streamed bodies.
+    Install the middleware only when profiling is enabled, so unprofiled
+    deployments pay nothing at all.
+    """
+
+    def __init__(self, app: Callable, store: ProfileStore, sample_rate: float = 0.0):
+        self.app = app
+        self.store = store
+        self.sample_rate = sample_rate
+
+    def _trigger(self, environ: Dict[str, Any]) -> Optional[str]:
+        if 'HTTP_X_PROFILE' in environ and is_admin_token(environ.get('HTTP_X_ADMIN_TOKEN')):
+            return 'header'
+        if self.sample_rate and random.random() < self.sample_rate:
+            return 'sample'
+        return None
+
+    def __call__(self, environ: Dict[str, Any], start_response: Callable):
+        trigger = self._trigger(environ)
+        if trigger is None:
+            return self.app(environ, start_response)
+
+        profile_id = self.store.new_id()
+        statuses = []
+
+        def start_profiled_response(status, headers, exc_info=None):
+            statuses.append(status)
+            headers.append(('X-Profile-Id', profile_id))
+            return start_response(status, headers, exc_info)
+
+        profiler = StackProfiler()
+        started = time.perf_counter()
+        try:
+            return profiler.run(self.app, environ, start_profiled_response)
+        finally:
+            metadata = {
+                "created_at": datetime.datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+                "method": environ.get('REQUEST_METHOD'),
+                "path": environ.get('SCRIPT_NAME', '') + environ.get('PATH_INFO', ''),
+                "status": int(statuses[0].split()[0]) if statuses else None,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+                "trigger": trigger
+            }
+            try:
+                self.store.save(profile_id, metadata, profiler.collapsed())
+            except OSError as e:
+                logger.warning(f"Could not store profile {profile_id}: {e}")
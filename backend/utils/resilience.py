@@ -0,0 +1,260 @@
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Executor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# Calls kept in the rolling window at most, whatever its duration
+MAX_WINDOW_CALLS = 1000
+
+
+class CircuitOpenError(RuntimeError):
+    """The circuit breaker is refusing calls to a failing dependency."""
+
+
+def _percentile(sorted_values, fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class CircuitBreaker:
+    """
+    Stop calling a dependency that keeps failing or slowing down.
+
+    Calls are recorded in a rolling window of ``window`` seconds. Once it
+    holds ``min_calls`` calls and the share of failures reaches
+    ``failure_rate``, or the share of calls slower than ``slow_call``
+    seconds reaches ``slow_call_rate``, the circuit opens: calls fail at
+    once with ``CircuitOpenError`` for ``open_seconds``. Then it is half
+    open and lets ``half_open_calls`` trial calls through; if they all
+    succeed in time it closes with an empty window, and any failure opens
+    it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: float = 60.0,
+        min_calls: int = 10,
+        failure_rate: float = 0.5,
+        slow_call: float = 10.0,
+        slow_call_rate: float = 0.5,
+        open_seconds: float = 30.0,
+        half_open_calls: int = 1
+    ):
+        """
+        Args:
+            name (str): Dependency name, for logs and stats
+            window (float): Rolling window length in seconds
+            min_calls (int): Calls in the window before it can trip
+            failure_rate (float): Share of failed calls that opens the circuit
+            slow_call (float): Seconds after which a successful call counts as slow
+            slow_call_rate (float): Share of slow calls that opens the circuit
+            open_seconds (float): Seconds to refuse calls once open
+            half_open_calls (int): Trial calls that must succeed to close again
+        """
+        self.name = name
+        self.window = window
+        self.min_calls = max(1, min_calls)
+        self.failure_rate = failure_rate
+        self.slow_call = slow_call
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_calls = max(1, half_open_calls)
+
+        self._lock = threading.Lock()
+        self._calls = deque(maxlen=MAX_WINDOW_CALLS)  # (finished, failed, seconds)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trials = 0
+        self._trial_successes = 0
+        self._counters = {"opened": 0, "rejected": 0}
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._advance(time.monotonic())
+            return self._state
+
+    def _advance(self, now: float):
+        if self._state == OPEN and now - self._opened_at >= self.open_seconds:
+            self._state, self._trials, self._trial_successes = HALF_OPEN, 0, 0
+
+    def _prune(self, now: float):
+        while self._calls and now - self._calls[0][0] > self.window:
+            self._calls.popleft()
+
+    def _open(self, now: float, reason: str):
+        self._state, self._opened_at = OPEN, now
+        self._counters["opened"] += 1
+        logger.warning(f"{self.name}: circuit open for {self.open_seconds:g}s ({reason})")
+
+    def allow(self):
+        """
+        Take permission for one call.
+
+        Raises:
+            CircuitOpenError: While open, or while half open with every
+                trial call already taken
+        """
+        with self._lock:
+            self._advance(time.monotonic())
+            if self._state == CLOSED:
+                return
+            if self._state == HALF_OPEN and self._trials < self.half_open_calls:
+                self._trials += 1
+                return
+            self._counters["rejected"] += 1
+            retry_in = max(0.0, self.open_seconds - (time.monotonic() - self._opened_at))
+        raise CircuitOpenError(f"{self.name} is unavailable; retrying in {retry_in:.0f}s")
+
+    def record(self, seconds: float, failed: bool):
+        """
+        Record the outcome of an allowed call.
+
+        Args:
+            seconds (float): Call duration
+            failed (bool): Whether the call raised
+        """
+        now = time.monotonic()
+        slow = seconds > self.slow_call
+        with self._lock:
+            if self._state == HALF_OPEN:
+                if failed or slow:
+                    self._open(now, "trial call failed" if failed else f"trial call took {seconds:.1f}s")
+                    return
+                self._trial_successes += 1
+                if self._trial_successes >= self.half_open_calls:
+                    self._state = CLOSED
+                    self._calls.clear()
+                    logger.info(f"{self.name}: circuit closed")
+                return
+            if self._state == OPEN:
+                return  # a call allowed before the circuit opened
+
+            self._calls.append((now, failed, seconds))
+            self._prune(now)
+            calls = len(self._calls)
+            if calls < self.min_calls:
+                return
+            failures = sum(1 for _, call_failed, _ in self._calls if call_failed)
+            slow_calls = sum(1 for _, call_failed, duration in self._calls if not call_failed and duration > self.slow_call)
+            if failures / calls >= self.failure_rate:
+                self._open(now, f"{failures}/{calls} calls failed")
+            elif slow_calls / calls >= self.slow_call_rate:
+                self._open(now, f"{slow_calls}/{calls} calls slower than {self.slow_call:g}s")
+
+    def call(self, function: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run ``function`` through the breaker, recording its outcome.
+
+        Args:
+            function (Callable): Call to the dependency
+            *args: Positional arguments for ``function``
+            **kwargs: Keyword arguments for ``function``
+
+        Returns:
+            The call's result
+
+        Raises:
+            CircuitOpenError: If the circuit refuses the call
+            Exception: Whatever ``function`` raised
+        """
+        self.allow()
+        started = time.perf_counter()
+        try:
+            result = function(*args, **kwargs)
+        except Exception:
+            self.record(time.perf_counter() - started, failed=True)
+            raise
+        self.record(time.perf_counter() - started, failed=False)
+        return result
+
+    def latency_percentile(self, fraction: float) -> Optional[float]:
+        """
+        Latency percentile of successful calls in the window.
+
+        Args:
+            fraction (float): Percentile as a fraction, e.g. 0.95
+
+        Returns:
+            float seconds, or None with fewer than ``min_calls`` successes
+        """
+        with self._lock:
+            self._prune(time.monotonic())
+            latencies = sorted(seconds for _, failed, seconds in self._calls if not failed)
+        if len(latencies) < self.min_calls:
+            return None
+        return _percentile(latencies, fraction)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        State and rolling-window figures.
+
+        Returns:
+            Dict with state, calls, failure and slow-call rates, latency
+                percentiles in milliseconds, and opened/rejected counts
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._advance(now)
+            self._prune(now)
+            calls = list(self._calls)
+            state, counters = self._state, dict(self._counters)
+        latencies = sorted(seconds for _, failed, seconds in calls if not failed)
+        failures = sum(1 for _, failed, _ in calls if failed)
+        return dict(
+            counters,
+            state=state,
+            window_calls=len(calls),
+            failure_rate=round(failures / len(calls), 3) if calls else 0.0,
+            slow_call_rate=round(sum(1 for seconds in latencies if seconds > self.slow_call) / len(calls), 3) if calls else 0.0,
+            latency_ms={
+                "p50": round(_percentile(latencies, 0.50) * 1000, 1) if latencies else None,
+                "p95": round(_percentile(latencies, 0.95) * 1000, 1) if latencies else None
+            }
+        )
+
+
+def hedged_call(function: Callable[[], Any], delay: float, executor: Executor) -> Tuple[Any, int, int]:
+    """
+    Call ``function``, and call it again if the first attempt is slow.
+
+    The second attempt starts after ``delay`` seconds if the first has not
+    finished; whichever succeeds first wins. The other attempt is not
+    interrupted, its result is discarded. A first attempt that fails
+    before ``delay`` is not retried.
+
+    Args:
+        function (Callable): Idempotent call
+        delay (float): Seconds to wait before hedging
+        executor (Executor): Runs both attempts
+
+    Returns:
+        Tuple of (result, attempts started, index of the winning attempt)
+
+    Raises:
+        Exception: The error of the last attempt to fail, if both fail
+    """
+    first = executor.submit(function)
+    done, _ = wait([first], timeout=delay)
+    if done:
+        return first.result(), 1, 0
+
+    attempts = [first, executor.submit(function)]
+    pending = set(attempts)
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result(), 2, attempts.index(future)
+            error = future.exception()
+    raise error
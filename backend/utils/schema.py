@@ -0,0 +1,236 @@
+from collections import namedtuple
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from flask import request, jsonify
+from backend.utils.validators import ValidationError
+from backend.utils.serialization import decode_body
+from backend.utils.tracing import span
+
+# Marks a field without a default value
+REQUIRED = object()
+
+
+class SchemaError(ValidationError):
+    """Validation failure carrying one entry per offending field."""
+
+    def __init__(self, errors: List[Dict[str, str]]):
+        self.errors = errors
+        super().__init__("; ".join(f"{error['field']}: {error['message']}" for error in errors))
+
+
+class Field(NamedTuple):
+    """
+    A payload field.
+
+    ``parser`` maps the raw JSON value to its normalized form and raises
+    ``ValidationError`` (or ``SchemaError`` for nested objects) when it is
+    invalid. Missing and null values take ``default``; fields without a
+    default are required.
+    """
+    name: str
+    parser: Callable[[Any], Any]
+    default: Any = REQUIRED
+
+
+class Schema:
+    """
+    A compiled request schema.
+
+    Parsing walks the payload once, normalizes every field into an
+    immutable named tuple and collects every error rather than stopping at
+    the first one. Unknown keys are ignored.
+    """
+
+    def __init__(self, name: str, fields: Sequence[Field], check: Optional[Callable[[Any], None]] = None):
+        """
+        Args:
+            name (str): Name of the parsed type, e.g. ``HumanDesignRequest``
+            fields (Sequence[Field]): Payload fields
+            check (Callable, optional): Cross-field rule run on the parsed
+                object; raises ``ValidationError``
+        """
+        self.name = name
+        self.type = namedtuple(name, [field.name for field in fields])
+        self.check = check
+        # Hot loop state: plain tuples, and nested schemas bound to their parse method
+        self._fields: Tuple[Tuple[str, Callable, Any, bool], ...] = tuple(
+            (field.name, field.parser.parse if isinstance(field.parser, Schema) else field.parser,
+             field.default, isinstance(field.parser, Schema))
+            for field in fields
+        )
+
+    def parse(self, data: Any, path: str = '') -> Any:
+        """
+        Parse and normalize a JSON object.
+
+        Args:
+            data (Any): Decoded JSON payload
+            path (str): Prefix for field names in errors, for nested objects
+
+        Returns:
+            Instance of ``self.type``
+
+        Raises:
+            SchemaError: If the payload or any field is invalid
+        """
+        if not isinstance(data, dict):
+            raise SchemaError([{"field": path.rstrip('.') or "body", "message": "must be a JSON object"}])
+
+        values, errors = [], []
+        for name, parser, default, nested in self._fields:
+            value = data.get(name)
+            if value is None:
+                if default is REQUIRED:
+                    errors.append({"field": path + name, "message": "is required"})
+                values.append(None if default is REQUIRED else default)
+                continue
+            try:
+                values.append(parser(value, f"{path}{name}.") if nested else parser(value))
+            except SchemaError as e:
+                errors.extend(e.errors)
+                values.append(None)
+            except ValidationError as e:
+                errors.append({"field": path + name, "message": str(e)})
+                values.append(None)
+
+        if errors:
+            raise SchemaError(errors)
+
+        parsed = self.type._make(values)
+        if self.check is not None:
+            try:
+                self.check(parsed)
+            except SchemaError:
+                raise
+            except ValidationError as e:
+                raise SchemaError([{"field": path.rstrip('.') or "body", "message": str(e)}])
+        return parsed
+
+
+def integer(minimum: Optional[int] = None, maximum: Optional[int] = None) -> Callable[[Any], int]:
+    """
+    Parser for a bounded JSON integer.
+
+    Args:
+        minimum (int, optional): Smallest accepted value
+        maximum (int, optional): Largest accepted value
+
+    Returns:
+        Callable: Field parser
+    """
+    def parse(value: Any) -> int:
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise ValidationError("must be an integer")
+        if (minimum is not None and value < minimum) or (maximum is not None and value > maximum):
+            raise ValidationError(f"must be between {minimum} and {maximum}")
+        return value
+    return parse
+
+
+def number(value: Any) -> float:
+    """
+    Parser for a JSON number.
+
+    Args:
+        value (Any): Raw value
+
+    Returns:
+        float: Parsed value
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValidationError("must be a number")
+    return float(value)
+
+
+def boolean(value: Any) -> bool:
+    """
+    Parser for a JSON boolean.
+
+    Args:
+        value (Any): Raw value
+
+    Returns:
+        bool: Parsed value
+    """
+    if not isinstance(value, bool):
+        raise ValidationError("must be true or false")
+    return value
+
+
+def one_of(choices: Iterable[Any]) -> Callable[[Any], Any]:
+    """
+    Parser accepting only the given values.
+
+    Args:
+        choices (Iterable): Accepted values
+
+    Returns:
+        Callable: Field parser
+    """
+    accepted = frozenset(choices)
+    listing = ', '.join(str(choice) for choice in choices)
+
+    def parse(value: Any) -> Any:
+        try:
+            if value in accepted:
+                return value
+        except TypeError:  # unhashable JSON values
+            pass
+        raise ValidationError(f"must be one of {listing}")
+    return parse
+
+
+def list_of(parser: Callable[[Any], Any], max_items: int = 100) -> Callable[[Any], Tuple]:
+    """
+    Parser for a JSON array whose items all pass ``parser``.
+
+    Args:
+        parser (Callable): Item parser
+        max_items (int): Longest accepted array
+
+    Returns:
+        Callable: Field parser returning a tuple
+    """
+    def parse(value: Any) -> Tuple:
+        if not isinstance(value, list):
+            raise ValidationError("must be an array")
+        if len(value) > max_items:
+            raise ValidationError(f"must have at most {max_items} items")
+        items = []
+        for index, item in enumerate(value):
+            try:
+                items.append(parser(item))
+            except ValidationError as e:
+                raise ValidationError(f"item {index} {e}")
+        return tuple(items)
+    return parse
+
+
+def json_body(schema: Schema):
+    """
+    Decorate a route to receive its parsed payload as the first argument.
+
+    The body may be JSON, MessagePack or CBOR (by ``Content-Type``).
+    Malformed bodies or invalid fields are answered with a structured 400
+    before the route runs.
+
+    Args:
+        schema (Schema): Schema of the request body
+
+    Returns:
+        Callable: Route decorator
+    """
+    def decorator(route: Callable) -> Callable:
+        @wraps(route)
+        def wrapper(*args, **kwargs):
+            try:
+                with span("validate"):
+                    data = decode_body()
+                    if data is None and not request.get_data():
+                        data = {}
+                    payload = schema.parse(data)
+            except SchemaError as e:
+                return jsonify({"error": "Invalid input", "details": str(e), "fields": e.errors}), 400
+            return route(payload, *args, **kwargs)
+        return wrapper
+    return decorator
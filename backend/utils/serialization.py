@@ -0,0 +1,124 @@
+import logging
+from typing import Any, Optional, Tuple
+from flask import Response, has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import msgpack
+except ImportError:  # MessagePack is not offered without the package
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:  # CBOR is not offered without the package
+    cbor2 = None
+
+logger = logging.getLogger(__name__)
+
+JSON_TYPE = 'application/json'
+MSGPACK_TYPE = 'application/msgpack'
+CBOR_TYPE = 'application/cbor'
+
+# Media types clients send for each format, canonical type first
+FORMAT_MEDIA_TYPES = {
+    'msgpack': (MSGPACK_TYPE, 'application/x-msgpack', 'application/vnd.msgpack'),
+    'cbor': (CBOR_TYPE,)
+}
+MEDIA_TYPE_FORMATS = {media_type: name for name, types in FORMAT_MEDIA_TYPES.items() for media_type in types}
+
+
+def available_formats() -> Tuple[str, ...]:
+    """
+    Binary formats whose packages are installed.
+
+    Returns:
+        Tuple of format names, e.g. ``('msgpack', 'cbor')``
+    """
+    return tuple(name for name, module in (('msgpack', msgpack), ('cbor', cbor2)) if module is not None)
+
+
+def _offered_media_types() -> Tuple[str, ...]:
+    # JSON first: it wins whenever the client has no stronger preference
+    offered = [JSON_TYPE]
+    for name in available_formats():
+        offered.extend(FORMAT_MEDIA_TYPES[name])
+    return tuple(offered)
+
+
+def negotiate_format() -> str:
+    """
+    Response format for the current request from its ``Accept`` header.
+
+    Returns:
+        str: ``json``, ``msgpack`` or ``cbor``
+    """
+    if not request.accept_mimetypes:
+        return 'json'
+    best = request.accept_mimetypes.best_match(_offered_media_types(), default=JSON_TYPE)
+    return MEDIA_TYPE_FORMATS.get(best, 'json')
+
+
+def decode_body() -> Optional[Any]:
+    """
+    Request body decoded by its ``Content-Type``.
+
+    MessagePack and CBOR bodies are decoded with their packages; anything
+    else is read as JSON whatever its declared type, as before.
+
+    Returns:
+        Decoded body, or None if it is empty or malformed
+    """
+    body_format = MEDIA_TYPE_FORMATS.get(request.mimetype)
+    if body_format is None:
+        return request.get_json(force=True, silent=True)
+
+    data = request.get_data()
+    if not data:
+        return None
+    try:
+        if body_format == 'msgpack' and msgpack is not None:
+            return msgpack.unpackb(data, raw=False, strict_map_key=False)
+        if body_format == 'cbor' and cbor2 is not None:
+            return cbor2.loads(data)
+    except Exception as e:  # both packages raise assorted errors on corrupt input
+        logger.debug(f"Malformed {body_format} request body: {e}")
+    return None
+
+
+class NegotiatingJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that answers ``jsonify`` in the negotiated format.
+
+    Clients asking for ``application/msgpack`` or ``application/cbor`` in
+    ``Accept`` get the same data in that encoding; everyone else gets
+    JSON. Values JSON cannot encode natively (dates, decimals, UUIDs) are
+    converted the same way for every format. Responses vary on
+    ``Accept``.
+    """
+
+    def encode_binary(self, obj: Any, response_format: str) -> bytes:
+        """
+        Encode data as MessagePack or CBOR.
+
+        Args:
+            obj (Any): Data passed to ``jsonify``
+            response_format (str): ``msgpack`` or ``cbor``
+
+        Returns:
+            bytes
+        """
+        if response_format == 'msgpack':
+            return msgpack.packb(obj, default=self.default)
+        return cbor2.dumps(obj, default=lambda encoder, value: encoder.encode(self.default(value)))
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        response_format = negotiate_format() if has_request_context() else 'json'
+        if response_format == 'json':
+            response = super().response(*args, **kwargs)
+        else:
+            obj = self._prepare_response_obj(args, kwargs)
+            response = self._app.response_class(
+                self.encode_binary(obj, response_format), mimetype=FORMAT_MEDIA_TYPES[response_format][0]
+            )
+        response.vary.add('Accept')
+        return response
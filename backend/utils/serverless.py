@@ -0,0 +1,158 @@
+import io
+import sys
+import json
+import base64
+from urllib.parse import urlencode, unquote_to_bytes
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Content types returned as text; everything else is base64-encoded
+TEXT_CONTENT_TYPES = ('text/', 'application/json', 'application/javascript', 'application/xml', 'image/svg+xml')
+
+
+def _unwrap_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    # Vercel's legacy invoke payload wraps the request as a JSON string
+    if event.get('Action') == 'Invoke' and isinstance(event.get('body'), str):
+        return json.loads(event['body'])
+    return event
+
+
+def _query_string(event: Dict[str, Any], path: str) -> Tuple[str, str]:
+    if 'rawQueryString' in event:
+        return path, event['rawQueryString'] or ''
+    if '?' in path:
+        path, query = path.split('?', 1)
+        return path, query
+    if event.get('multiValueQueryStringParameters'):
+        return path, urlencode(event['multiValueQueryStringParameters'], doseq=True)
+    if event.get('queryStringParameters'):
+        return path, urlencode(event['queryStringParameters'])
+    return path, ''
+
+
+def _headers(event: Dict[str, Any]) -> Dict[str, str]:
+    headers = {name.lower(): value for name, value in (event.get('headers') or {}).items()}
+    for name, values in (event.get('multiValueHeaders') or {}).items():
+        headers.setdefault(name.lower(), ', '.join(values))
+    if event.get('cookies') and 'cookie' not in headers:
+        headers['cookie'] = '; '.join(event['cookies'])
+    return headers
+
+
+def event_to_environ(event: Dict[str, Any], script_name: str = '') -> Dict[str, Any]:
+    """
+    Translate a serverless HTTP event into a WSGI environ.
+
+    Understands API Gateway v1 (``httpMethod``/``path``), v2
+    (``requestContext.http``/``rawPath``) and Vercel's legacy invoke
+    payload (``method``/``path``/``encoding``).
+
+    Args:
+        event (Dict): Serverless event
+        script_name (str): Mount prefix moved from the path into
+            ``SCRIPT_NAME``, e.g. ``/api``
+
+    Returns:
+        Dict: WSGI environ
+    """
+    event = _unwrap_event(event)
+    http_context = (event.get('requestContext') or {}).get('http') or {}
+
+    method = event.get('httpMethod') or event.get('method') or http_context.get('method') or 'GET'
+    path, query = _query_string(event, event.get('rawPath') or event.get('path') or http_context.get('path') or '/')
+
+    body = event.get('body') or b''
+    if isinstance(body, str):
+        encoded = event.get('isBase64Encoded') or event.get('encoding') == 'base64'
+        body = base64.b64decode(body) if encoded else body.encode('utf-8')
+
+    mount = ''
+    if script_name and (path == script_name or path.startswith(script_name + '/')):
+        mount, path = script_name, path[len(script_name):] or '/'
+
+    headers = _headers(event)
+    host = headers.get('host', 'localhost')
+    scheme = headers.get('x-forwarded-proto', 'https')
+    remote_addr = (
+        headers.get('x-real-ip')
+        or headers.get('x-forwarded-for', '').split(',')[0].strip()
+        or http_context.get('sourceIp')
+        or ((event.get('requestContext') or {}).get('identity') or {}).get('sourceIp')
+        or '127.0.0.1'
+    )
+
+    environ = {
+        'REQUEST_METHOD': method.upper(),
+        'SCRIPT_NAME': mount,
+        # WSGI carries the percent-decoded path as latin-1 characters
+        'PATH_INFO': unquote_to_bytes(path).decode('latin-1'),
+        'QUERY_STRING': query,
+        'SERVER_NAME': host.split(':')[0],
+        'SERVER_PORT': host.split(':')[1] if ':' in host else ('443' if scheme == 'https' else '80'),
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'REMOTE_ADDR': remote_addr,
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scheme,
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': False,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False
+    }
+
+    for name, value in headers.items():
+        if name == 'content-type':
+            environ['CONTENT_TYPE'] = value
+        elif name != 'content-length':
+            environ['HTTP_' + name.upper().replace('-', '_')] = value
+
+    return environ
+
+
+def call_wsgi(app: Callable, environ: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run a WSGI application and shape its response as a serverless result.
+
+    The body iterable is joined once as bytes. Textual bodies are decoded
+    once for the ``body`` string; compressed or binary bodies are
+    base64-encoded instead.
+
+    Args:
+        app (Callable): WSGI application
+        environ (Dict): WSGI environ
+
+    Returns:
+        Dict with statusCode, headers, multiValueHeaders, body and isBase64Encoded
+    """
+    response_start = {}
+
+    def start_response(status: str, response_headers: List[Tuple[str, str]], exc_info: Optional[tuple] = None):
+        response_start['status'] = status
+        response_start['headers'] = response_headers
+        return lambda data: chunks.append(data)
+
+    chunks = []
+    iterable = app(environ, start_response)
+    try:
+        chunks.extend(iterable)
+    finally:
+        if hasattr(iterable, 'close'):
+            iterable.close()
+    body = b''.join(chunks)
+
+    headers = {}
+    multi_value_headers = {}
+    for name, value in response_start['headers']:
+        multi_value_headers.setdefault(name, []).append(value)
+        headers[name] = value if name not in headers else f"{headers[name]}, {value}"
+
+    content_type = headers.get('Content-Type', '')
+    is_text = content_type.startswith(TEXT_CONTENT_TYPES) and 'Content-Encoding' not in headers
+
+    return {
+        'statusCode': int(response_start['status'].split(' ', 1)[0]),
+        'headers': headers,
+        'multiValueHeaders': multi_value_headers,
+        'body': body.decode('utf-8') if is_text else base64.b64encode(body).decode('ascii'),
+        'isBase64Encoded': not is_text
+    }
@@ -0,0 +1,199 @@
+import os
+import json
+import time
+import fcntl
+import hashlib
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional
+from backend.utils.deadlines import DeadlineExceeded, deadline_bound, wait_result, wait_timeout
+
+logger = logging.getLogger(__name__)
+
+# How often a waiting process re-checks a lock held by another process
+LOCK_POLL_INTERVAL = 0.005
+
+# Keys hash onto a fixed set of lock/result files, so the directory stays bounded
+LOCK_STRIPES = 1024
+
+
+class SingleFlight:
+    """
+    Run at most one computation per key at a time and share its result.
+
+    The first caller for a key computes; callers arriving while it is in
+    flight wait on the same future and receive (a shallow copy of) the same
+    result. With ``cross_process`` enabled, the leading thread of each
+    process additionally takes an exclusive ``flock`` on the key's lock
+    file, so only one gunicorn worker computes and the others read its
+    result from a JSON file written before the lock is released. Keys share
+    ``LOCK_STRIPES`` lock files; a waiter that finds another key's result
+    simply computes its own. Results must then be JSON-serializable.
+    """
+
+    def __init__(
+        self,
+        name: str = "single-flight",
+        cross_process: bool = False,
+        directory: Optional[str] = None,
+        result_ttl: float = 5.0,
+        timeout: float = 30.0
+    ):
+        """
+        Args:
+            name (str): Name used in log messages and lock file names
+            cross_process (bool): Share computations between processes
+            directory (str, optional): Directory for lock and result files in
+                cross-process mode; preferably on tmpfs
+            result_ttl (float): Seconds a result file may be reused by
+                processes that waited on the lock
+            timeout (float): Maximum seconds to wait for another caller
+        """
+        self.name = name
+        self.cross_process = cross_process
+        self.directory = directory
+        self.result_ttl = result_ttl
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, Future] = {}
+        self._counters = {"computed": 0, "suppressed": 0, "shared_across_processes": 0}
+
+        if cross_process:
+            if not directory:
+                raise ValueError("cross_process mode needs a directory for lock files")
+            os.makedirs(directory, exist_ok=True)
+
+    def do(self, key: Hashable, function: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Compute ``function(*args, **kwargs)`` unless an identical call is in flight.
+
+        Args:
+            key (Hashable): Normalized inputs identifying the computation
+            function (Callable): Computation to run
+            *args: Positional arguments for ``function``
+            **kwargs: Keyword arguments for ``function``
+
+        Returns:
+            The computation's result
+
+        Raises:
+            Exception: Whatever the leading computation raised, re-raised in
+                every waiting caller; a waiter whose own deadline has not
+                passed computes for itself if the leader's did
+            DeadlineExceeded: If the request's deadline passes while waiting
+        """
+        with self._lock:
+            future = self._flights.get(key)
+            leader = future is None
+            if leader:
+                future = self._flights[key] = Future()
+            else:
+                self._counters["suppressed"] += 1
+
+        if not leader:
+            try:
+                return self._copy(wait_result(future, self.timeout))
+            except DeadlineExceeded:
+                if deadline_bound():
+                    raise
+                # The leader's client gave up, not ours: compute it ourselves
+                return self._compute(function, args, kwargs)
+
+        try:
+            if self.cross_process:
+                result = self._do_across_processes(key, function, args, kwargs)
+            else:
+                result = self._compute(function, args, kwargs)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Counters for this process.
+
+        Returns:
+            Dict with computed, suppressed (duplicates that waited on an
+                in-flight call in this process), shared_across_processes
+                (results read from another worker) and in_flight
+        """
+        with self._lock:
+            return dict(self._counters, in_flight=len(self._flights), cross_process=self.cross_process)
+
+    @staticmethod
+    def _copy(result: Any) -> Any:
+        # Callers may annotate their response dict; keep the shared one intact
+        return dict(result) if isinstance(result, dict) else result
+
+    def _compute(self, function: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+        result = function(*args, **kwargs)
+        with self._lock:
+            self._counters["computed"] += 1
+        return result
+
+    def _paths(self, key: Hashable):
+        stripe = int(hashlib.sha1(repr(key).encode('utf-8')).hexdigest(), 16) % LOCK_STRIPES
+        base = os.path.join(self.directory, f"{self.name}-{stripe:04d}")
+        return base + '.lock', base + '.json'
+
+    def _do_across_processes(self, key: Hashable, function: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+        lock_path, result_path = self._paths(key)
+        waited = False
+        deadline = time.monotonic() + wait_timeout(self.timeout)
+
+        with open(lock_path, 'a') as lock_file:
+            while True:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    waited = True
+                    if time.monotonic() > deadline:
+                        if deadline_bound():
+                            raise DeadlineExceeded(f"{self.name}: deadline passed waiting for another process on {key!r}")
+                        raise TimeoutError(f"{self.name}: timed out waiting for another process on {key!r}")
+                    time.sleep(LOCK_POLL_INTERVAL)
+
+            try:
+                # Another process computed this while we waited for its lock
+                if waited:
+                    shared = self._read_result(result_path, repr(key))
+                    if shared is not None:
+                        with self._lock:
+                            self._counters["shared_across_processes"] += 1
+                            self._counters["suppressed"] += 1
+                        return shared["result"]
+
+                result = self._compute(function, args, kwargs)
+                self._write_result(result_path, repr(key), result)
+                return result
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_result(self, result_path: str, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(result_path, encoding='utf-8') as result_file:
+                shared = json.load(result_file)
+        except (OSError, ValueError):
+            return None
+        if shared.get("key") != key or time.time() - shared.get("written_at", 0) > self.result_ttl:
+            return None
+        return shared
+
+    def _write_result(self, result_path: str, key: str, result: Any):
+        temporary_path = f"{result_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temporary_path, 'w', encoding='utf-8') as result_file:
+                json.dump({"key": key, "written_at": time.time(), "result": result}, result_file)
+            os.replace(temporary_path, result_path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"{self.name}: could not share result across processes: {e}")
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
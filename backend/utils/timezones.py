@@ -0,0 +1,251 @@
+import bisect
+import datetime
+from functools import lru_cache
+from typing import NamedTuple, Tuple
+import numpy as np
+import pytz
+from pytz.exceptions import AmbiguousTimeError, NonExistentTimeError
+
+EPOCH = datetime.datetime(1970, 1, 1)
+
+# Status codes reported for each converted local time
+STATUS_OK = 0
+STATUS_AMBIGUOUS = 1
+STATUS_NONEXISTENT = 2
+STATUS_NAMES = {STATUS_OK: "ok", STATUS_AMBIGUOUS: "ambiguous", STATUS_NONEXISTENT: "nonexistent"}
+
+AMBIGUOUS_POLICIES = ("earlier", "later", "raise")
+NONEXISTENT_POLICIES = ("shift_forward", "raise")
+
+
+def _to_seconds(value: datetime.datetime) -> int:
+    return (value - EPOCH) // datetime.timedelta(seconds=1)
+
+
+class ResolvedTime(NamedTuple):
+    utc: datetime.datetime
+    utc_offset: int
+    status: str
+
+
+class TimezoneTable:
+    """
+    UTC-offset transitions of one time zone as sorted arrays.
+
+    Every interval ``i`` starts at ``utc_starts[i]`` (UTC seconds) and uses
+    ``offsets[i]``. In local time it starts at ``local_starts[i]``, so both
+    directions of conversion are a binary search over these arrays.
+    """
+
+    def __init__(self, name: str):
+        tz = pytz.timezone(name)
+        self.name = tz.zone
+
+        if hasattr(tz, '_utc_transition_times'):
+            utc_starts = [_to_seconds(moment) for moment in tz._utc_transition_times]
+            offsets = [int(info[0].total_seconds()) for info in tz._transition_info]
+        else:
+            utc_starts = [_to_seconds(datetime.datetime.min)]
+            offsets = [int(tz.utcoffset(datetime.datetime(2000, 1, 1)).total_seconds())]
+
+        self.utc_starts = np.array(utc_starts, dtype=np.int64)
+        self.offsets = np.array(offsets, dtype=np.int64)
+        self.local_starts = self.utc_starts + self.offsets
+        # Local end of each interval, i.e. where the next transition lands in the old offset
+        self.local_ends = np.append(self.utc_starts[1:] + self.offsets[:-1], np.iinfo(np.int64).max)
+
+        for array in (self.utc_starts, self.offsets, self.local_starts, self.local_ends):
+            array.setflags(write=False)
+
+        # Plain lists for single conversions, where bisect beats NumPy call overhead
+        self._utc_starts = self.utc_starts.tolist()
+        self._offsets = self.offsets.tolist()
+        self._local_starts = self.local_starts.tolist()
+        self._local_ends = self.local_ends.tolist()
+
+    def local_to_utc_seconds(
+        self,
+        local_second: int,
+        ambiguous: str = "earlier",
+        nonexistent: str = "shift_forward"
+    ) -> Tuple[int, int, int]:
+        """
+        Convert one local wall-clock time to UTC; see ``local_to_utc_batch``.
+
+        Returns:
+            Tuple of (UTC seconds, UTC offset in seconds, status code)
+        """
+        index = max(bisect.bisect_right(self._local_starts, local_second) - 1, 0)
+
+        if local_second >= self._local_ends[index]:
+            if nonexistent == "raise":
+                raise NonExistentTimeError(f"{self.name}: local time skipped by a clock change")
+            index = min(index + 1, len(self._utc_starts) - 1)
+            return self._utc_starts[index], self._offsets[index], STATUS_NONEXISTENT
+
+        if index > 0 and local_second < self._local_ends[index - 1]:
+            if ambiguous == "raise":
+                raise AmbiguousTimeError(f"{self.name}: local time repeated by a clock change")
+            if ambiguous == "earlier":
+                index -= 1
+            return local_second - self._offsets[index], self._offsets[index], STATUS_AMBIGUOUS
+
+        return local_second - self._offsets[index], self._offsets[index], STATUS_OK
+
+    def utc_offset_at(self, utc_second: int) -> int:
+        """
+        UTC offset in seconds in effect at a UTC instant.
+        """
+        return self._offsets[max(bisect.bisect_right(self._utc_starts, utc_second) - 1, 0)]
+
+    def utc_to_local_batch(self, utc_seconds: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convert UTC instants to local wall-clock seconds.
+
+        Args:
+            utc_seconds (np.ndarray): UTC instants as seconds since the epoch
+
+        Returns:
+            Tuple of (local seconds, UTC offsets in seconds)
+        """
+        utc_seconds = np.asarray(utc_seconds, dtype=np.int64)
+        index = np.clip(np.searchsorted(self.utc_starts, utc_seconds, side='right') - 1, 0, None)
+        offsets = self.offsets[index]
+        return utc_seconds + offsets, offsets
+
+    def local_to_utc_batch(
+        self,
+        local_seconds: np.ndarray,
+        ambiguous: str = "earlier",
+        nonexistent: str = "shift_forward"
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Convert local wall-clock times to UTC.
+
+        Args:
+            local_seconds (np.ndarray): Local times as seconds since the epoch
+            ambiguous (str): For times repeated when clocks fall back, use the
+                ``earlier`` or ``later`` occurrence, or ``raise``
+            nonexistent (str): For times skipped when clocks spring forward,
+                ``shift_forward`` to the first valid instant, or ``raise``
+
+        Returns:
+            Tuple of (UTC seconds, UTC offsets in seconds, status codes)
+
+        Raises:
+            AmbiguousTimeError: If a time is ambiguous and ``ambiguous`` is ``raise``
+            NonExistentTimeError: If a time is skipped and ``nonexistent`` is ``raise``
+        """
+        if ambiguous not in AMBIGUOUS_POLICIES:
+            raise ValueError(f"ambiguous must be one of {AMBIGUOUS_POLICIES}")
+        if nonexistent not in NONEXISTENT_POLICIES:
+            raise ValueError(f"nonexistent must be one of {NONEXISTENT_POLICIES}")
+
+        local_seconds = np.asarray(local_seconds, dtype=np.int64)
+        index = np.clip(np.searchsorted(self.local_starts, local_seconds, side='right') - 1, 0, None)
+        previous = np.clip(index - 1, 0, None)
+
+        # Past the end of interval ``index`` means the clock jumped over this time
+        gap = local_seconds >= self.local_ends[index]
+        # Still inside the previous interval means the clock repeated this time
+        overlap = (index > 0) & (local_seconds < self.local_ends[previous])
+
+        if nonexistent == "raise" and gap.any():
+            raise NonExistentTimeError(f"{self.name}: local time skipped by a clock change")
+        if ambiguous == "raise" and overlap.any():
+            raise AmbiguousTimeError(f"{self.name}: local time repeated by a clock change")
+
+        chosen = np.where(overlap & (ambiguous == "earlier"), previous, index)
+        offsets = self.offsets[chosen]
+        utc_seconds = local_seconds - offsets
+
+        # Skipped times move to the transition that skipped them
+        next_index = np.clip(index + 1, None, len(self.utc_starts) - 1)
+        utc_seconds = np.where(gap, self.utc_starts[next_index], utc_seconds)
+        offsets = np.where(gap, self.offsets[next_index], offsets)
+
+        status = np.where(gap, STATUS_NONEXISTENT, np.where(overlap, STATUS_AMBIGUOUS, STATUS_OK))
+        return utc_seconds, offsets, status
+
+
+@lru_cache(maxsize=None)
+def get_timezone_table(name: str) -> TimezoneTable:
+    """
+    Cached transition table for a time zone.
+
+    Args:
+        name (str): IANA time zone name
+
+    Returns:
+        TimezoneTable: Shared, read-only table
+    """
+    return TimezoneTable(name)
+
+
+def local_to_utc(
+    local_time: datetime.datetime,
+    tz_name: str,
+    ambiguous: str = "earlier",
+    nonexistent: str = "shift_forward"
+) -> ResolvedTime:
+    """
+    Convert a naive local datetime to a naive UTC datetime.
+
+    Args:
+        local_time (datetime): Naive local wall-clock time
+        tz_name (str): IANA time zone name
+        ambiguous (str): Policy for repeated times, see ``local_to_utc_batch``
+        nonexistent (str): Policy for skipped times, see ``local_to_utc_batch``
+
+    Returns:
+        ResolvedTime: UTC time, offset in seconds and status name
+    """
+    if ambiguous not in AMBIGUOUS_POLICIES:
+        raise ValueError(f"ambiguous must be one of {AMBIGUOUS_POLICIES}")
+    if nonexistent not in NONEXISTENT_POLICIES:
+        raise ValueError(f"nonexistent must be one of {NONEXISTENT_POLICIES}")
+
+    utc_second, offset, status = get_timezone_table(tz_name).local_to_utc_seconds(
+        _to_seconds(local_time), ambiguous, nonexistent
+    )
+    return ResolvedTime(EPOCH + datetime.timedelta(seconds=utc_second), offset, STATUS_NAMES[status])
+
+
+def local_to_utc_batch(
+    local_times: np.ndarray,
+    tz_name: str,
+    ambiguous: str = "earlier",
+    nonexistent: str = "shift_forward"
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Convert many local times in one time zone to UTC.
+
+    Args:
+        local_times (np.ndarray): Local times as ``datetime64`` values
+        tz_name (str): IANA time zone name
+        ambiguous (str): Policy for repeated times
+        nonexistent (str): Policy for skipped times
+
+    Returns:
+        Tuple of (UTC ``datetime64[s]`` values, offsets in seconds, status codes)
+    """
+    local_seconds = np.asarray(local_times, dtype='datetime64[s]').astype(np.int64)
+    utc_seconds, offsets, status = get_timezone_table(tz_name).local_to_utc_batch(
+        local_seconds, ambiguous, nonexistent
+    )
+    return utc_seconds.astype('datetime64[s]'), offsets, status
+
+
+def utc_to_local(utc_time: datetime.datetime, tz_name: str) -> datetime.datetime:
+    """
+    Convert a naive UTC datetime to an aware local datetime.
+
+    Args:
+        utc_time (datetime): Naive UTC time
+        tz_name (str): IANA time zone name
+
+    Returns:
+        datetime: Local time carrying its fixed UTC offset
+    """
+    offset = datetime.timedelta(seconds=get_timezone_table(tz_name).utc_offset_at(_to_seconds(utc_time)))
+    return (utc_time + offset).replace(tzinfo=datetime.timezone(offset))
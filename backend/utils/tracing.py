@@ -0,0 +1,328 @@
+import os
+import re
+import json
+import time
+import atexit
+import random
+import logging
+import threading
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from backend.utils.serialization import NegotiatingJSONProvider
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "pathlet-backend"
+
+# W3C Trace Context: version-trace_id-parent_id-flags
+TRACEPARENT = re.compile(r'^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$')
+TRACE_ID = re.compile(r'^[0-9a-f]{32}$')
+
+# OTLP span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+STATUS_ERROR = 2
+
+# Spans queued for export, in batches, before new traces are dropped
+MAX_PENDING_BATCHES = 8
+
+
+class _TracingState(threading.local):
+    # A class default keeps the lookup cheap on threads that never trace
+    trace = None
+
+
+_tracing = _TracingState()
+
+
+class _Trace:
+    """Spans of one request, recorded on the thread serving it."""
+
+    __slots__ = ('trace_id', 'stack', 'spans')
+
+    def __init__(self, trace_id: str, parent_id: int):
+        self.trace_id = trace_id
+        self.stack = [parent_id]
+        self.spans: List[tuple] = []
+
+
+def _trace_ids(environ: Dict[str, Any]) -> Tuple[str, int]:
+    """Trace id and remote parent span id from the request headers."""
+    match = TRACEPARENT.match(environ.get('HTTP_TRACEPARENT', '').strip().lower())
+    if match and match.group(1) != '0' * 32:
+        return match.group(1), int(match.group(2), 16)
+    trace_id = environ.get('HTTP_X_TRACE_ID', '').strip().lower()
+    if TRACE_ID.match(trace_id) and trace_id != '0' * 32:
+        return trace_id, 0
+    return f"{random.getrandbits(128):032x}", 0
+
+
+def current_trace_id() -> Optional[str]:
+    """
+    Trace id of the request the current thread is serving.
+
+    Returns:
+        str, or None outside a traced request
+    """
+    trace = _tracing.trace
+    return trace.trace_id if trace is not None else None
+
+
+class _Span:
+    """An open span of the current request."""
+
+    __slots__ = ('trace', 'name', 'attributes', 'span_id', 'start')
+
+    def __init__(self, trace: _Trace, name: str, attributes: Optional[Dict[str, Any]]):
+        self.trace = trace
+        self.name = name
+        self.attributes = attributes
+
+    def __enter__(self) -> '_Span':
+        self.span_id = random.getrandbits(64) or 1
+        self.trace.stack.append(self.span_id)
+        self.start = time.time_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        end = time.time_ns()
+        stack = self.trace.stack
+        stack.pop()
+        error = exc_type.__name__ if exc_type is not None else None
+        self.trace.spans.append(
+            (self.span_id, stack[-1], self.name, SPAN_KIND_INTERNAL, self.start, end, self.attributes, error)
+        )
+        return False
+
+
+class _NullSpan:
+    """Shared stand-in for spans outside a traced request."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> '_NullSpan':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, attributes: Optional[Dict[str, Any]] = None):
+    """
+    Context manager timing one step of the current request.
+
+    Outside a traced request (tracing disabled, or work running on a
+    batching thread) this returns a shared no-op context. Spans are kept
+    as plain tuples on the request and only converted to OTLP at export.
+
+    Args:
+        name (str): Span name, e.g. ``human_design.calculate``
+        attributes (Dict, optional): String, number or bool attributes
+
+    Returns:
+        Context manager
+    """
+    trace = _tracing.trace
+    if trace is None:
+        return _NULL_SPAN
+    return _Span(trace, name, attributes)
+
+
+def traced(name: str) -> Callable[[Callable], Callable]:
+    """
+    Decorate a function to run inside a span of the same name.
+
+    Args:
+        name (str): Span name
+
+    Returns:
+        Callable: Function decorator
+    """
+    def decorator(function: Callable) -> Callable:
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            trace = _tracing.trace
+            if trace is None:
+                return function(*args, **kwargs)
+            with _Span(trace, name, None):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+def _otlp_span(trace_id: str, record: tuple) -> Dict[str, Any]:
+    span_id, parent_id, name, kind, start, end, attributes, error = record
+    otlp = {
+        "traceId": trace_id,
+        "spanId": f"{span_id:016x}",
+        "name": name,
+        "kind": kind,
+        "startTimeUnixNano": str(start),
+        "endTimeUnixNano": str(end),
+        "attributes": [_attribute(key, value) for key, value in (attributes or {}).items()]
+    }
+    if parent_id:
+        otlp["parentSpanId"] = f"{parent_id:016x}"
+    if error:
+        otlp["status"] = {"code": STATUS_ERROR, "message": error}
+    return otlp
+
+
+class TracedJSONProvider(NegotiatingJSONProvider):
+    """Flask JSON provider that records response encoding as a span."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        with span("json.encode"):
+            return super().dumps(obj, **kwargs)
+
+    def encode_binary(self, obj: Any, response_format: str) -> bytes:
+        with span(f"{response_format}.encode"):
+            return super().encode_binary(obj, response_format)
+
+
+class SpanExporter:
+    """
+    Batch finished traces and append them to a file as OTLP JSON.
+
+    Each flush writes one line holding an OTLP ``ExportTraceServiceRequest``
+    (the format of the OpenTelemetry collector's file exporter), so the
+    file can be replayed into any OTLP backend or read with ``jq``. Every
+    worker writes its own ``spans-<pid>.jsonl``. A background thread
+    flushes every ``interval`` seconds or as soon as ``batch_size`` spans
+    are waiting; requests only append to a list. If writing falls behind
+    by more than ``MAX_PENDING_BATCHES`` batches, new traces are dropped.
+    """
+
+    def __init__(self, directory: str, batch_size: int = 512, interval: float = 5.0):
+        self.directory = directory
+        self.batch_size = batch_size
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[str, List[tuple]]] = []
+        self._pending_spans = 0
+        self._wakeup = threading.Event()
+        self._thread_pid = None
+        self.dropped = 0
+        atexit.register(self.flush)
+
+    def _ensure_thread(self):
+        # Threads do not survive a fork: start one per worker on first use
+        if self._thread_pid != os.getpid():
+            self._thread_pid = os.getpid()
+            threading.Thread(target=self._run, name="span-exporter", daemon=True).start()
+
+    def add(self, trace_id: str, spans: List[tuple]):
+        """
+        Queue the spans of one finished trace.
+
+        Args:
+            trace_id (str): Trace id
+            spans (List[tuple]): Span records
+        """
+        with self._lock:
+            self._ensure_thread()
+            if self._pending_spans >= self.batch_size * MAX_PENDING_BATCHES:
+                self.dropped += len(spans)
+                return
+            self._pending.append((trace_id, spans))
+            self._pending_spans += len(spans)
+            full = self._pending_spans >= self.batch_size
+        if full:
+            self._wakeup.set()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Write every queued span now.
+
+        Returns:
+            int: Number of spans written
+        """
+        with self._lock:
+            pending, self._pending, self._pending_spans = self._pending, [], 0
+        if not pending:
+            return 0
+
+        spans = [_otlp_span(trace_id, record) for trace_id, records in pending for record in records]
+        request = {"resourceSpans": [{
+            "resource": {"attributes": [
+                _attribute("service.name", SERVICE_NAME), _attribute("process.pid", os.getpid())
+            ]},
+            "scopeSpans": [{"scope": {"name": __name__}, "spans": spans}]
+        }]}
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, f"spans-{os.getpid()}.jsonl")
+            with open(path, 'a', encoding='utf-8') as span_file:
+                span_file.write(json.dumps(request, separators=(',', ':')) + '\n')
+        except OSError as e:
+            logger.warning(f"Dropped {len(spans)} spans: {e}")
+            return 0
+        return len(spans)
+
+
+class TracingMiddleware:
+    """
+    Trace every request and hand its spans to a ``SpanExporter``.
+
+    The trace id comes from an incoming W3C ``traceparent`` header (the
+    caller's span becomes the parent of ours) or an ``X-Trace-Id`` header,
+    and is generated otherwise. Responses carry ``X-Trace-Id``. The root
+    span covers the WSGI call; spans opened with ``span`` or ``traced``
+    on the serving thread nest under it. Install the middleware only when
+    tracing is enabled, so untraced deployments pay nothing at all.
+    """
+
+    def __init__(self, app: Callable, exporter: SpanExporter):
+        self.app = app
+        self.exporter = exporter
+
+    def __call__(self, environ: Dict[str, Any], start_response: Callable):
+        trace_id, parent_id = _trace_ids(environ)
+        trace = _Trace(trace_id, parent_id)
+        root_id = random.getrandbits(64) or 1
+        trace.stack.append(root_id)
+        statuses = []
+
+        def start_traced_response(status, headers, exc_info=None):
+            statuses.append(status)
+            headers.append(('X-Trace-Id', trace_id))
+            return start_response(status, headers, exc_info)
+
+        method = environ.get('REQUEST_METHOD', 'GET')
+        path = environ.get('SCRIPT_NAME', '') + environ.get('PATH_INFO', '')
+        error = None
+        _tracing.trace = trace
+        start = time.time_ns()
+        try:
+            return self.app(environ, start_traced_response)
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            end = time.time_ns()
+            _tracing.trace = None
+            status = int(statuses[0].split()[0]) if statuses else 500
+            attributes = {"http.request.method": method, "url.path": path, "http.response.status_code": status}
+            if error is None and status >= 500:
+                error = f"HTTP {status}"
+            trace.spans.append((root_id, parent_id, f"{method} {path}", SPAN_KIND_SERVER, start, end, attributes, error))
+            self.exporter.add(trace_id, trace.spans)
@@ -0,0 +1,121 @@
+import gc
+import time
+import logging
+import datetime
+from typing import Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Births covered by the prebuilt solar table (design dates fall ~89 days earlier)
+SOLAR_TABLE_START = datetime.datetime(1900, 1, 1)
+
+
+def _warm_timezones():
+    from backend.services.locations import KNOWN_LOCATIONS, DEFAULT_LOCATION
+    from backend.utils.timezones import get_timezone_table
+
+    zones = {entry[2] for entry in KNOWN_LOCATIONS.values()}
+    zones.add(DEFAULT_LOCATION.timezone)
+    for zone in sorted(zones):
+        get_timezone_table(zone)
+
+
+def _warm_ephemeris_snapshot():
+    from backend.services.ephemeris import get_ephemeris_snapshot
+
+    get_ephemeris_snapshot()
+
+
+def _warm_solar_table():
+    import ephem
+    from backend.services.ephemeris import get_ephemeris_snapshot
+    from backend.services.human_design import _solar_longitude_at_day
+
+    # Design dates start from the snapshot when there is one
+    if get_ephemeris_snapshot() is not None:
+        return
+
+    first_day = int(ephem.Date(SOLAR_TABLE_START)) - 100
+    last_day = int(ephem.Date(datetime.datetime.utcnow())) + 1
+    for day in range(first_day, last_day + 1):
+        _solar_longitude_at_day(day)
+
+
+def _warm_content_catalog():
+    from backend.services.content import get_catalog
+
+    get_catalog()
+
+
+def _warm_services():
+    # Importing the services builds their module-level lookup tables
+    from backend.services import compatibility, hugging_face, human_design, numerology  # noqa: F401
+    from backend.services.numerology import calculate_numerology
+    from backend.services.human_design import calculate_human_design
+    from backend.services.hugging_face import get_possible_ascendants
+
+    calculate_numerology("1990-05-15")
+    calculate_human_design("1990-05-15", "10:30 AM", "New York")
+    get_possible_ascendants("1990-05-15", "New York")
+
+
+def _warm_profile_pool():
+    from backend.services.matching import get_profile_pool
+
+    get_profile_pool()
+
+
+def _warm_lunar_table():
+    from backend.services.lunar import get_lunar_table
+
+    get_lunar_table()
+
+
+def _warm_transit_index():
+    from backend.services.transits import get_transit_index
+
+    get_transit_index()
+
+
+WARMUP_STEPS: List[Tuple[str, Callable[[], None]]] = [
+    ("content_catalog", _warm_content_catalog),
+    ("services", _warm_services),
+    ("timezone_tables", _warm_timezones),
+    ("ephemeris_snapshot", _warm_ephemeris_snapshot),
+    ("solar_longitude_table", _warm_solar_table),
+    ("profile_pool", _warm_profile_pool),
+    ("lunar_table", _warm_lunar_table),
+    ("transit_index", _warm_transit_index),
+]
+
+
+def warm_up(freeze: bool = True) -> Dict[str, float]:
+    """
+    Build static tables and caches before workers are forked.
+
+    Run in the gunicorn master with ``preload_app`` so every worker
+    inherits the tables copy-on-write. ``gc.freeze()`` then moves all
+    surviving objects to the permanent generation, so collections in the
+    workers never touch (and so never copy) those pages.
+
+    Args:
+        freeze (bool): Whether to freeze the heap after warming up
+
+    Returns:
+        Dict of step name to build time in seconds
+    """
+    timings = {}
+    for name, step in WARMUP_STEPS:
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            logger.error(f"Warm-up step {name} failed: {e}")
+        timings[name] = round(time.perf_counter() - started, 3)
+
+    if freeze:
+        gc.collect()
+        gc.freeze()
+
+    logger.info(f"Warm-up finished: {timings}, frozen objects: {gc.get_freeze_count()}")
+    return timings
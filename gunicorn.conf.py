@@ -0,0 +1,31 @@
+"""
+Gunicorn configuration for the Pathlet API.
+
+The app is preloaded in the master and warmed up there, so lookup tables
+and caches are built once and shared copy-on-write by every worker.
+"""
+import gc
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv('WEB_CONCURRENCY', 4))
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+preload_app = os.getenv('GUNICORN_PRELOAD', 'True') == 'True'
+
+# gunicorn reads this file before it preloads the app, so objects created
+# while importing it and warming up go straight into the frozen heap
+if preload_app:
+    gc.disable()
+
+
+def when_ready(server):
+    if preload_app:
+        from backend.warmup import warm_up
+        timings = warm_up(freeze=True)
+        server.log.info(f"Pre-fork warm-up: {timings}, frozen objects: {gc.get_freeze_count()}")
+        gc.enable()
+
+
+def post_fork(server, worker):
+    gc.enable()
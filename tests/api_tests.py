@@ -0,0 +1,413 @@
+import sys
+import os
+import json
+import base64
+import gzip
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+# Dependency check
+DEPENDENCIES_INSTALLED = True
+try:
+    import flask
+    import ephem
+    import pytz
+    import numpy
+    import scipy
+except ImportError:
+    DEPENDENCIES_INSTALLED = False
+
+if DEPENDENCIES_INSTALLED:
+    from backend.app import app
+    from backend.config.settings import Config
+    from backend.utils.profiling import ProfileStore, ProfilingMiddleware
+    from backend.utils.memory import memory_inspector
+    from backend.utils.tracing import SpanExporter, TracedJSONProvider, TracingMiddleware
+    from backend.utils import serialization
+    from backend.utils.serverless import event_to_environ, call_wsgi
+    from backend.utils.singleflight import SingleFlight
+    from backend.services.locations import resolve_location
+    from backend.services.transits import get_transit_index
+    from backend.utils.assets import StaticAssets, build_assets, negotiate_encoding
+    from werkzeug.test import Client
+
+
+@unittest.skipIf(not DEPENDENCIES_INSTALLED, "Required dependencies not installed")
+class ServerlessAdapterTests(unittest.TestCase):
+    def test_api_gateway_event(self):
+        """Test that an API Gateway event is dispatched under the /api mount"""
+        event = {
+            "httpMethod": "POST",
+            "path": "/api/calculate_numerology",
+            "headers": {"Content-Type": "application/json", "Host": "pathlet-api.vercel.app"},
+            "body": json.dumps({"birth_date": "1990-05-15"}),
+            "isBase64Encoded": False
+        }
+        environ = event_to_environ(event, "/api")
+        self.assertEqual((environ['SCRIPT_NAME'], environ['PATH_INFO']), ("/api", "/calculate_numerology"))
+
+        response = call_wsgi(app, environ)
+        self.assertEqual(response['statusCode'], 200)
+        self.assertFalse(response['isBase64Encoded'])
+        self.assertEqual(json.loads(response['body'])['life_path_number'], 3)
+
+    def test_vercel_invoke_event(self):
+        """Test the legacy Vercel invoke payload with a base64 body and query string"""
+        event = {
+            "Action": "Invoke",
+            "body": json.dumps({
+                "method": "POST",
+                "path": "/api/get_ascendants?source=test",
+                "headers": {"content-type": "application/json", "x-forwarded-for": "203.0.113.7, 10.0.0.1"},
+                "body": base64.b64encode(json.dumps(
+                    {"birth_date": "1990-05-15", "birth_location": "Tokyo"}
+                ).encode()).decode(),
+                "encoding": "base64"
+            })
+        }
+        environ = event_to_environ(event, "/api")
+        self.assertEqual(environ['QUERY_STRING'], "source=test")
+        self.assertEqual(environ['REMOTE_ADDR'], "203.0.113.7")
+
+        response = call_wsgi(app, environ)
+        self.assertEqual(response['statusCode'], 200)
+        self.assertIn('possible_ascendants', json.loads(response['body']))
+
+    def test_vercel_entry_point_leaves_backend_app_unchanged(self):
+        """Test that the Vercel module answers API routes exactly as the backend app does"""
+        error_handlers = dict(app.error_handler_spec[None])
+        from api import index
+        self.assertEqual(dict(app.error_handler_spec[None]), error_handlers)
+        self.assertFalse(os.path.exists('vercel_deployment.log'))
+
+        event = {"httpMethod": "GET", "path": "/api/calculate_numerology", "headers": {}}
+        self.assertEqual(index.handler(event, None)['statusCode'], 405)
+        self.assertEqual(Client(app).get('/calculate_numerology').status_code, 405)
+        self.assertEqual(index.handler(dict(event, path="/api/home"), None)['statusCode'], 200)
+
+
+@unittest.skipIf(not DEPENDENCIES_INSTALLED, "Required dependencies not installed")
+class RequestSchemaTests(unittest.TestCase):
+    def setUp(self):
+        self.client = app.test_client()
+
+    def test_structured_errors(self):
+        """Test that every invalid field is reported before any service work"""
+        response = self.client.post('/calculate_compatibility', json={
+            "person1": {"birth_date": "1990-13-45", "birth_time": 1030},
+            "person2": "1985-12-22"
+        })
+        self.assertEqual(response.status_code, 400)
+        fields = [error['field'] for error in response.get_json()['fields']]
+        self.assertEqual(fields, ["person1.birth_date", "person1.birth_time", "person2"])
+
+        malformed = self.client.post('/calculate_numerology', data='{"birth_date": ', content_type='application/json')
+        self.assertEqual(malformed.get_json()['fields'], [{"field": "body", "message": "must be a JSON object"}])
+
+        for path in ('/get_ascendants', '/calculate_human_design'):
+            unknown = self.client.post(path, json={"birth_date": "1990-05-15", "birth_location": "Paris, Texas"})
+            self.assertEqual(unknown.status_code, 400)
+            self.assertEqual(unknown.get_json()['fields'][0]['field'], "birth_location")
+        blank = self.client.post('/calculate_human_design', json={"birth_date": "1990-05-15", "birth_location": " "})
+        self.assertEqual(blank.status_code, 200)
+
+        matches = self.client.post('/matches', json={"limit": 0, "filters": {"human_design_types": ["Wizard"]}})
+        self.assertEqual(
+            [error['field'] for error in matches.get_json()['fields']],
+            ["limit", "filters.human_design_types"]
+        )
+
+    def test_normalized_payload(self):
+        """Test that accepted payloads reach the services normalized"""
+        response = self.client.post('/calculate_compatibility', json={
+            "person1": {"birth_date": "05/15/1990", "birth_time": "14:30"},
+            "person2": {"birth_date": "1985-12-22", "birth_location": "Tokyo"}
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("numerology_compatibility", response.get_json())
+
+    @unittest.skipIf(DEPENDENCIES_INSTALLED and serialization.msgpack is None, "msgpack not installed")
+    def test_msgpack_negotiation(self):
+        """Test MessagePack request bodies and Accept-negotiated responses"""
+        msgpack = serialization.msgpack
+        body = msgpack.packb({"birth_date": "1990-05-15"})
+        response = self.client.post(
+            '/calculate_numerology', data=body, content_type='application/msgpack',
+            headers={'Accept': 'application/msgpack, application/json;q=0.5'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/msgpack')
+        self.assertIn('Accept', response.headers['Vary'])
+        chart = msgpack.unpackb(response.data)
+        self.assertEqual(chart, self.client.post('/calculate_numerology', json={"birth_date": "1990-05-15"}).get_json())
+
+        default = self.client.post('/calculate_numerology', data=body, content_type='application/msgpack')
+        self.assertEqual(default.mimetype, 'application/json')
+        corrupt = self.client.post('/calculate_numerology', data=b'\xc1', content_type='application/msgpack')
+        self.assertEqual(corrupt.status_code, 400)
+
+
+@unittest.skipIf(not DEPENDENCIES_INSTALLED, "Required dependencies not installed")
+class StaticAssetTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        source = os.path.join(self.directory, 'build')
+        os.makedirs(os.path.join(source, 'static', 'js'))
+        with open(os.path.join(source, 'index.html'), 'w') as index_file:
+            index_file.write('<html>' + '<p>Pathlet</p>' * 100 + '</html>')
+        with open(os.path.join(source, 'static', 'js', 'main.3f2a9c1e.js'), 'w') as bundle_file:
+            bundle_file.write('console.log("pathlet");' * 100)
+        self.manifest = build_assets(source, os.path.join(self.directory, 'assets'))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _client(self, assets):
+        return Client(lambda environ, start_response: assets.response(
+            environ['PATH_INFO'].lstrip('/'), environ
+        )(environ, start_response))
+
+    def test_negotiation_and_caching(self):
+        """Test encoding negotiation, cache headers and ETag revalidation"""
+        self.assertEqual(negotiate_encoding('gzip, deflate, br', {'br': {}, 'gzip': {}}), 'br')
+        self.assertEqual(negotiate_encoding('br;q=0.5, gzip', {'br': {}, 'gzip': {}}), 'gzip')
+        self.assertIsNone(negotiate_encoding('gzip;q=0', {'gzip': {}}))
+
+        client = self._client(StaticAssets(os.path.join(self.directory, 'assets')))
+        index = client.get('/index.html', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(index.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(index.headers['Cache-Control'], 'no-cache')
+        self.assertIn('<p>Pathlet</p>', gzip.decompress(index.data).decode())
+
+        revalidated = client.get('/index.html', headers={'Accept-Encoding': 'gzip', 'If-None-Match': index.headers['ETag']})
+        self.assertEqual(revalidated.status_code, 304)
+
+        hashed_path = self.manifest['assets']['index.html']['path']
+        plain = client.get('/' + hashed_path)
+        self.assertNotIn('Content-Encoding', plain.headers)
+        self.assertIn('immutable', plain.headers['Cache-Control'])
+        bundle = client.get('/static/js/main.3f2a9c1e.js')
+        self.assertIn('immutable', bundle.headers['Cache-Control'])
+
+    def test_accel_redirect(self):
+        """Test that nginx hand-off responses carry headers only"""
+        assets = StaticAssets(os.path.join(self.directory, 'assets'), accel_redirect_prefix='/_static_assets')
+        response = self._client(assets).get('/index.html', headers={'Accept-Encoding': 'gzip'})
+        gzip_path = self.manifest['assets']['index.html']['encodings']['gzip']['path']
+        self.assertEqual(response.headers['X-Accel-Redirect'], '/_static_assets/' + gzip_path)
+        self.assertEqual(response.data, b'')
+
+
+
+@unittest.skipIf(not DEPENDENCIES_INSTALLED, "Required dependencies not installed")
+class ProfilingTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store = ProfileStore(self.directory, max_profiles=2)
+        self.client = Client(ProfilingMiddleware(app.wsgi_app, self.store))
+        patches = [
+            mock.patch.object(Config, 'ADMIN_TOKEN', 'secret'),
+            mock.patch('backend.app.profile_store', self.store)
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_profiled_request(self):
+        """Test that only admin requests asking for a profile are profiled"""
+        payload = {"birth_date": "1990-05-15", "birth_time": "10:30 AM", "birth_location": "New York"}
+        plain = self.client.post('/calculate_human_design', json=payload, headers={'X-Profile': '1'})
+        self.assertNotIn('X-Profile-Id', plain.headers)
+
+        headers = {'X-Profile': '1', 'X-Admin-Token': 'secret'}
+        profiled = self.client.post('/calculate_human_design', json=payload, headers=headers)
+        self.assertEqual(profiled.status_code, 200)
+        profile_id = profiled.headers['X-Profile-Id']
+
+        collapsed = self.store.read(profile_id)
+        stacks = [line.rsplit(' ', 1) for line in collapsed.splitlines()]
+        self.assertTrue(all(count.isdigit() for _, count in stacks))
+        self.assertTrue(any('HumanDesignCalculator.calculate_human_design' in stack for stack, _ in stacks))
+
+        for _ in range(2):
+            self.client.get('/healthz', headers=headers)
+        listing = app.test_client().get('/admin/profiles', headers={'X-Admin-Token': 'secret'}).get_json()
+        self.assertEqual([profile['path'] for profile in listing['profiles']], ['/healthz', '/healthz'])
+        self.assertIsNone(self.store.read(profile_id))
+        self.assertEqual(app.test_client().get('/admin/profiles').status_code, 403)
+
+
+
+@unittest.skipIf(not DEPENDENCIES_INSTALLED, "Required dependencies not installed")
+class MemoryEndpointTests(unittest.TestCase):
+    def test_snapshot_diff(self):
+        """Test tracemalloc control, snapshots and per-module diffs over HTTP"""
+        client = app.test_client()
+        self.assertEqual(client.get('/admin/memory').status_code, 404)
+
+        headers = {'X-Admin-Token': 'secret'}
+        with mock.patch.object(Config, 'ADMIN_TOKEN', 'secret'):
+            report = client.get('/admin/memory', headers=headers).get_json()
+            self.assertGreater(report['rss_bytes'], 0)
+            self.assertEqual(len(report['gc']['counts']), 3)
+            self.assertEqual(client.post('/admin/memory/snapshots', headers=headers).status_code, 409)
+
+            client.post('/admin/memory/tracemalloc', json={"enabled": True}, headers=headers)
+            self.addCleanup(memory_inspector.set_tracing, False)
+            snapshot = client.post('/admin/memory/snapshots', headers=headers).get_json()
+            for year in range(1950, 1960):
+                client.post('/calculate_human_design', json={"birth_date": f"{year}-03-01", "birth_location": "Tokyo"})
+
+            diff = client.get(f"/admin/memory/diff?from={snapshot['id']}&prefix=backend.", headers=headers).get_json()
+            self.assertEqual(diff['pid'], os.getpid())
+            self.assertTrue(all(module['module'].startswith('backend.') for module in diff['modules']))
+            self.assertIn(snapshot['id'], [entry['id'] for entry in client.get('/admin/memory', headers=headers).get_json()['snapshots']])
+            self.assertEqual(client.get('/admin/memory/diff?from=missing', headers=headers).status_code, 404)
+
+
+@unittest.skipIf(not DEPENDENCIES_INSTALLED, "Required dependencies not installed")
+class TracingTests(unittest.TestCase):
+    def test_compatibility_spans(self):
+        """Test that a propagated trace id covers validation, service calls and encoding"""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        exporter = SpanExporter(directory, interval=3600)
+        client = Client(TracingMiddleware(app.wsgi_app, exporter))
+        trace_id = '4bf92f3577b34da6a3ce929d0e0e4736'
+        person = {"birth_date": "1990-05-15", "birth_time": "10:30 AM", "birth_location": "London"}
+
+        with mock.patch.object(app, 'json', TracedJSONProvider(app)):
+            response = client.post(
+                '/calculate_compatibility',
+                json={"person1": person, "person2": dict(person, birth_date="1985-12-22")},
+                headers={'traceparent': f'00-{trace_id}-00f067aa0ba902b7-01'}
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['X-Trace-Id'], trace_id)
+        self.assertEqual(exporter.flush(), 8)
+
+        with open(os.path.join(directory, f'spans-{os.getpid()}.jsonl'), encoding='utf-8') as span_file:
+            request = json.loads(span_file.readline())
+        spans = request['resourceSpans'][0]['scopeSpans'][0]['spans']
+        self.assertEqual({span['traceId'] for span in spans}, {trace_id})
+        names = [span['name'] for span in spans]
+        self.assertEqual(names.count('human_design.calculate'), 2)
+        self.assertEqual(names.count('numerology.life_path'), 2)
+        self.assertIn('validate', names)
+        self.assertIn('json.encode', names)
+
+        by_name = {span['name']: span for span in spans}
+        root = by_name['POST /calculate_compatibility']
+        self.assertEqual(root['parentSpanId'], '00f067aa0ba902b7')
+        self.assertEqual(by_name['compatibility.calculate']['parentSpanId'], root['spanId'])
+        self.assertEqual(by_name['human_design.calculate']['parentSpanId'], by_name['compatibility.calculate']['spanId'])
+
+
+class CompressionTests(unittest.TestCase):
+    def test_negotiated_and_streamed_compression(self):
+        """Test gzip for large bodies, identity for small ones and an incrementally gzipped NDJSON stream"""
+        client = app.test_client()
+        person = {"birth_date": "1990-05-15", "birth_time": "10:30 AM", "birth_location": "London"}
+
+        response = client.post('/calculate_human_design', json=person, headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        self.assertEqual(int(response.headers['Content-Length']), len(response.data))
+        self.assertEqual(json.loads(gzip.decompress(response.data))['type'], client.post('/calculate_human_design', json=person).json['type'])
+
+        response = client.get('/healthz', headers={'Accept-Encoding': 'gzip'})
+        self.assertNotIn('Content-Encoding', response.headers)
+
+        response = client.post(
+            '/forecast', headers={'Accept-Encoding': 'gzip;q=0.5, identity;q=0.1'},
+            json={"birth_date": "1990-05-15", "start_date": "2026-01-01", "end_date": "2026-12-31", "format": "ndjson"}
+        )
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertNotIn('Content-Length', response.headers)
+        self.assertEqual(len(gzip.decompress(response.data).splitlines()), 365)
+
+
+class DeadlineTests(unittest.TestCase):
+    def test_expired_and_degraded_requests(self):
+        """Test that late requests are refused unworked and optional parts are omitted near the deadline"""
+        client = app.test_client()
+        body = {"birth_date": "1990-05-15", "birth_time": "10:30 AM", "birth_location": "London",
+                "include": ["ascendant", "narrative"]}
+
+        with mock.patch('backend.app.schedule_numerology') as numerology:
+            response = client.post('/calculate_all', json=body, headers={'X-Request-Deadline': '1000000000'})
+            self.assertEqual(response.status_code, 504)
+            numerology.assert_not_called()
+
+        response = client.post('/calculate_all', json=body, headers={'X-Request-Timeout': 'soon'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json['fields'][0]['field'], 'X-Request-Timeout')
+
+        with mock.patch.object(Config, 'DEADLINE_OPTIONAL_RESERVE_MS', 60000):
+            response = client.post('/calculate_all', json=body, headers={'X-Request-Timeout': '30s'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['omitted'], ['ascendant', 'narrative'])
+        self.assertNotIn('ascendant', response.json)
+
+        with mock.patch('backend.app.request_narrative', return_value={"status": "ready", "text": "..."}):
+            response = client.post('/calculate_all', json=body, headers={'X-Request-Timeout': '30s'})
+        self.assertIn('possible_ascendants', response.json['ascendant'])
+        self.assertEqual(response.json['narrative']['status'], 'ready')
+        self.assertNotIn('omitted', response.json)
+
+    def test_deadline_cuts_cross_process_wait(self):
+        """Test that waiting on another worker's lock ends with a 504 at the client's deadline"""
+        started, release = threading.Event(), threading.Event()
+
+        def slow_sweep():
+            started.set()
+            release.wait(5)
+            return {"possible_ascendants": []}
+
+        with tempfile.TemporaryDirectory() as directory:
+            # Two instances stand in for two worker processes sharing lock files
+            other_worker = SingleFlight("charts", cross_process=True, directory=directory)
+            this_worker = SingleFlight("charts", cross_process=True, directory=directory, timeout=10)
+            key = ("ascendants", "1990-05-15", resolve_location("London"))
+            leader = threading.Thread(target=other_worker.do, args=(key, slow_sweep))
+            leader.start()
+            started.wait(5)
+            try:
+                with mock.patch('backend.services.scheduling.chart_flights', this_worker):
+                    response = app.test_client().post(
+                        '/get_ascendants', json={"birth_date": "1990-05-15", "birth_location": "London"},
+                        headers={'X-Request-Timeout': '100ms'}
+                    )
+            finally:
+                release.set()
+                leader.join()
+        self.assertEqual(response.status_code, 504)
+        self.assertEqual(response.json['error'], 'Deadline exceeded')
+
+
+@unittest.skipIf(not DEPENDENCIES_INSTALLED, "Required dependencies not installed")
+class PrecomputedDataTests(unittest.TestCase):
+    def test_missing_transit_index(self):
+        """Test that a missing transit index is reported as unavailable, not as a bad range"""
+        get_transit_index.cache_clear()
+        self.addCleanup(get_transit_index.cache_clear)
+        with tempfile.TemporaryDirectory() as directory, \
+                mock.patch.object(Config, 'TRANSIT_INDEX_PATH', os.path.join(directory, 'missing.bin')):
+            response = app.test_client().post('/transits', json={"start_date": "2024-01-01"})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json['error'], 'Transits unavailable')
+        self.assertNotIn('fields', response.json)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+import sys
+import os
+import time
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.dirname(__file__))
+
+# Dependency check
+DEPENDENCIES_INSTALLED = True
+try:
+    import requests
+    import dotenv
+except ImportError:
+    DEPENDENCIES_INSTALLED = False
+
+if DEPENDENCIES_INSTALLED:
+    from backend.services.narrative import InferenceClient, NarrativeCache, NarrativeService
+    from backend.utils.resilience import CircuitBreaker
+    from stub_model_server import StubModelServer
+
+CHART = {
+    "type": "Generator",
+    "strategy": "Wait to Respond",
+    "authority": "Sacral",
+    "profile": "6/2",
+    "defined_centers": ["Sacral", "Root"]
+}
+
+
+def wait_for(service, narrative_id, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        result = service.poll(narrative_id)
+        if result['status'] != 'pending':
+            return result
+        time.sleep(0.01)
+    return service.poll(narrative_id)
+
+
+@unittest.skipIf(not DEPENDENCIES_INSTALLED, "Required dependencies not installed")
+class NarrativeTests(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.stub = StubModelServer(delay=0.05).__enter__()
+        self.service = NarrativeService(
+            client=InferenceClient(api_url=self.stub.url, model="stub-model", api_key=""),
+            cache=NarrativeCache(self.cache_dir.name),
+            window_ms=20,
+            max_batch_size=8,
+            max_in_flight=1
+        )
+
+    def tearDown(self):
+        self.stub.__exit__(None, None, None)
+        self.cache_dir.cleanup()
+
+    def test_pending_then_cached(self):
+        """Test that a narrative is queued, generated and then served from cache"""
+        first = self.service.request("human_design", CHART)
+        self.assertEqual(first['status'], 'pending')
+
+        polled = wait_for(self.service, first['narrative_id'])
+        self.assertEqual(polled['status'], 'ready')
+        self.assertIn("Type: Generator", polled['text'])
+
+        again = self.service.request("human_design", dict(CHART, personality={}))
+        self.assertEqual(again['status'], 'ready')
+        self.assertEqual(again['narrative_id'], first['narrative_id'])
+        self.assertEqual(self.stub.batch_sizes, [1])
+
+    def test_concurrent_prompts_are_batched(self):
+        """Test that concurrent prompts share inference calls"""
+        charts = [dict(CHART, profile=f"{line}/{line}") for line in range(1, 7)]
+        charts += [{"life_path_number": number, "description": "Theme"} for number in range(1, 10)]
+        kinds = ["human_design"] * 6 + ["numerology"] * 9
+
+        with ThreadPoolExecutor(max_workers=15) as pool:
+            results = list(pool.map(self.service.request, kinds, charts))
+
+        for result in results:
+            self.assertEqual(wait_for(self.service, result['narrative_id'])['status'], 'ready')
+        self.assertEqual(sum(self.stub.batch_sizes), 15)
+        self.assertLess(len(self.stub.batch_sizes), 15)
+        self.assertLessEqual(max(self.stub.batch_sizes), 8)
+
+    def test_unknown_and_invalid(self):
+        """Test polling for ids that were never requested"""
+        self.assertEqual(self.service.poll("../../etc/passwd")['status'], 'unknown')
+        with self.assertRaises(ValueError):
+            self.service.request("tarot", CHART)
+
+
+@unittest.skipIf(not DEPENDENCIES_INSTALLED, "Required dependencies not installed")
+class ResilienceTests(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.stub = StubModelServer().__enter__()
+
+    def tearDown(self):
+        self.stub.__exit__(None, None, None)
+        self.cache_dir.cleanup()
+
+    def test_circuit_opens_falls_back_and_recovers(self):
+        """Test that upstream errors open the circuit, static text is served meanwhile, and a trial call closes it"""
+        client = InferenceClient(
+            api_url=self.stub.url, model="stub-model", api_key="", hedge=False,
+            breaker=CircuitBreaker("test", min_calls=2, failure_rate=0.5, open_seconds=0.3)
+        )
+        service = NarrativeService(client=client, cache=NarrativeCache(self.cache_dir.name),
+                                   window_ms=5, max_batch_size=1, max_in_flight=1, max_failed=1)
+        self.stub.inject(count=2, status=503)
+
+        for line in (1, 2):
+            pending = service.request("human_design", dict(CHART, profile=f"{line}/{line}"))
+            failed = wait_for(service, pending['narrative_id'])
+            self.assertEqual(failed['status'], 'fallback')
+            self.assertIn("Strategy: Wait to Respond", failed['text'])
+        self.assertEqual(client.stats()['state'], 'open')
+        self.assertEqual(service.stats()['failed'], 1)
+
+        immediate = service.request("human_design", dict(CHART, profile="3/3"))
+        self.assertEqual(immediate['status'], 'fallback')
+        self.assertEqual(self.stub.requests, 2)
+
+        time.sleep(0.35)
+        trial = service.request("human_design", dict(CHART, profile="3/3"))
+        self.assertEqual(wait_for(service, trial['narrative_id'])['status'], 'ready')
+        self.assertEqual(client.stats()['state'], 'closed')
+        self.assertEqual(client.stats()['opened'], 1)
+
+    def test_hedged_request_beats_slow_upstream(self):
+        """Test that a call slower than the recent p95 is hedged and the second attempt answers"""
+        client = InferenceClient(api_url=self.stub.url, model="stub-model", api_key="", hedge=True,
+                                 breaker=CircuitBreaker("test", min_calls=3))
+        client.hedge_min_delay = 0.05
+        for _ in range(3):
+            client.generate(["warm"])
+
+        self.stub.inject(count=1, delay=1.0)
+        started = time.perf_counter()
+        self.assertEqual(client.generate(["slow"]), ["Narrative: slow"])
+        self.assertLess(time.perf_counter() - started, 0.5)
+        self.assertEqual((client.stats()['hedged'], client.stats()['hedge_wins']), (1, 1))
+        self.assertEqual(self.stub.requests, 5)
+
+        # The slow loser is recorded on its own once it finishes
+        deadline = time.monotonic() + 3
+        while client.stats()['window_calls'] < 5 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertEqual(client.stats()['window_calls'], 5)
+        self.assertGreater(client.breaker.latency_percentile(1.0), 0.9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,14 @@
 import sys
 import os
+import time
+import json
+import math
+import tempfile
+import threading
 import unittest
-from datetime import datetime
+from unittest import mock
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 
 # Add project root to Python path
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -19,9 +26,23 @@ except ImportError:
 
 # Conditional import
 if DEPENDENCIES_INSTALLED:
-    from backend.services.hugging_face import get_possible_ascendants
-    from backend.services.numerology import calculate_numerology
-    from backend.services.human_design import calculate_human_design
+    from backend.services.hugging_face import get_possible_ascendants, AstrologyCalculator, ZODIAC_SIGNS
+    from backend.services.numerology import calculate_numerology, NumerologyCalculator
+    from backend.services.locations import resolve_location
+    from backend.utils.batching import MicroBatcher
+    from backend.utils.singleflight import SingleFlight
+    from backend.utils.timezones import local_to_utc, local_to_utc_batch
+    from backend.services.human_design import calculate_human_design, HumanDesignCalculator
+    from backend.services.compatibility import BUCKET_COUNT, bucket_code, get_bucket_scores
+    from backend.services.matching import ProfilePool, BUCKET_LABELS
+    from backend.services.forecast import PersonalCycleForecast
+    from backend.services.lunar import LunarTable, get_lunar_table
+    from backend.services.transits import TransitIndex
+    from backend.services.human_design import _apparent_longitude, _wrap_degrees, LINE_WIDTH, MANDALA_START
+    from backend.services.ephemeris import EphemerisSnapshot, SNAPSHOT_BODIES, _sample_longitudes
+    from backend.services.content import get_catalog, reload_catalog
+    from backend.services.compatibility import CompatibilityAnalyzer
+    from backend.config.settings import Config
 
 class ServiceTests(unittest.TestCase):
     @unittest.skipIf(not DEPENDENCIES_INSTALLED, "Required dependencies not installed")
@@ -75,6 +96,422 @@ class ServiceTests(unittest.TestCase):
             self.assertIn('authority', result)
             self.assertIn('description', result)
 
+    @unittest.skipIf(not DEPENDENCIES_INSTALLED, "Required dependencies not installed")
+    def test_human_design_activations(self):
+        """Test Rave Mandala mapping and the 88° design solver"""
+        self.assertEqual(HumanDesignCalculator.get_gate_and_line(302.0), (41, 1))
+        self.assertEqual(HumanDesignCalculator.get_gate_and_line(358.25), (25, 1))
+        self.assertEqual(HumanDesignCalculator.get_gate_and_line(301.99), (60, 6))
+        
+        result = calculate_human_design("1990-05-15", "10:30 AM", "New York")
+        personality_sun = result['personality']['Sun']['longitude']
+        design_sun = result['design']['Sun']['longitude']
+        self.assertAlmostEqual((personality_sun - design_sun) % 360, 88.0, places=3)
+        self.assertEqual(len(result['personality']), 13)
+        self.assertIn(result['type'], HumanDesignCalculator.DESIGN_TYPES)
+        self.assertEqual(result['profile'], "6/3")
+
+    @unittest.skipIf(not DEPENDENCIES_INSTALLED, "Required dependencies not installed")
+    def test_ascendant_sweep(self):
+        """Test full-day Ascendant windows against point calculations"""
+        windows = AstrologyCalculator.sweep_ascendants("1990-05-15", resolve_location("New York"))
+        
+        self.assertEqual(windows[0]['start'], "1990-05-15T00:00:00-04:00")
+        self.assertEqual(windows[-1]['end'], "1990-05-16T00:00:00-04:00")
+        self.assertEqual(len({window['sign'] for window in windows}), 12)
+        
+        for window in windows:
+            start = datetime.fromisoformat(window['start'])
+            end = datetime.fromisoformat(window['end'])
+            self.assertLess(start, end)
+            midpoint = start + (end - start) / 2
+            point = AstrologyCalculator.calculate_ascendant(
+                midpoint.strftime("%Y-%m-%d"), midpoint.strftime("%I:%M %p"), "New York"
+            )
+            self.assertEqual(point['sign'], window['sign'])
+
+    @unittest.skipIf(not DEPENDENCIES_INSTALLED, "Required dependencies not installed")
+    def test_ascendant_boundaries_on_eastern_horizon(self):
+        """Test sweep boundaries against ephem's own ecliptic-to-horizon transform"""
+        for place, birth_date in (("New York", "1990-05-15"), ("Sydney", "2001-12-03"), ("Stockholm", "1985-06-21")):
+            location = resolve_location(place)
+            observer = ephem.Observer()
+            observer.lat, observer.lon = str(location.latitude), str(location.longitude)
+            observer.pressure = 0  # geometric horizon, no refraction
+            
+            # Each window after the first starts when its sign's 0° point rises
+            for window in AstrologyCalculator.sweep_ascendants(birth_date, location)[1:]:
+                instant = ephem.Date(datetime.fromisoformat(window['start']).astimezone(pytz.utc).replace(tzinfo=None))
+                cusp = ephem.Ecliptic(math.radians(30 * ZODIAC_SIGNS.index(window['sign'])), 0, epoch=instant)
+                equatorial = ephem.Equatorial(cusp, epoch=instant)
+                point = ephem.FixedBody()
+                point._ra, point._dec, point._epoch = equatorial.ra, equatorial.dec, instant
+                observer.date = instant
+                point.compute(observer)
+                self.assertAlmostEqual(math.degrees(point.alt), 0.0, delta=0.02, msg=f"{place} {window}")
+                self.assertLess(math.degrees(point.az), 180.0, msg=f"{place} {window} sets in the west")
+
+    @unittest.skipIf(not DEPENDENCIES_INSTALLED, "Required dependencies not installed")
+    def test_numerology_batch_matches_single(self):
+        """Test vectorized life path path against the per-date path"""
+        dates = ["1990-05-15", "1985-12-22", "2000-02-29", "2001-02-29", "1999-13-01", "bad", None]
+        batch = NumerologyCalculator.calculate_life_path_batch(dates)
+        
+        self.assertEqual(batch, [calculate_numerology(date) for date in dates])
+        self.assertIn('error', batch[3])
+    
+    @unittest.skipIf(not DEPENDENCIES_INSTALLED, "Required dependencies not installed")
+    def test_name_numerology(self):
+        """Test name numbers, transliteration and the batch path"""
+        self.assertEqual(NumerologyCalculator.calculate_name_numbers("John Smith"), {
+            "expression_number": 8, "soul_urge_number": 6, "personality_number": 11
+        })
+        self.assertEqual(
+            NumerologyCalculator.calculate_name_numbers("Zoë Łukasiewicz"),
+            NumerologyCalculator.calculate_name_numbers("Zoe Lukasiewicz")
+        )
+        
+        names = ["John Smith", "", "Björk Guðmundsdóttir", "王小明", None, "Ann"]
+        self.assertEqual(
+            NumerologyCalculator.calculate_name_numbers_batch(names),
+            [NumerologyCalculator.calculate_name_numbers(name) for name in names]
+        )
+    
+    @unittest.skipIf(not DEPENDENCIES_INSTALLED, "Required dependencies not installed")
+    def test_personal_cycle_forecast(self):
+        """Test vectorized personal cycles against digit-by-digit reduction"""
+        def reduce_digits(number):
+            while number > 9:
+                number = sum(int(digit) for digit in str(number))
+            return number
+        
+        forecast = PersonalCycleForecast("1990-05-15", "2023-12-25", "2025-03-05")
+        compact = forecast.to_compact()
+        day = datetime(2023, 12, 25)
+        for index in range(len(forecast)):
+            personal_year = reduce_digits(5 + 15 + sum(int(digit) for digit in str(day.year)))
+            personal_month = reduce_digits(personal_year + day.month)
+            personal_day = reduce_digits(personal_month + day.day)
+            self.assertEqual(int(compact["personal_days"][index]), personal_day)
+            self.assertEqual(
+                (forecast.personal_year[index], forecast.personal_month[index]), (personal_year, personal_month)
+            )
+            day += timedelta(days=1)
+        
+        self.assertEqual([entry["year"] for entry in compact["personal_years"]], [2023, 2024, 2025])
+        self.assertEqual(len(compact["personal_months"]), 16)
+        lines = ''.join(forecast.iter_ndjson()).splitlines()
+        self.assertEqual(len(lines), len(forecast))
+        self.assertEqual(
+            lines[0], '{"date":"2023-12-25","personal_year":9,"personal_month":3,"personal_day":1}'
+        )
+    
+    @unittest.skipIf(not DEPENDENCIES_INSTALLED, "Required dependencies not installed")
+    def test_micro_batcher(self):
+        """Test that concurrent submissions are collected into batches"""
+        batcher = MicroBatcher(lambda items: [item * 2 for item in items], window_ms=20, max_batch_size=8)
+        
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(lambda item: batcher.submit(item).result(timeout=5), range(32)))
+        
+        self.assertEqual(results, [item * 2 for item in range(32)])
+        stats = batcher.stats()
+        self.assertEqual(stats['items'], 32)
+        self.assertLess(stats['batches'], 32)
+        self.assertLessEqual(max(stats['batch_size_distribution']), 8)
+
+    @unittest.skipIf(not DEPENDENCIES_INSTALLED, "Required dependencies not installed")
+    def test_timezone_resolution(self):
+        """Test local-to-UTC conversion across DST gaps and overlaps"""
+        regular = local_to_utc(datetime(1990, 5, 15, 10, 30), "America/New_York")
+        self.assertEqual((regular.utc, regular.status), (datetime(1990, 5, 15, 14, 30), "ok"))
+        
+        skipped = local_to_utc(datetime(2021, 3, 14, 2, 30), "America/New_York")
+        self.assertEqual((skipped.utc, skipped.status), (datetime(2021, 3, 14, 7, 0), "nonexistent"))
+        
+        earlier = local_to_utc(datetime(2021, 11, 7, 1, 30), "America/New_York")
+        later = local_to_utc(datetime(2021, 11, 7, 1, 30), "America/New_York", ambiguous="later")
+        self.assertEqual(earlier.status, "ambiguous")
+        self.assertEqual(later.utc - earlier.utc, timedelta(hours=1))
+        with self.assertRaises(pytz.exceptions.AmbiguousTimeError):
+            local_to_utc(datetime(2021, 11, 7, 1, 30), "America/New_York", ambiguous="raise")
+        
+        local_times = numpy.array(["1990-05-15T10:30", "1990-12-15T10:30"], dtype="datetime64[s]")
+        utc_times, offsets, _ = local_to_utc_batch(local_times, "Europe/London")
+        self.assertEqual(offsets.tolist(), [3600, 0])
+        self.assertEqual(str(utc_times[0]), "1990-05-15T09:30:00")
+        
+        self.assertEqual(resolve_location("São Paulo, Brazil").timezone, "America/Sao_Paulo")
+        self.assertFalse(resolve_location("Atlantis").resolved)
+        self.assertEqual(resolve_location("New York, NY, U.S.A.").timezone, "America/New_York")
+        self.assertEqual(resolve_location("London, England").timezone, "Europe/London")
+        # A qualifier that does not fit the city must not resolve to its namesake
+        self.assertFalse(resolve_location("Paris, Texas").resolved)
+        self.assertFalse(resolve_location("Portland, Oregon").resolved)
+    
+    @unittest.skipIf(not DEPENDENCIES_INSTALLED, "Required dependencies not installed")
+    def test_single_flight(self):
+        """Test that concurrent identical calls share one computation"""
+        calls = []
+        release = threading.Event()
+        
+        def compute(birth_date):
+            calls.append(birth_date)
+            release.wait(2)
+            return {"birth_date": birth_date}
+        
+        flights = SingleFlight("test")
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [executor.submit(flights.do, ("chart", "1990-05-15"), compute, "1990-05-15") for _ in range(8)]
+            while flights.stats()["suppressed"] < 7:
+                time.sleep(0.001)
+            release.set()
+            results = [future.result() for future in futures]
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result == {"birth_date": "1990-05-15"} for result in results))
+        self.assertEqual(flights.stats()["in_flight"], 0)
+        
+        # Two instances stand in for two worker processes sharing lock files
+        with tempfile.TemporaryDirectory() as directory:
+            workers = [SingleFlight("test", cross_process=True, directory=directory) for _ in range(2)]
+            calls.clear()
+            release.clear()
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                first = executor.submit(workers[0].do, "key", compute, "1985-12-22")
+                while not calls:
+                    time.sleep(0.001)
+                second = executor.submit(workers[1].do, "key", compute, "1985-12-22")
+                time.sleep(0.05)
+                release.set()
+                self.assertEqual(first.result(), second.result())
+            self.assertEqual(len(calls), 1)
+            self.assertEqual(workers[1].stats()["shared_across_processes"], 1)
+
+    @unittest.skipIf(not DEPENDENCIES_INSTALLED, "Required dependencies not installed")
+    def test_human_design_flight_key(self):
+        """Test that equivalent birth time spellings share one Human Design flight"""
+        from backend.services import scheduling
+        self.assertEqual(HumanDesignCalculator.normalize_birth_time(''), "12:00 PM")
+        self.assertEqual(HumanDesignCalculator.normalize_birth_time("14:30"), "02:30 PM")
+        self.assertEqual(HumanDesignCalculator.normalize_birth_time("2:30 pm"), "02:30 PM")
+        self.assertEqual(calculate_human_design("1990-05-15", "14:30", "London"),
+                         calculate_human_design("1990-05-15", "2:30 PM", "London"))
+
+        calls = []
+        release = threading.Event()
+
+        def compute(birth_date, birth_time, birth_location):
+            calls.append(birth_time)
+            release.wait(2)
+            return {"type": "Generator"}
+
+        with mock.patch.object(scheduling, 'calculate_human_design', compute), \
+                ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(scheduling.schedule_human_design, "1990-05-15", birth_time, "London")
+                       for birth_time in (None, '', "12:00 PM", "12:00")]
+            while scheduling.chart_flights.stats()["in_flight"] == 0 or not calls:
+                time.sleep(0.001)
+            time.sleep(0.05)
+            release.set()
+            self.assertTrue(all(future.result() == {"type": "Generator"} for future in futures))
+        self.assertEqual(len(calls), 1)
+
+    @unittest.skipIf(not DEPENDENCIES_INSTALLED, "Required dependencies not installed")
+    def test_profile_pool_ranking(self):
+        """Test bucketed top-k against ranking every profile"""
+        rng = numpy.random.default_rng(3)
+        buckets = rng.integers(0, BUCKET_COUNT, 2000)
+        pool = ProfilePool(rng.permutation(2000), buckets)
+        life_path_number, design_type = BUCKET_LABELS[17]
+        
+        scores = get_bucket_scores()[17][pool.buckets]
+        expected = pool.profile_ids[numpy.lexsort((pool.profile_ids, pool.buckets, -scores))].tolist()
+        pages = [pool.top_k(life_path_number, design_type, limit=50, offset=offset) for offset in (0, 50, 1990)]
+        self.assertEqual([match['profile_id'] for match in pages[0]['matches']], expected[:50])
+        self.assertEqual([match['profile_id'] for match in pages[1]['matches']], expected[50:100])
+        self.assertEqual(len(pages[2]['matches']), 10)
+        self.assertIsNone(pages[2]['next_offset'])
+        
+        own_id = expected[0]
+        filtered = pool.top_k(
+            life_path_number, design_type, limit=2000, design_types=["Projector"], min_score=0.7, exclude_ids=[own_id]
+        )
+        self.assertNotIn(own_id, [match['profile_id'] for match in filtered['matches']])
+        self.assertEqual(filtered['total'], len(filtered['matches']))
+        self.assertTrue(all(
+            match['human_design_type'] == "Projector" and match['score'] >= 0.7 for match in filtered['matches']
+        ))
+    
+    @unittest.skipIf(not DEPENDENCIES_INSTALLED, "Required dependencies not installed")
+    def test_lunar_table(self):
+        """Test the memory-mapped lunar table against ephem"""
+        table = LunarTable.build(datetime(2024, 1, 1).date(), datetime(2024, 3, 31).date())
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'lunar_table.bin')
+            table.save(path)
+            loaded = LunarTable.load(path)
+            
+            cycles = loaded.cycles_at(datetime(2024, 2, 20, 12))
+            new_moon = ephem.previous_new_moon('2024/2/20 12:00').datetime()
+            self.assertEqual(cycles["current_cycle"]["new_moon"], new_moon.strftime('%Y-%m-%dT%H:%MZ'))
+            self.assertEqual(cycles["next_cycle"]["new_moon"], cycles["current_cycle"]["next_new_moon"])
+            self.assertLess(cycles["current_cycle"]["new_moon"], cycles["current_cycle"]["full_moon"])
+            self.assertEqual(cycles["moon"]["cycle_day"], 11)
+            self.assertIn(cycles["moon"]["phase"], ("Waxing Gibbous", "Full Moon"))
+            
+            moon = ephem.Moon('2024/2/20 12:00')
+            self.assertAlmostEqual(cycles["moon"]["illumination"], moon.moon_phase * 100, delta=1)
+            with self.assertRaises(ValueError):
+                loaded.cycles_at(datetime(2024, 6, 1))
+
+            # A missing table is an error, never built in the request path
+            get_lunar_table.cache_clear()
+            self.addCleanup(get_lunar_table.cache_clear)
+            with mock.patch.object(Config, 'LUNAR_TABLE_PATH', os.path.join(directory, 'missing.bin')), \
+                    mock.patch.object(LunarTable, 'build') as build:
+                with self.assertRaises(FileNotFoundError):
+                    get_lunar_table()
+                build.assert_not_called()
+
+    @unittest.skipIf(not DEPENDENCIES_INSTALLED, "Required dependencies not installed")
+    def test_transit_index(self):
+        """Test indexed ingresses and stations against ephem"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'transit_index.bin')
+            TransitIndex.build(2024, 2024).save(path)
+            index = TransitIndex.load(path)
+            
+            events = index.query(datetime(2024, 3, 25), datetime(2024, 4, 30), bodies=["Mercury", "Sun"])
+            self.assertEqual(
+                [(event["body"], event["event"], event["sign"]) for event in events],
+                [("Mercury", "station_retrograde", "Aries"), ("Sun", "ingress", "Taurus"),
+                 ("Mercury", "station_direct", "Aries")]
+            )
+            
+            ingress = datetime.strptime(events[1]["time"], '%Y-%m-%dT%H:%MZ')
+            for minutes, expected_sign in ((-2, 0), (2, 1)):
+                longitude = _apparent_longitude(ephem.Sun(), ephem.Date(ingress + timedelta(minutes=minutes)))
+                self.assertEqual(int(longitude // 30), expected_sign)
+            
+            week = index.query(datetime(2024, 6, 1), datetime(2024, 6, 8), kinds=["new_moon", "ingress"])
+            self.assertEqual([event["time"] for event in week], sorted(event["time"] for event in week))
+            self.assertIn(("Moon", "new_moon"), [(event["body"], event["event"]) for event in week])
+            self.assertFalse(index.covers(datetime(2025, 1, 1), datetime(2025, 1, 2)))
+    
+    @unittest.skipIf(not DEPENDENCIES_INSTALLED, "Required dependencies not installed")
+    def test_ephemeris_snapshot(self):
+        """Test interpolated snapshot positions against ephem at random instants"""
+        snapshot = EphemerisSnapshot.build(datetime(2019, 12, 1).date(), datetime(2021, 1, 31).date())
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'ephemeris.bin')
+            snapshot.save(path)
+            loaded = EphemerisSnapshot.load(path)
+            self.assertIsInstance(loaded.longitudes, numpy.memmap)
+            
+            dates = loaded.start + numpy.random.default_rng(2).uniform(0, loaded.end - loaded.start, 200)
+            longitudes, speeds = loaded.interpolate(dates)
+            for column, name in enumerate(SNAPSHOT_BODIES):
+                error = numpy.abs(_wrap_degrees(longitudes[:, column] - _sample_longitudes(name, dates)))
+                self.assertLess(error.max() * 3600, 5.0, name)
+            
+            moon_speed = _wrap_degrees(
+                _sample_longitudes("Moon", dates + 0.01) - _sample_longitudes("Moon", dates - 0.01)
+            ) / 0.02
+            self.assertLess(numpy.abs(speeds[:, 1] - moon_speed).max(), 0.01)
+            
+            positions = loaded.positions(dates[0])
+            self.assertAlmostEqual(positions["Sun"]["longitude"], float(longitudes[0, 0]), places=6)
+            with self.assertRaises(ValueError):
+                loaded.interpolate(loaded.end + 1)
+            
+            # Activations read from the snapshot match ephem except within its error of a line edge
+            with mock.patch('backend.services.human_design.get_ephemeris_snapshot', return_value=loaded):
+                interpolated = [HumanDesignCalculator.calculate_activations(date) for date in dates[:50].tolist()]
+            with mock.patch('backend.services.human_design.get_ephemeris_snapshot', return_value=None):
+                computed = [HumanDesignCalculator.calculate_activations(date) for date in dates[:50].tolist()]
+            for fast, exact in zip(interpolated, computed):
+                self.assertEqual(list(fast), list(exact))
+                for name, activation in exact.items():
+                    offset = (activation["longitude"] - MANDALA_START) % LINE_WIDTH
+                    if min(offset, LINE_WIDTH - offset) * 3600 > 5.0:
+                        self.assertEqual(
+                            (fast[name]["gate"], fast[name]["line"]), (activation["gate"], activation["line"]), name
+                        )
+                    self.assertLess(abs(_wrap_degrees(fast[name]["longitude"] - activation["longitude"])) * 3600, 5.0, name)
+    
+    @unittest.skipIf(not DEPENDENCIES_INSTALLED, "Required dependencies not installed")
+    def test_content_catalog_reload(self):
+        """Test that catalog entries are shared, read-only and swapped on reload"""
+        catalog = get_catalog()
+        challenges = NumerologyCalculator.get_life_challenges(1)
+        self.assertIs(challenges, NumerologyCalculator.get_life_challenges(1))
+        with self.assertRaises(TypeError):
+            challenges["core_challenge"] = "changed"
+        self.assertEqual(
+            CompatibilityAnalyzer.analyze_numerology_compatibility(3, 1)["compatibility_description"],
+            "Creative and inspiring partnership"
+        )
+        
+        with open(Config.CONTENT_CATALOG_PATH, encoding='utf-8') as catalog_file:
+            content = json.load(catalog_file)
+        content["version"] = "reload-test"
+        content["numerology"]["life_paths"]["7"]["description"] = "Reloaded"
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'catalog.json')
+            with open(path, 'w', encoding='utf-8') as catalog_file:
+                json.dump(content, catalog_file)
+            try:
+                with mock.patch.object(Config, 'CONTENT_CATALOG_PATH', path):
+                    self.assertTrue(reload_catalog()["reloaded"])
+                    self.assertEqual(NumerologyCalculator.get_life_path_description(7), "Reloaded")
+                    
+                    with open(path, 'w', encoding='utf-8') as catalog_file:
+                        catalog_file.write('{"version": ')
+                    result = reload_catalog(force=True)
+                    self.assertFalse(result["reloaded"])
+                    self.assertEqual(result["version"], "reload-test")
+            finally:
+                reload_catalog(force=True)
+        self.assertEqual(get_catalog().version, catalog.version)
+    
+    @unittest.skipIf(not DEPENDENCIES_INSTALLED, "Required dependencies not installed")
+    def test_bucket_scores_follow_catalog(self):
+        """Test that match scores come from the catalog pairs and follow a reload"""
+        catalog = get_catalog()
+        scores = get_bucket_scores()
+        self.assertEqual(
+            scores[bucket_code(1, "Manifestor"), bucket_code(3, "Generator")],
+            numpy.float32(0.5 * catalog.numerology_scores[(1, 3)] + 0.5 * catalog.human_design_scores[("Manifestor", "Generator")])
+        )
+        # Pairs without catalog text score the default, like their description
+        self.assertNotIn(("Manifestor", "Manifesting Generator"), catalog.human_design_pairs)
+        self.assertEqual(
+            scores[bucket_code(9, "Manifestor"), bucket_code(9, "Manifesting Generator")],
+            numpy.float32(0.5 * catalog.numerology_default_score + 0.5 * catalog.human_design_default_score)
+        )
+        with self.assertRaises(ValueError):
+            scores[0, 0] = 1.0
+        
+        with open(Config.CONTENT_CATALOG_PATH, encoding='utf-8') as catalog_file:
+            content = json.load(catalog_file)
+        content["version"] = "score-test"
+        content["compatibility"]["numerology"]["pairs"][0]["score"] = 0.1
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'catalog.json')
+            with open(path, 'w', encoding='utf-8') as catalog_file:
+                json.dump(content, catalog_file)
+            try:
+                with mock.patch.object(Config, 'CONTENT_CATALOG_PATH', path):
+                    reload_catalog()
+                    reloaded = get_bucket_scores()
+                    self.assertAlmostEqual(
+                        float(reloaded[bucket_code(3, "Projector"), bucket_code(1, "Projector")]),
+                        0.5 * 0.1 + 0.5 * catalog.human_design_default_score, places=6
+                    )
+            finally:
+                reload_catalog(force=True)
+        self.assertEqual(get_catalog().version, catalog.version)
+
 def print_dependency_status():
     """Print dependency installation status"""
     print("Dependency Status:")
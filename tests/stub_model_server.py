@@ -0,0 +1,73 @@
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubModelServer:
+    """
+    Local stand-in for the Hugging Face inference API.
+
+    Echoes each prompt back as generated text and records the size of
+    every batch it receives. Faults queued with ``inject`` apply to the
+    next requests in order: an HTTP error status, or extra delay.
+    """
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.batch_sizes = []
+        self.requests = 0
+        self._faults = deque()
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                prompts = body['inputs'] if isinstance(body['inputs'], list) else [body['inputs']]
+                with stub._lock:
+                    stub.requests += 1
+                    stub.batch_sizes.append(len(prompts))
+                    status, delay = stub._faults.popleft() if stub._faults else (200, 0.0)
+                time.sleep(stub.delay + delay)
+
+                if status != 200:
+                    self.send_response(status)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                payload = json.dumps([{"generated_text": f"Narrative: {prompt}"} for prompt in prompts]).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/models"
+
+    def inject(self, count: int = 1, status: int = 200, delay: float = 0.0):
+        """
+        Fail or slow down the next ``count`` requests.
+
+        Args:
+            count (int): Requests affected
+            status (int): HTTP status to answer with instead of 200
+            delay (float): Extra seconds before answering
+        """
+        with self._lock:
+            self._faults.extend([(status, delay)] * count)
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,48 @@
+"""
+Fingerprint and pre-compress the frontend build for ``api/index.py``.
+
+Run after ``npm run build``. Writes content-hashed copies with gzip and
+brotli variants plus ``assets.manifest.json`` to ``Config.STATIC_ASSET_DIR``.
+
+Example:
+    python tools/build_assets.py --source frontend/build --output static-assets
+"""
+import os
+import sys
+import argparse
+from typing import Dict, List, Any, Optional
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from backend.config.settings import Config  # noqa: E402
+from backend.utils.assets import build_assets, brotli  # noqa: E402
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--source', default=os.path.join(PROJECT_ROOT, Config.STATIC_ASSET_SOURCE_DIR))
+    parser.add_argument('--output', default=os.path.join(PROJECT_ROOT, Config.STATIC_ASSET_DIR))
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.source):
+        parser.error(f"Build directory {args.source} does not exist; run the frontend build first")
+    if brotli is None:
+        print("brotli is not installed; writing gzip variants only")
+
+    manifest = build_assets(args.source, args.output)
+    assets = manifest['assets'].values()
+    totals = {
+        'files': len(manifest['assets']),
+        'identity_bytes': sum(asset['size'] for asset in assets),
+        'gzip_bytes': sum(asset['encodings'].get('gzip', asset)['size'] for asset in assets),
+        'br_bytes': sum(asset['encodings'].get('br', asset)['size'] for asset in assets)
+    }
+    for name, value in totals.items():
+        print(f"{name:<16}{value:>12}")
+    print(f"manifest written to {args.output}")
+    return totals
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Server CPU cost versus bytes saved by each response encoding.
+
+Runs the load harness (``tools/loadtest.py``) once per encoding, with the
+same traffic and seed, sending ``Accept-Encoding: <encoding>`` on every
+request; the ``identity`` run is the uncompressed baseline. For each
+encoding it reports the server's CPU time per request (gunicorn and its
+workers, read from ``/proc``, so Linux only), the mean body and wire
+bytes per request and per route, and the extra CPU paid per kilobyte
+saved. Encodings the server cannot produce fall back to identity and
+show no saving.
+
+Example:
+    python tools/compression_report.py --duration 20 --encodings identity,gzip,br,zstd
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+from typing import Any, Dict, List, Optional
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from tools import loadtest  # noqa: E402
+
+DEFAULT_PROFILE = os.path.join(os.path.dirname(__file__), 'profiles', 'bandwidth.json')
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--encodings', default='identity,gzip,br,zstd', help='Comma-separated, identity first')
+    parser.add_argument('--profile', default=DEFAULT_PROFILE, help='Traffic profile JSON')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=20.0)
+    parser.add_argument('--warmup', type=float, default=3.0)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--output', help='Write the report as JSON')
+    args = parser.parse_args(argv)
+
+    encodings = [encoding.strip() for encoding in args.encodings.split(',') if encoding.strip()]
+    if 'identity' not in encodings:
+        encodings.insert(0, 'identity')
+
+    runs = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for encoding in encodings:
+            print(f"--- Accept-Encoding: {encoding}")
+            runs[encoding] = loadtest.main([
+                '--profile', args.profile, '--mode', 'closed', '--concurrency', str(args.concurrency),
+                '--duration', str(args.duration), '--warmup', str(args.warmup), '--workers', str(args.workers),
+                '--header', f'Accept-Encoding: {encoding}', '--output', os.path.join(directory, f'{encoding}.json')
+            ])
+
+    baseline = runs['identity']
+    baseline_cpu = (baseline['server_cpu'] or {}).get('ms_per_request')
+    report = {}
+    for encoding, run in runs.items():
+        overall = run['routes']['all']
+        cpu_ms = (run['server_cpu'] or {}).get('ms_per_request')
+        saved = baseline['routes']['all']['mean_wire_bytes'] - overall['mean_wire_bytes']
+        extra_cpu_us = (cpu_ms - baseline_cpu) * 1000 if cpu_ms is not None and baseline_cpu is not None else None
+        report[encoding] = {
+            'throughput_rps': overall['throughput_rps'],
+            'p95_ms': overall['latency_ms']['p95'],
+            'cpu_ms_per_request': cpu_ms,
+            'mean_body_bytes': overall['mean_body_bytes'],
+            'mean_wire_bytes': overall['mean_wire_bytes'],
+            'saved_bytes_per_request': round(saved, 1),
+            'extra_cpu_us_per_kb_saved': round(extra_cpu_us / (saved / 1024), 1) if extra_cpu_us is not None and saved > 0 else None,
+            'routes': {
+                route: {'mean_body_bytes': stats['mean_body_bytes'], 'mean_wire_bytes': stats['mean_wire_bytes']}
+                for route, stats in run['routes'].items() if route != 'all'
+            }
+        }
+
+    print(f"\n{'encoding':<10}{'rps':>9}{'p95 ms':>9}{'cpu ms/req':>12}{'body B':>10}{'wire B':>10}{'saved B':>10}{'cpu us/KB':>11}")
+    for encoding, stats in report.items():
+        print(
+            f"{encoding:<10}{stats['throughput_rps']:>9}{stats['p95_ms']:>9}{str(stats['cpu_ms_per_request']):>12}"
+            f"{stats['mean_body_bytes']:>10}{stats['mean_wire_bytes']:>10}{stats['saved_bytes_per_request']:>10}"
+            f"{str(stats['extra_cpu_us_per_kb_saved']):>11}"
+        )
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(report, output_file, indent=2)
+    return report
+
+
+if __name__ == '__main__':
+    main()
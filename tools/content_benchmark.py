@@ -0,0 +1,110 @@
+"""
+Per-call allocation cost of the interpretation content lookups.
+
+For every lookup the report shows the time per call, the memory a call
+allocates and frees again before returning (tracemalloc peak minus what
+is still live afterwards), and the memory its result holds on to, which
+becomes garbage once the response is sent. Content served from the
+load-once catalog should allocate (almost) nothing per call.
+
+Example:
+    python tools/content_benchmark.py --iterations 100000
+"""
+import gc
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+
+def _cases() -> Dict[str, Callable[[], Any]]:
+    from backend.services.numerology import NumerologyCalculator
+    from backend.services.human_design import HumanDesignCalculator, get_human_design_type_details
+    from backend.services.compatibility import CompatibilityAnalyzer
+
+    return {
+        'life_path_description': lambda: NumerologyCalculator.get_life_path_description(7),
+        'life_challenges': lambda: NumerologyCalculator.get_life_challenges(1),
+        'career_suggestions': lambda: NumerologyCalculator.get_career_suggestions(3),
+        'type_compatibility': lambda: HumanDesignCalculator.get_type_compatibility("Generator"),
+        'type_details': lambda: get_human_design_type_details("Projector"),
+        'human_design_compatibility': lambda: CompatibilityAnalyzer.analyze_human_design_compatibility("Manifestor", "Generator"),
+        'numerology_compatibility': lambda: CompatibilityAnalyzer.analyze_numerology_compatibility(3, 1),
+        'calculate_life_path': lambda: NumerologyCalculator.calculate_life_path("1990-05-15")
+    }
+
+
+def _transient_bytes(function: Callable[[], Any], samples: int = 200) -> int:
+    """Median bytes allocated and released again by one call."""
+    results = []
+    tracemalloc.start()
+    try:
+        for _ in range(samples):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            result = function()
+            current, peak = tracemalloc.get_traced_memory()
+            results.append(peak - max(current, before))
+            del result
+    finally:
+        tracemalloc.stop()
+    results.sort()
+    return results[len(results) // 2]
+
+
+def _result_bytes(function: Callable[[], Any], samples: int = 1000) -> float:
+    """Mean bytes newly allocated for, and kept alive by, each result."""
+    results = [None] * samples
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for index in range(samples):
+            results[index] = function()
+        return (tracemalloc.get_traced_memory()[0] - before) / samples
+    finally:
+        tracemalloc.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=100000)
+    parser.add_argument('--output', help='Write the report as JSON')
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.CRITICAL)
+    cases = _cases()
+    for function in cases.values():  # load anything lazily loaded first
+        function()
+
+    report = {}
+    for name, function in cases.items():
+        started = time.perf_counter()
+        for _ in range(args.iterations):
+            function()
+        elapsed = time.perf_counter() - started
+        report[name] = {
+            'ns_per_call': round(elapsed / args.iterations * 1e9),
+            'transient_bytes': _transient_bytes(function),
+            'result_bytes': round(_result_bytes(function))
+        }
+
+    print(f"{'lookup':<30}{'ns/call':>10}{'transient B':>13}{'result B':>10}")
+    for name, stats in report.items():
+        print(f"{name:<30}{stats['ns_per_call']:>10}{stats['transient_bytes']:>13}{stats['result_bytes']:>10}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(report, output_file, indent=2)
+    return report
+
+
+if __name__ == '__main__':
+    main()
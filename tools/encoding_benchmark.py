@@ -0,0 +1,102 @@
+"""
+Payload size and encode/decode time of JSON versus MessagePack and CBOR.
+
+Each payload is encoded through the app's ``jsonify`` in a request
+context whose ``Accept`` header selects the format, so the times include
+building the Flask response, as in a real request. Decoding is what a
+client pays: ``json.loads``, ``msgpack.unpackb`` or ``cbor2.loads``.
+Formats whose package is not installed are skipped.
+
+Example:
+    python tools/encoding_benchmark.py --iterations 50
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+from typing import Any, Callable, Dict, List, Optional
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+
+def _payloads() -> Dict[str, Any]:
+    import datetime
+    from backend.services.numerology import NumerologyCalculator
+    from backend.services.human_design import calculate_human_design
+    from backend.services.forecast import calculate_forecast
+    from backend.services.transits import find_transits
+
+    start = datetime.date(1950, 1, 1)
+    birth_dates = [(start + datetime.timedelta(days=day * 17)).isoformat() for day in range(2000)]
+    payloads = {
+        'human_design_chart': calculate_human_design("1990-05-15", "10:30 AM", "London"),
+        'numerology_batch_2000': {"charts": NumerologyCalculator.calculate_life_path_batch(birth_dates)},
+        'forecast_year': calculate_forecast("1990-05-15", "2026-01-01", "2026-12-31").to_compact()
+    }
+    try:
+        payloads['transits_year'] = find_transits("2026-01-01", "2026-12-31")
+    except ValueError:  # no transit index built
+        pass
+    return payloads
+
+
+def _us_per_call(function: Callable[[], Any], iterations: int) -> float:
+    function()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return round((time.perf_counter() - started) / iterations * 1e6, 1)
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--output', help='Write the report as JSON')
+    args = parser.parse_args(argv)
+
+    from flask import jsonify
+    from backend.app import app
+    from backend.utils import serialization
+    from backend.utils.serialization import FORMAT_MEDIA_TYPES, JSON_TYPE, available_formats
+    logging.disable(logging.CRITICAL)
+
+    decoders = {'json': json.loads}
+    if serialization.msgpack is not None:
+        decoders['msgpack'] = lambda data: serialization.msgpack.unpackb(data, raw=False, strict_map_key=False)
+    if serialization.cbor2 is not None:
+        decoders['cbor'] = serialization.cbor2.loads
+    media_types = {'json': JSON_TYPE, **{name: FORMAT_MEDIA_TYPES[name][0] for name in available_formats()}}
+
+    report = {}
+    for payload_name, payload in _payloads().items():
+        report[payload_name] = {}
+        for format_name, media_type in media_types.items():
+            with app.test_request_context(headers={'Accept': media_type}):
+                body = jsonify(payload).get_data()
+                encode_us = _us_per_call(lambda: jsonify(payload).get_data(), args.iterations)
+            report[payload_name][format_name] = {
+                'bytes': len(body),
+                'encode_us': encode_us,
+                'decode_us': _us_per_call(lambda: decoders[format_name](body), args.iterations)
+            }
+
+    print(f"{'payload':<24}{'format':<10}{'bytes':>10}{'vs json':>9}{'encode us':>12}{'decode us':>12}")
+    for payload_name, formats in report.items():
+        json_bytes = formats['json']['bytes']
+        for format_name, stats in formats.items():
+            print(
+                f"{payload_name:<24}{format_name:<10}{stats['bytes']:>10}{stats['bytes'] / json_bytes:>9.2f}"
+                f"{stats['encode_us']:>12}{stats['decode_us']:>12}"
+            )
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(report, output_file, indent=2)
+    return report
+
+
+if __name__ == '__main__':
+    main()
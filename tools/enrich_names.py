@@ -0,0 +1,108 @@
+"""
+Add name numerology columns to a user table.
+
+Reads a CSV, computes expression, soul urge and personality numbers for
+the name column with ``NumerologyCalculator.calculate_name_numbers_batch``
+in chunks, and writes the table back out with the new columns. With
+``--benchmark`` it instead times the batch path, the single-name path and
+a per-character dict lookup on synthetic names.
+
+Example:
+    python tools/enrich_names.py users.csv users-enriched.csv --name-column full_name
+    python tools/enrich_names.py --benchmark 200000
+"""
+import os
+import csv
+import sys
+import time
+import random
+import argparse
+from typing import Dict, List, Any, Optional
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from backend.services.numerology import NumerologyCalculator, LETTER_VALUES, VOWELS, ascii_name  # noqa: E402
+
+NAME_COLUMNS = ('expression_number', 'soul_urge_number', 'personality_number')
+SAMPLE_NAMES = ("José", "María", "Zoë", "Łukasz", "Søren", "Anaïs", "John", "Smith", "Nguyễn", "Müller", "O'Brien", "Ann-Marie")
+
+
+def enrich(input_path: str, output_path: str, name_column: str, chunk_size: int) -> int:
+    with open(input_path, newline='', encoding='utf-8') as input_file, \
+            open(output_path, 'w', newline='', encoding='utf-8') as output_file:
+        reader = csv.DictReader(input_file)
+        if name_column not in (reader.fieldnames or []):
+            raise SystemExit(f"Column {name_column!r} not found in {input_path}")
+        writer = csv.DictWriter(output_file, fieldnames=list(reader.fieldnames) + list(NAME_COLUMNS))
+        writer.writeheader()
+
+        rows = 0
+        chunk = []
+        for row in reader:
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                rows += _write_chunk(writer, chunk, name_column)
+                chunk = []
+        rows += _write_chunk(writer, chunk, name_column)
+    return rows
+
+
+def _write_chunk(writer: csv.DictWriter, rows: List[Dict[str, str]], name_column: str) -> int:
+    numbers = NumerologyCalculator.calculate_name_numbers_batch([row[name_column] for row in rows])
+    for row, result in zip(rows, numbers):
+        writer.writerow(dict(row, **{column: result.get(column, '') for column in NAME_COLUMNS}))
+    return len(rows)
+
+
+def _dict_lookup(name: str) -> tuple:
+    # Per-character reference implementation
+    expression = soul_urge = 0
+    for character in ascii_name(name).upper():
+        value = LETTER_VALUES.get(character, 0)
+        expression += value
+        if character in VOWELS:
+            soul_urge += value
+    return (NumerologyCalculator.reduce_number(expression), NumerologyCalculator.reduce_number(soul_urge))
+
+
+def benchmark(count: int) -> Dict[str, Any]:
+    rng = random.Random(5)
+    names = [' '.join(rng.choice(SAMPLE_NAMES) for _ in range(rng.randint(2, 4))) for _ in range(count)]
+    timings = {}
+    for label, run in (
+        ('batch', lambda: NumerologyCalculator.calculate_name_numbers_batch(names)),
+        ('single', lambda: [NumerologyCalculator.calculate_name_numbers(name) for name in names]),
+        ('dict_lookup', lambda: [_dict_lookup(name) for name in names])
+    ):
+        started = time.perf_counter()
+        run()
+        timings[label] = time.perf_counter() - started
+    return {label: {'seconds': round(seconds, 3), 'names_per_s': int(count / seconds)} for label, seconds in timings.items()}
+
+
+def main(argv: Optional[List[str]] = None) -> Any:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('input', nargs='?')
+    parser.add_argument('output', nargs='?')
+    parser.add_argument('--name-column', default='full_name')
+    parser.add_argument('--chunk-size', type=int, default=50000)
+    parser.add_argument('--benchmark', type=int, metavar='NAMES', help='Time the implementations on synthetic names')
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        report = benchmark(args.benchmark)
+        for label, stats in report.items():
+            print(f"{label:<12}{stats['seconds']:>10} s{stats['names_per_s']:>12} names/s")
+        return report
+
+    if not args.input or not args.output:
+        parser.error("input and output are required unless --benchmark is given")
+    started = time.perf_counter()
+    rows = enrich(args.input, args.output, args.name_column, args.chunk_size)
+    print(f"enriched {rows} rows in {time.perf_counter() - started:.2f} s")
+    return rows
+
+
+if __name__ == '__main__':
+    main()
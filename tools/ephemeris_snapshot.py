@@ -0,0 +1,63 @@
+"""
+Build the binary ephemeris snapshot and check it against ephem.
+
+Samples the Sun, Moon, mean node and planets once a day over
+``SNAPSHOT_FIRST_DAY``..``SNAPSHOT_LAST_DAY``, writes the snapshot to
+``Config.EPHEMERIS_SNAPSHOT_PATH`` or ``--output``, then compares
+interpolated longitudes with ephem at ``--checks`` random instants.
+
+Example:
+    python tools/ephemeris_snapshot.py --workers 4 --checks 2000
+"""
+import os
+import sys
+import time
+import argparse
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from backend.config.settings import Config  # noqa: E402
+from backend.services.ephemeris import EphemerisSnapshot, SNAPSHOT_BODIES, _sample_longitudes  # noqa: E402
+from backend.services.human_design import _wrap_degrees  # noqa: E402
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', default=Config.EPHEMERIS_SNAPSHOT_PATH, help='Snapshot path')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Sampling processes')
+    parser.add_argument('--checks', type=int, default=500, help='Random instants compared with ephem')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    EphemerisSnapshot.build(workers=args.workers).save(args.output)
+    build_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    snapshot = EphemerisSnapshot.load(args.output)
+    load_ms = (time.perf_counter() - started) * 1000
+
+    dates = snapshot.start + np.random.default_rng(11).uniform(0, snapshot.end - snapshot.start, args.checks)
+    longitudes, _ = snapshot.interpolate(dates)
+    max_error = {
+        name: round(float(np.abs(_wrap_degrees(longitudes[:, column] - _sample_longitudes(name, dates))).max()) * 3600, 3)
+        for column, name in enumerate(SNAPSHOT_BODIES)
+    }
+
+    report = {
+        "path": args.output,
+        "samples": len(snapshot.longitudes),
+        "bytes": os.path.getsize(args.output),
+        "build_seconds": round(build_seconds, 1),
+        "load_ms": round(load_ms, 2),
+        "max_error_arcsec": max_error
+    }
+    print(report)
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,422 @@
+"""
+Load generator for the Pathlet API.
+
+Boots ``backend.app:app`` locally (under gunicorn by default), replays a
+weighted mix of chart requests from a traffic profile, and reports
+throughput, latency percentiles, error rates and body versus on-the-wire
+bytes per route, plus the server's CPU time when it booted the server.
+
+Examples:
+    python tools/loadtest.py --mode closed --concurrency 16 --duration 30
+    python tools/loadtest.py --mode open --rate 200 --duration 60 --workers 4 --threads 8
+    python tools/loadtest.py --url http://127.0.0.1:8000 --profile tools/profiles/mixed.json
+
+Results are written as JSON (see ``--output``) so runs can be compared
+across commits.
+"""
+import os
+import sys
+import json
+import time
+import zlib
+import random
+import socket
+import argparse
+import datetime
+import platform
+import threading
+import subprocess
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
+
+import requests
+
+try:
+    import brotli
+except ImportError:  # brotli bodies are measured encoded without the package
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstd bodies are measured encoded without the package
+    zstandard = None
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+DEFAULT_PROFILE = os.path.join(os.path.dirname(__file__), 'profiles', 'mixed.json')
+DEFAULT_OUTPUT_DIR = os.path.join(PROJECT_ROOT, 'loadtest-results')
+
+
+class TrafficProfile:
+    """
+    Weighted mix of routes with realistic birth-detail payloads.
+    """
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.spec = spec
+        self.routes = spec['routes']
+        self.weights = [route['weight'] for route in self.routes]
+        self.hot_dates = spec.get('hot_dates', [])
+        self.hot_date_fraction = spec.get('hot_date_fraction', 0.0)
+        self.birth_time_fraction = spec.get('birth_time_fraction', 0.5)
+        self.locations = spec.get('locations', ['New York'])
+        self.min_age, self.max_age = spec.get('age_range', [18, 70])
+
+    @classmethod
+    def load(cls, path: str) -> 'TrafficProfile':
+        with open(path, encoding='utf-8') as profile_file:
+            return cls(json.load(profile_file))
+
+    def _birth(self, rng: random.Random) -> Dict[str, str]:
+        if self.hot_dates and rng.random() < self.hot_date_fraction:
+            birth_date = rng.choice(self.hot_dates)
+        else:
+            age_days = rng.randint(self.min_age * 365, self.max_age * 365)
+            birth_date = (datetime.date.today() - datetime.timedelta(days=age_days)).isoformat()
+
+        birth = {'birth_date': birth_date, 'birth_location': rng.choice(self.locations)}
+        if rng.random() < self.birth_time_fraction:
+            hour, minute = rng.randint(1, 12), rng.randint(0, 59)
+            birth['birth_time'] = f"{hour:02d}:{minute:02d} {rng.choice(['AM', 'PM'])}"
+        return birth
+
+    def next_request(self, rng: random.Random) -> Tuple[str, Dict[str, Any]]:
+        route = rng.choices(self.routes, weights=self.weights)[0]
+        if route['payload'] == 'pair':
+            payload = {'person1': self._birth(rng), 'person2': self._birth(rng)}
+        else:
+            payload = self._birth(rng)
+        # Fixed request fields of the route, e.g. a response format
+        payload.update(route.get('fields', {}))
+        return route['path'], payload
+
+
+class LocalServer:
+    """
+    Run the app on a free local port for the duration of a test.
+    """
+
+    def __init__(self, server: str = 'gunicorn', workers: int = 4, threads: int = 1,
+                 extra_args: Optional[List[str]] = None):
+        self.server = server
+        self.workers = workers
+        self.threads = threads
+        self.extra_args = extra_args or []
+        self.port = self._free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self._process = None
+        self._httpd = None
+
+    @staticmethod
+    def _free_port() -> int:
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            return sock.getsockname()[1]
+
+    def __enter__(self):
+        if self.server == 'gunicorn':
+            env = dict(os.environ, PYTHONPATH=PROJECT_ROOT)
+            self._process = subprocess.Popen(
+                [sys.executable, '-m', 'gunicorn', '-b', f'127.0.0.1:{self.port}',
+                 '--workers', str(self.workers), '--threads', str(self.threads),
+                 '--log-level', 'warning', *self.extra_args, 'backend.app:app'],
+                cwd=PROJECT_ROOT, env=env
+            )
+        else:
+            from werkzeug.serving import make_server
+            sys.path.insert(0, PROJECT_ROOT)
+            from backend.app import app
+            self._httpd = make_server('127.0.0.1', self.port, app, threaded=True)
+            threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+
+        deadline = time.time() + 60
+        while time.time() < deadline:
+            if self._process is not None and self._process.poll() is not None:
+                raise RuntimeError(f"{self.server} exited with code {self._process.returncode}")
+            try:
+                if requests.get(f"{self.url}/healthz", timeout=1).status_code == 200:
+                    return self
+            except requests.RequestException:
+                pass
+            time.sleep(0.2)
+        self.__exit__(None, None, None)
+        raise RuntimeError(f"{self.server} did not become healthy on {self.url}")
+
+    def cpu_seconds(self) -> Optional[float]:
+        """
+        User plus system CPU time used so far by gunicorn and its workers.
+
+        Read from ``/proc``, so only available for a gunicorn server on
+        Linux; the werkzeug server shares this process with the load
+        generator.
+
+        Returns:
+            float seconds, or None if unavailable
+        """
+        if self._process is None:
+            return None
+        ticks = 0
+        pids = [self._process.pid]
+        while pids:
+            pid = pids.pop()
+            try:
+                with open(f'/proc/{pid}/stat', encoding='utf-8') as stat_file:
+                    fields = stat_file.read().rpartition(')')[2].split()
+                ticks += int(fields[11]) + int(fields[12])  # utime, stime
+                with open(f'/proc/{pid}/task/{pid}/children', encoding='utf-8') as children_file:
+                    pids.extend(int(child) for child in children_file.read().split())
+            except OSError:
+                if pid == self._process.pid:
+                    return None
+        return ticks / os.sysconf('SC_CLK_TCK')
+
+    def __exit__(self, *exc_info):
+        if self._process is not None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+        if self._httpd is not None:
+            self._httpd.shutdown()
+
+
+def _decode(data: bytes, encoding: Optional[str]) -> bytes:
+    """Undo a Content-Encoding; bodies in encodings without a package installed stay as they are."""
+    if encoding == 'gzip':
+        return zlib.decompress(data, 47)
+    if encoding == 'br' and brotli is not None:
+        return brotli.decompress(data)
+    if encoding == 'zstd' and zstandard is not None:
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return data
+
+
+class LoadGenerator:
+    """
+    Closed-loop (fixed concurrency) or open-loop (Poisson arrivals) load.
+    """
+
+    def __init__(self, base_url: str, profile: TrafficProfile, headers: Dict[str, str],
+                 seed: int = 0, timeout: float = 30.0):
+        self.base_url = base_url.rstrip('/')
+        self.profile = profile
+        self.headers = headers
+        self.seed = seed
+        self.timeout = timeout
+        self.samples = []
+        self._samples_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _session(self) -> requests.Session:
+        if not hasattr(self._local, 'session'):
+            self._local.session = requests.Session()
+            self._local.session.headers.update(self.headers)
+        return self._local.session
+
+    def _send(self, path: str, payload: Dict[str, Any], scheduled: float, record: bool):
+        status, size, wire_size = 0, 0, 0
+        try:
+            response = self._session().post(f"{self.base_url}{path}", json=payload, timeout=self.timeout, stream=True)
+            status = response.status_code
+            # Read the body as sent, so its size is the encoded one even when streamed
+            wire = b''.join(response.raw.stream(65536, decode_content=False))
+            response.raw.release_conn()
+            wire_size = len(wire)
+            size = len(_decode(wire, response.headers.get('Content-Encoding')))
+        except requests.RequestException:
+            pass
+        # Latency is measured from the scheduled send time, so queueing in the
+        # generator under open-loop load is not hidden (coordinated omission)
+        latency = time.perf_counter() - scheduled
+        if record:
+            with self._samples_lock:
+                self.samples.append((path, latency, status, size, wire_size))
+
+    def run_closed(self, concurrency: int, duration: float, warmup: float):
+        start = time.perf_counter()
+        measure_from = start + warmup
+        stop = measure_from + duration
+
+        def worker(index: int):
+            rng = random.Random(self.seed + index)
+            while True:
+                now = time.perf_counter()
+                if now >= stop:
+                    return
+                path, payload = self.profile.next_request(rng)
+                self._send(path, payload, now, record=now >= measure_from)
+
+        threads = [threading.Thread(target=worker, args=(index,)) for index in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return duration
+
+    def run_open(self, rate: float, duration: float, warmup: float, max_concurrency: int):
+        rng = random.Random(self.seed)
+        total = warmup + duration
+        start = time.perf_counter()
+        measure_from = start + warmup
+
+        with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+            offset = rng.expovariate(rate)
+            while offset < total:
+                scheduled = start + offset
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                path, payload = self.profile.next_request(rng)
+                pool.submit(self._send, path, payload, scheduled, scheduled >= measure_from)
+                offset += rng.expovariate(rate)
+        return duration
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(samples: List[tuple], duration: float) -> Dict[str, Any]:
+    """
+    Per-route throughput, latency percentiles and error rates.
+
+    Args:
+        samples (List[tuple]): (route, latency, status, body bytes, wire bytes)
+        duration (float): Measured duration in seconds
+
+    Returns:
+        Dict keyed by route, plus an ``all`` entry
+    """
+    grouped = defaultdict(list)
+    for sample in samples:
+        grouped[sample[0]].append(sample)
+        grouped['all'].append(sample)
+
+    summary = {}
+    for route, route_samples in sorted(grouped.items()):
+        latencies = sorted(sample[1] for sample in route_samples)
+        errors = sum(1 for sample in route_samples if not 200 <= sample[2] < 300)
+        statuses = defaultdict(int)
+        for sample in route_samples:
+            statuses[str(sample[2])] += 1
+        summary[route] = {
+            'requests': len(route_samples),
+            'throughput_rps': round(len(route_samples) / duration, 2),
+            'error_rate': round(errors / len(route_samples), 4),
+            'status_codes': dict(statuses),
+            'latency_ms': {
+                'p50': round(_percentile(latencies, 0.50) * 1000, 2),
+                'p95': round(_percentile(latencies, 0.95) * 1000, 2),
+                'p99': round(_percentile(latencies, 0.99) * 1000, 2),
+                'max': round(latencies[-1] * 1000, 2),
+                'mean': round(sum(latencies) / len(latencies) * 1000, 2)
+            },
+            'mean_body_bytes': round(sum(sample[3] for sample in route_samples) / len(route_samples), 1),
+            'mean_wire_bytes': round(sum(sample[4] for sample in route_samples) / len(route_samples), 1)
+        }
+    return summary
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_summary(summary: Dict[str, Any]):
+    print(f"{'route':<28}{'reqs':>8}{'rps':>10}{'err%':>8}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for route, stats in summary.items():
+        latency = stats['latency_ms']
+        print(f"{route:<28}{stats['requests']:>8}{stats['throughput_rps']:>10}"
+              f"{stats['error_rate'] * 100:>8.2f}{latency['p50']:>9}{latency['p95']:>9}{latency['p99']:>9}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--profile', default=DEFAULT_PROFILE, help='Traffic profile JSON')
+    parser.add_argument('--mode', choices=['closed', 'open'], default='closed')
+    parser.add_argument('--concurrency', type=int, default=8, help='Closed-loop clients')
+    parser.add_argument('--rate', type=float, default=50.0, help='Open-loop arrivals per second')
+    parser.add_argument('--max-concurrency', type=int, default=256, help='Open-loop in-flight cap')
+    parser.add_argument('--duration', type=float, default=20.0, help='Measured seconds')
+    parser.add_argument('--warmup', type=float, default=3.0, help='Unmeasured seconds before measuring')
+    parser.add_argument('--url', help='Target an already running server instead of booting one')
+    parser.add_argument('--server', choices=['gunicorn', 'werkzeug'], default='gunicorn')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=1)
+    parser.add_argument('--server-arg', action='append', default=[], help='Extra gunicorn argument')
+    parser.add_argument('--header', action='append', default=[], help='Extra request header, "Name: value"')
+    parser.add_argument('--seed', type=int, help='Override the profile seed')
+    parser.add_argument('--output', help='Result file (default: loadtest-results/<time>-<commit>.json)')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    args = parse_args(argv)
+    profile = TrafficProfile.load(args.profile)
+    headers = dict(header.split(':', 1) for header in args.header)
+    headers = {name.strip(): value.strip() for name, value in headers.items()}
+    seed = args.seed if args.seed is not None else profile.spec.get('seed', 0)
+
+    def run(base_url: str) -> Tuple[List[tuple], float]:
+        generator = LoadGenerator(base_url, profile, headers, seed=seed)
+        if args.mode == 'closed':
+            duration = generator.run_closed(args.concurrency, args.duration, args.warmup)
+        else:
+            duration = generator.run_open(args.rate, args.duration, args.warmup, args.max_concurrency)
+        return generator.samples, duration
+
+    server_cpu = None
+    if args.url:
+        samples, duration = run(args.url)
+    else:
+        with LocalServer(args.server, args.workers, args.threads, args.server_arg) as server:
+            # Server CPU over the measured window only, sampled when warmup ends
+            cpu_at = {}
+            timer = threading.Timer(args.warmup, lambda: cpu_at.setdefault('start', server.cpu_seconds()))
+            timer.start()
+            samples, duration = run(server.url)
+            timer.cancel()
+            if cpu_at.get('start') is not None:
+                seconds = server.cpu_seconds() - cpu_at['start']
+                server_cpu = {
+                    'seconds': round(seconds, 3),
+                    'ms_per_request': round(seconds * 1000 / max(len(samples), 1), 3)
+                }
+
+    summary = summarize(samples, duration)
+    print_summary(summary)
+    if server_cpu is not None:
+        print(f"server cpu: {server_cpu['seconds']} s, {server_cpu['ms_per_request']} ms per request")
+
+    commit = _git_commit()
+    result = {
+        'commit': commit,
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'host': {'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count()},
+        'config': {key: value for key, value in vars(args).items() if key != 'output'},
+        'profile': profile.spec,
+        'routes': summary,
+        'server_cpu': server_cpu
+    }
+
+    output = args.output
+    if not output:
+        os.makedirs(DEFAULT_OUTPUT_DIR, exist_ok=True)
+        stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+        output = os.path.join(DEFAULT_OUTPUT_DIR, f"{stamp}-{commit or 'unknown'}.json")
+    with open(output, 'w', encoding='utf-8') as output_file:
+        json.dump(result, output_file, indent=2)
+    print(f"Results written to {output}")
+    return result
+
+
+if __name__ == '__main__':
+    main()
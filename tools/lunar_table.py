@@ -0,0 +1,41 @@
+"""
+Precompute the lunar table served by the lunar cycle endpoint.
+
+Writes new and full moon instants and the daily Moon sign and illumination
+for 1900-2100 to ``Config.LUNAR_TABLE_PATH`` or ``--output``. Run at build
+time so workers only memory-map the file.
+
+Example:
+    python tools/lunar_table.py --output data/lunar_table.bin
+"""
+import os
+import sys
+import time
+import argparse
+from typing import List, Optional
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from backend.config.settings import Config  # noqa: E402
+from backend.services.lunar import LunarTable  # noqa: E402
+
+
+def main(argv: Optional[List[str]] = None) -> str:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', default=Config.LUNAR_TABLE_PATH, help='Table path')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    table = LunarTable.build()
+    table.save(args.output)
+    print(
+        f"Wrote {args.output}: {len(table.new_moons)} new moons, {len(table.full_moons)} full moons, "
+        f"{len(table.signs)} days, {os.path.getsize(args.output)} bytes "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+    return args.output
+
+
+if __name__ == '__main__':
+    main()
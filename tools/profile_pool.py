@@ -0,0 +1,96 @@
+"""
+Build a synthetic profile pool and benchmark top-k matching.
+
+Writes ``--profiles`` random profiles (life path numbers and Human Design
+types drawn with their natural frequencies) to ``Config.PROFILE_POOL_PATH``
+or ``--output``, then times bucketed ranking against scoring and
+partitioning every profile for the same queries.
+
+Example:
+    python tools/profile_pool.py --profiles 500000 --queries 200
+"""
+import os
+import sys
+import time
+import argparse
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from backend.config.settings import Config  # noqa: E402
+from backend.services.compatibility import (  # noqa: E402
+    BUCKET_COUNT, HUMAN_DESIGN_TYPES, LIFE_PATH_NUMBERS, get_bucket_scores
+)
+from backend.services.matching import ProfilePool, BUCKET_LABELS  # noqa: E402
+from backend.services.numerology import REDUCED_NUMBERS  # noqa: E402
+
+# Approximate population shares of each Human Design type
+TYPE_SHARES = {"Manifestor": 0.09, "Generator": 0.37, "Manifesting Generator": 0.33, "Projector": 0.20, "Reflector": 0.01}
+
+
+def synthetic_pool(profiles: int, seed: int = 7) -> ProfilePool:
+    rng = np.random.default_rng(seed)
+    # Life path frequencies follow from the digit sums of real birth dates
+    days = np.arange(np.datetime64('1940-01-01'), np.datetime64('2008-01-01'))
+    digits = np.char.replace(np.datetime_as_string(rng.choice(days, profiles)), '-', '')
+    sums = np.array([sum(map(int, date)) for date in digits.tolist()])
+    life_path_codes = np.searchsorted(LIFE_PATH_NUMBERS, REDUCED_NUMBERS[sums])
+    type_codes = rng.choice(len(HUMAN_DESIGN_TYPES), profiles, p=[TYPE_SHARES[name] for name in HUMAN_DESIGN_TYPES])
+    return ProfilePool(np.arange(profiles, dtype=np.int64), life_path_codes * len(HUMAN_DESIGN_TYPES) + type_codes)
+
+
+def brute_force_top_k(pool: ProfilePool, query: int, limit: int) -> List[int]:
+    scores = get_bucket_scores()[query][pool.buckets]
+    top = np.argpartition(-scores, limit)[:limit]
+    return pool.profile_ids[top[np.argsort(-scores[top], kind='stable')]].tolist()
+
+
+def _timed(function, queries: List[int]) -> float:
+    started = time.perf_counter()
+    for query in queries:
+        function(query)
+    return (time.perf_counter() - started) / len(queries)
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--profiles', type=int, default=500000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--output', default=Config.PROFILE_POOL_PATH)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    pool = synthetic_pool(args.profiles)
+    build_seconds = time.perf_counter() - started
+    pool.save(args.output)
+
+    started = time.perf_counter()
+    pool = ProfilePool.load(args.output)
+    load_seconds = time.perf_counter() - started
+
+    queries = np.random.default_rng(11).integers(0, BUCKET_COUNT, args.queries).tolist()
+    bucketed = _timed(lambda query: pool.top_k(*BUCKET_LABELS[query], limit=args.limit), queries)
+    deep_page = _timed(lambda query: pool.top_k(*BUCKET_LABELS[query], limit=args.limit, offset=args.profiles // 2), queries)
+    brute_force = _timed(lambda query: brute_force_top_k(pool, query, args.limit), queries)
+
+    report = {
+        'profiles': len(pool),
+        'non_empty_buckets': int((pool.sizes > 0).sum()),
+        'build_s': round(build_seconds, 3),
+        'load_ms': round(load_seconds * 1000, 2),
+        'bucketed_top_k_us': round(bucketed * 1e6, 1),
+        'bucketed_deep_page_us': round(deep_page * 1e6, 1),
+        'per_profile_top_k_us': round(brute_force * 1e6, 1)
+    }
+    for name, value in report.items():
+        print(f"{name:<24}{value:>12}")
+    print(f"pool written to {args.output}")
+    return report
+
+
+if __name__ == '__main__':
+    main()
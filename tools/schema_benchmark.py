@@ -0,0 +1,95 @@
+"""
+End-to-end request cost of valid and invalid payloads per endpoint.
+
+Calls ``backend.app:app`` as a WSGI application with a prebuilt environ,
+so the numbers include routing, JSON decoding, validation, service work
+and response encoding, but no network or test-client overhead. Invalid payloads should be rejected
+before any service work starts, so their cost is the validation floor.
+
+Example:
+    python tools/schema_benchmark.py --iterations 2000
+"""
+import io
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+from typing import Dict, List, Any, Optional
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+PERSON = {"birth_date": "1990-05-15", "birth_time": "10:30 AM", "birth_location": "London"}
+
+CASES = {
+    '/calculate_numerology': {
+        'valid': {"birth_date": "1990-05-15"},
+        'invalid': {"birth_date": "15th of May"}
+    },
+    '/calculate_human_design': {
+        'valid': PERSON,
+        'invalid': {"birth_date": "1990-05-15", "birth_time": "25:99"}
+    },
+    '/get_ascendants': {
+        'valid': {"birth_date": "1990-05-15", "birth_location": "London"},
+        'invalid': {"birth_location": "London"}
+    },
+    '/calculate_compatibility': {
+        'valid': {"person1": PERSON, "person2": dict(PERSON, birth_date="1985-12-22")},
+        'invalid': {"person1": PERSON, "person2": "1985-12-22"}
+    }
+}
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=1000)
+    parser.add_argument('--output', help='Write the report as JSON')
+    args = parser.parse_args(argv)
+
+    from werkzeug.test import EnvironBuilder
+    from backend.app import app
+    logging.disable(logging.CRITICAL)
+
+    def start_response(status, headers, exc_info=None):
+        statuses.append(int(status.split(' ', 1)[0]))
+
+    report = {}
+    for path, payloads in CASES.items():
+        for kind, payload in payloads.items():
+            body = json.dumps(payload).encode('utf-8')
+            template = EnvironBuilder(path=path, method='POST', data=body, content_type='application/json').get_environ()
+            statuses, samples = [], []
+            for _ in range(args.iterations + 1):
+                environ = dict(template, **{'wsgi.input': io.BytesIO(body)})
+                started = time.perf_counter()
+                b''.join(app(environ, start_response))
+                samples.append(time.perf_counter() - started)
+            status = statuses[0]
+            samples = samples[1:]
+            samples.sort()
+            report[f"{path} {kind}"] = {
+                'status': status,
+                'p50_us': round(_percentile(samples, 0.50) * 1e6, 1),
+                'p95_us': round(_percentile(samples, 0.95) * 1e6, 1)
+            }
+
+    print(f"{'request':<40}{'status':>8}{'p50 us':>10}{'p95 us':>10}")
+    for name, stats in report.items():
+        print(f"{name:<40}{stats['status']:>8}{stats['p50_us']:>10}{stats['p95_us']:>10}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(report, output_file, indent=2)
+    return report
+
+
+if __name__ == '__main__':
+    main()
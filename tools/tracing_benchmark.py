@@ -0,0 +1,123 @@
+"""
+Per-span cost of request tracing.
+
+Measures entering and leaving a ``span`` and calling a ``traced``
+function, both outside a request (tracing disabled or on a batching
+thread) and inside a traced request, plus the exporter's per-span cost of
+converting and writing OTLP JSON, which the background thread pays.
+Finally it compares a full ``/calculate_compatibility`` request with and
+without the tracing middleware.
+
+Example:
+    python tools/tracing_benchmark.py --iterations 100000
+"""
+import io
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+from typing import Any, Callable, Dict, List, Optional
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+PERSON = {"birth_date": "1990-05-15", "birth_time": "10:30 AM", "birth_location": "London"}
+COMPATIBILITY = {"person1": PERSON, "person2": dict(PERSON, birth_date="1985-12-22")}
+
+
+def _ns_per_call(function: Callable[[], Any], iterations: int) -> float:
+    started = time.perf_counter_ns()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter_ns() - started) / iterations
+
+
+def _request_us(app: Callable, body: bytes, template: Dict[str, Any], iterations: int) -> float:
+    def start_response(status, headers, exc_info=None):
+        pass
+
+    samples = []
+    for _ in range(iterations + 1):
+        environ = dict(template, **{'wsgi.input': io.BytesIO(body)})
+        started = time.perf_counter()
+        b''.join(app(environ, start_response))
+        samples.append(time.perf_counter() - started)
+    samples = sorted(samples[1:])
+    return round(samples[len(samples) // 2] * 1e6, 1)
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=100000)
+    parser.add_argument('--requests', type=int, default=300)
+    parser.add_argument('--output', help='Write the report as JSON')
+    args = parser.parse_args(argv)
+
+    from werkzeug.test import EnvironBuilder
+    from backend.app import app
+    from backend.utils import tracing
+    from backend.utils.tracing import SpanExporter, TracedJSONProvider, TracingMiddleware, span, traced
+    logging.disable(logging.CRITICAL)
+
+    def enter_exit():
+        with span("benchmark"):
+            pass
+
+    @traced("benchmark")
+    def traced_call():
+        pass
+
+    def plain_call():
+        pass
+
+    report = {
+        'untraced_function_ns': _ns_per_call(plain_call, args.iterations),
+        'span_outside_request_ns': _ns_per_call(enter_exit, args.iterations),
+        'traced_outside_request_ns': _ns_per_call(traced_call, args.iterations)
+    }
+
+    # Inside a request: spans accumulate on the trace like real ones
+    trace = tracing._Trace("0" * 31 + "1", 0)
+    tracing._tracing.trace = trace
+    try:
+        report['span_in_request_ns'] = _ns_per_call(enter_exit, args.iterations)
+        report['traced_in_request_ns'] = _ns_per_call(traced_call, args.iterations)
+    finally:
+        tracing._tracing.trace = None
+
+    with tempfile.TemporaryDirectory() as directory:
+        # One batch larger than the spans, so the idle export thread leaves them to us
+        exporter = SpanExporter(directory, batch_size=len(trace.spans) + 1, interval=3600)
+        exporter.add(trace.trace_id, trace.spans)
+        started = time.perf_counter_ns()
+        exported = exporter.flush()
+        report['export_ns_per_span'] = (time.perf_counter_ns() - started) / max(exported, 1)
+
+        body = json.dumps(COMPATIBILITY).encode('utf-8')
+        template = EnvironBuilder(
+            path='/calculate_compatibility', method='POST', data=body, content_type='application/json'
+        ).get_environ()
+        plain_app, plain_json = app.wsgi_app, app.json
+        report['request_untraced_us'] = _request_us(plain_app, body, template, args.requests)
+        app.json = TracedJSONProvider(app)
+        request_exporter = SpanExporter(directory, interval=3600)
+        report['request_traced_us'] = _request_us(TracingMiddleware(plain_app, request_exporter), body, template, args.requests)
+        app.json = plain_json
+        request_exporter.flush()
+
+    report = {name: round(value, 1) for name, value in report.items()}
+    width = max(len(name) for name in report)
+    for name, value in report.items():
+        print(f"{name:<{width}}{value:>12}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(report, output_file, indent=2)
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Precompute the transit event index served by the transits endpoint.
+
+Finds every sign ingress and retrograde station of the Sun, Moon and
+planets, and every lunation, between ``--first-year`` and ``--last-year``
+and writes them to ``Config.TRANSIT_INDEX_PATH`` or ``--output``. Then
+times week-long range queries against the memory-mapped index.
+
+Example:
+    python tools/transit_index.py --first-year 1970 --last-year 2070
+"""
+import os
+import sys
+import time
+import argparse
+import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from backend.config.settings import Config  # noqa: E402
+from backend.services.transits import (  # noqa: E402
+    INDEX_FIRST_YEAR, INDEX_LAST_YEAR, EVENT_KINDS, TransitIndex
+)
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--first-year', type=int, default=INDEX_FIRST_YEAR)
+    parser.add_argument('--last-year', type=int, default=INDEX_LAST_YEAR)
+    parser.add_argument('--output', default=Config.TRANSIT_INDEX_PATH, help='Index path')
+    parser.add_argument('--queries', type=int, default=1000, help='Week-long queries to time')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    TransitIndex.build(args.first_year, args.last_year).save(args.output)
+    build_seconds = time.perf_counter() - started
+
+    index = TransitIndex.load(args.output)
+    counts = np.bincount(index.kinds, minlength=len(EVENT_KINDS))
+    rng = np.random.default_rng(5)
+    first = datetime.datetime(args.first_year, 1, 1)
+    offsets = rng.integers(0, (datetime.datetime(args.last_year, 12, 24) - first).days, args.queries)
+    started = time.perf_counter()
+    for offset in offsets.tolist():
+        start = first + datetime.timedelta(days=offset)
+        index.query(start, start + datetime.timedelta(days=7))
+    query_seconds = (time.perf_counter() - started) / max(args.queries, 1)
+
+    report = {
+        "path": args.output,
+        "events": len(index),
+        "bytes": os.path.getsize(args.output),
+        "by_kind": dict(zip(EVENT_KINDS, counts.tolist())),
+        "build_seconds": round(build_seconds, 1),
+        "week_query_us": round(query_seconds * 1e6, 1)
+    }
+    print(report)
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+Replay Vercel-shaped events through ``api/index.py:handler``.
+
+Measures the module import (cold start), the first invocation, and the
+steady-state cost per invocation for each event shape. The adapter
+overhead is the handler time minus a direct WSGI call of the same
+request on the same, already warm, application.
+
+Example:
+    python tools/vercel_replay.py --iterations 2000
+"""
+import io
+import os
+import sys
+import json
+import time
+import base64
+import logging
+import argparse
+from typing import Dict, List, Any, Optional
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+PAYLOAD = {"birth_date": "1990-05-15", "birth_time": "10:30 AM", "birth_location": "London"}
+
+
+def sample_events(path: str, payload: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    body = json.dumps(payload)
+    return {
+        'api_gateway_v1': {
+            'httpMethod': 'POST', 'path': f'/api{path}',
+            'headers': {'Content-Type': 'application/json', 'Host': 'pathlet-api.vercel.app'},
+            'body': body, 'isBase64Encoded': False
+        },
+        'api_gateway_v2': {
+            'version': '2.0', 'rawPath': f'/api{path}', 'rawQueryString': '',
+            'headers': {'content-type': 'application/json', 'host': 'pathlet-api.vercel.app'},
+            'requestContext': {'http': {'method': 'POST', 'path': f'/api{path}', 'sourceIp': '203.0.113.7'}},
+            'body': base64.b64encode(body.encode()).decode(), 'isBase64Encoded': True
+        },
+        'vercel_invoke': {
+            'Action': 'Invoke',
+            'body': json.dumps({
+                'method': 'POST', 'path': f'/api{path}',
+                'headers': {'content-type': 'application/json', 'host': 'pathlet-api.vercel.app'},
+                'body': body
+            })
+        }
+    }
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _stats(samples: List[float]) -> Dict[str, float]:
+    samples = sorted(samples)
+    return {
+        'p50_us': round(_percentile(samples, 0.50) * 1e6, 1),
+        'p95_us': round(_percentile(samples, 0.95) * 1e6, 1),
+        'mean_us': round(sum(samples) / len(samples) * 1e6, 1)
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=1000)
+    parser.add_argument('--path', default='/calculate_numerology')
+    parser.add_argument('--output', help='Write the report as JSON')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    from api.index import handler, application, SCRIPT_NAME
+    from backend.utils.serverless import event_to_environ
+    import_seconds = time.perf_counter() - started
+    logging.disable(logging.CRITICAL)
+
+    events = sample_events(args.path, PAYLOAD)
+    report = {'import_ms': round(import_seconds * 1000, 2), 'path': args.path, 'events': {}}
+
+    for name, event in events.items():
+        started = time.perf_counter()
+        first = handler(event, None)
+        first_seconds = time.perf_counter() - started
+        if first['statusCode'] != 200:
+            raise RuntimeError(f"{name}: handler returned {first['statusCode']}: {first['body']}")
+
+        handler_times, direct_times = [], []
+        template = event_to_environ(event, SCRIPT_NAME)
+        body = template['wsgi.input'].getvalue()
+        for _ in range(args.iterations):
+            started = time.perf_counter()
+            handler(event, None)
+            handler_times.append(time.perf_counter() - started)
+
+            environ = dict(template, **{'wsgi.input': io.BytesIO(body)})
+            started = time.perf_counter()
+            b''.join(application(environ, lambda status, headers, exc_info=None: None))
+            direct_times.append(time.perf_counter() - started)
+
+        handler_stats, direct_stats = _stats(handler_times), _stats(direct_times)
+        report['events'][name] = {
+            'first_invocation_ms': round(first_seconds * 1000, 2),
+            'handler': handler_stats,
+            'direct_wsgi': direct_stats,
+            'adapter_overhead_p50_us': round(handler_stats['p50_us'] - direct_stats['p50_us'], 1)
+        }
+
+    print(f"import (cold start): {report['import_ms']} ms")
+    print(f"{'event':<18}{'first ms':>10}{'handler p50':>13}{'direct p50':>12}{'overhead us':>13}")
+    for name, stats in report['events'].items():
+        print(f"{name:<18}{stats['first_invocation_ms']:>10}{stats['handler']['p50_us']:>13}"
+              f"{stats['direct_wsgi']['p50_us']:>12}{stats['adapter_overhead_p50_us']:>13}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(report, output_file, indent=2)
+    return report
+
+
+if __name__ == '__main__':
+    main()
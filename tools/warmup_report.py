@@ -0,0 +1,129 @@
+"""
+Compare gunicorn workers with and without pre-fork warm-up.
+
+Boots ``backend.app:app`` twice with ``gunicorn.conf.py``: once with
+``GUNICORN_PRELOAD=False`` (each worker imports the app and builds its own
+tables) and once preloaded and warmed up in the master. For each run it
+reports boot time, time to the first chart response, the latency of that
+first request, and per-worker RSS, PSS and USS after a short burst of
+traffic. PSS and USS come from /proc/<pid>/smaps_rollup, so the report
+needs Linux.
+
+Example:
+    python tools/warmup_report.py --workers 4 --output warmup-report.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from typing import Dict, List, Any, Optional
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from loadtest import PROJECT_ROOT, LocalServer  # noqa: E402
+
+CHART_PAYLOAD = {"birth_date": "1987-03-02", "birth_time": "04:15 PM", "birth_location": "London"}
+
+
+def _worker_pids(master_pid: int) -> List[int]:
+    children = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as stat_file:
+                fields = stat_file.read().rsplit(')', 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == master_pid:
+            children.append(int(entry))
+    return sorted(children)
+
+
+def _memory(pid: int) -> Dict[str, int]:
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as rollup:
+        for line in rollup:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(':') and parts[1].isdigit():
+                values[parts[0][:-1]] = int(parts[1])
+    return {
+        'rss_kb': values.get('Rss', 0),
+        'pss_kb': values.get('Pss', 0),
+        'uss_kb': values.get('Private_Clean', 0) + values.get('Private_Dirty', 0)
+    }
+
+
+def measure(preload: bool, workers: int, requests_per_worker: int) -> Dict[str, Any]:
+    env = {'GUNICORN_PRELOAD': 'True' if preload else 'False'}
+    previous = {name: os.environ.get(name) for name in env}
+    os.environ.update(env)
+
+    started = time.perf_counter()
+    try:
+        server = LocalServer('gunicorn', workers=workers, threads=1,
+                             extra_args=['-c', os.path.join(PROJECT_ROOT, 'gunicorn.conf.py')])
+        with server:
+            boot = time.perf_counter() - started
+
+            request_started = time.perf_counter()
+            response = requests.post(f"{server.url}/calculate_human_design", json=CHART_PAYLOAD, timeout=60)
+            first_request = time.perf_counter() - request_started
+            response.raise_for_status()
+            time_to_first_request = time.perf_counter() - started
+
+            # Touch every worker so each has served real traffic
+            session = requests.Session()
+            for index in range(workers * requests_per_worker):
+                session.post(f"{server.url}/calculate_human_design",
+                             json=dict(CHART_PAYLOAD, birth_date=f"19{50 + index % 50}-0{1 + index % 9}-1{index % 10}"),
+                             timeout=60)
+
+            worker_memory = {pid: _memory(pid) for pid in _worker_pids(server._process.pid)}
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+    count = max(len(worker_memory), 1)
+    return {
+        'preload': preload,
+        'boot_s': round(boot, 3),
+        'time_to_first_request_s': round(time_to_first_request, 3),
+        'first_request_ms': round(first_request * 1000, 2),
+        'workers': worker_memory,
+        'mean_rss_kb': sum(memory['rss_kb'] for memory in worker_memory.values()) // count,
+        'mean_pss_kb': sum(memory['pss_kb'] for memory in worker_memory.values()) // count,
+        'mean_uss_kb': sum(memory['uss_kb'] for memory in worker_memory.values()) // count
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--requests-per-worker', type=int, default=25)
+    parser.add_argument('--output', help='Write the report as JSON')
+    args = parser.parse_args(argv)
+
+    report = {
+        'before': measure(False, args.workers, args.requests_per_worker),
+        'after': measure(True, args.workers, args.requests_per_worker)
+    }
+
+    print(f"{'':<8}{'boot s':>9}{'TTFR s':>9}{'first ms':>10}{'RSS MB':>9}{'PSS MB':>9}{'USS MB':>9}")
+    for label, run in report.items():
+        print(f"{label:<8}{run['boot_s']:>9}{run['time_to_first_request_s']:>9}{run['first_request_ms']:>10}"
+              f"{run['mean_rss_kb'] / 1024:>9.1f}{run['mean_pss_kb'] / 1024:>9.1f}{run['mean_uss_kb'] / 1024:>9.1f}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(report, output_file, indent=2)
+    return report
+
+
+if __name__ == '__main__':
+    main()